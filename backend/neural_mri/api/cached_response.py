@@ -0,0 +1,78 @@
+"""Cache hits sent as their stored JSON bytes, with ETag revalidation.
+
+Rebuilding a Pydantic model from a cached dict revalidates every nested
+object, and FastAPI then serializes it again; for a DTI or FLAIR result
+that is tens of milliseconds per hit. ``cached_response`` instead returns
+the bytes the ``ScanCache`` already holds (gzip-compressed when the client
+accepts it), and answers a matching ``If-None-Match`` with 304. Responses
+computed on a miss carry the same ETag (``set_etag``), so a client can
+revalidate from its first request on.
+"""
+
+from __future__ import annotations
+
+from fastapi import Request
+from fastapi.responses import Response
+
+from neural_mri.api.tensor_response import SCAN_TENSOR_FIELDS, tensor_response
+from neural_mri.core.scan_cache import ScanCache
+
+
+def accepts_gzip(header: str) -> bool:
+    """Whether an Accept-Encoding header allows gzip (q-values honoured)."""
+    weights: dict[str, float] = {}
+    for item in header.split(","):
+        coding, *params = (part.strip() for part in item.split(";"))
+        q = 1.0
+        for param in params:
+            name, _, value = param.partition("=")
+            if name.strip().lower() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = 0.0
+        if coding:
+            weights[coding.lower()] = q
+    return weights.get("gzip", weights.get("x-gzip", weights.get("*", 0.0))) > 0
+
+
+def set_etag(response: Response, cache: ScanCache, model_id: str, mode: str, key: str) -> None:
+    """Give a freshly computed response the ETag its cached copy is served with."""
+    etag = cache.etag(model_id, mode, key)
+    if etag is not None:
+        response.headers["ETag"] = etag
+        response.headers["Vary"] = "Accept-Encoding"
+
+
+def _etag_matches(header: str, etag: str) -> bool:
+    # Weak comparison (RFC 9110 8.8.3.2): the W/ prefix is ignored
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
+
+
+async def cached_response(
+    request: Request, cache: ScanCache, model_id: str, mode: str, key: str
+) -> Response | None:
+    """The cached result for ``key`` as a ready JSON response, or None on a miss."""
+    gzipped = accepts_gzip(request.headers.get("accept-encoding", ""))
+    cached = await cache.aget_body(model_id, mode, key, gzipped=gzipped)
+    if cached is None:
+        return None
+    headers = {"ETag": cached.etag, "Vary": "Accept-Encoding"}
+    if _etag_matches(request.headers.get("if-none-match", ""), cached.etag):
+        return Response(status_code=304, headers=headers)
+    if cached.gzipped:
+        headers["Content-Encoding"] = "gzip"
+    return Response(content=cached.content, media_type="application/json", headers=headers)
+
+
+async def scan_hit_response(
+    request: Request, binary: bool, cache: ScanCache, model_id: str, mode: str, key: str
+) -> Response | None:
+    """A cached scan as a binary tensor response or as its stored JSON bytes."""
+    if not binary:
+        return await cached_response(request, cache, model_id, mode, key)
+    cached = await cache.aget(model_id, mode, key)
+    if cached is None:
+        return None
+    return tensor_response(cached, SCAN_TENSOR_FIELDS[mode])
@@ -1,12 +1,12 @@
 from __future__ import annotations
 
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException
 
 from neural_mri.core.battery_engine import BatteryEngine
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.precision import REQUEST_PRECISIONS, call_in_precision
 from neural_mri.core.sae_manager import SAEManager
+from neural_mri.core.scheduler import InferenceScheduler
 from neural_mri.core.test_registry import get_all_tests
 from neural_mri.schemas.battery import BatteryResult, BatteryRunRequest, TestCase
 
@@ -32,6 +32,12 @@ def get_battery_engine(
     return BatteryEngine(mm, sae_manager=sae_mgr)
 
 
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
+
+
 def _require_model(mm: ModelManager) -> None:
     if not mm.is_loaded:
         raise HTTPException(status_code=400, detail="No model loaded. Load a model first.")
@@ -41,17 +47,25 @@ def _require_model(mm: ModelManager) -> None:
 async def run_battery(
     req: BatteryRunRequest = BatteryRunRequest(),
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: BatteryEngine = Depends(get_battery_engine),
 ) -> BatteryResult:
-    _require_model(mm)
-    result = await asyncio.to_thread(
-        engine.run_battery,
-        req.categories,
-        req.locale,
-        req.include_sae,
-        req.sae_layer,
-    )
-    return result
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        if req.precision is not None and req.precision not in REQUEST_PRECISIONS:
+            raise HTTPException(status_code=400, detail=f"Unknown precision: {req.precision}")
+        result = await scheduler.run(
+            call_in_precision,
+            mm,
+            req.precision,
+            engine.run_battery,
+            req.categories,
+            req.locale,
+            req.include_sae,
+            req.sae_layer,
+            priority="batch",
+        )
+        return result
 
 
 @router.get("/tests", response_model=list[TestCase])
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
 
+from fastapi import APIRouter, Depends, HTTPException, WebSocket, WebSocketDisconnect
+
+from neural_mri.config import Settings
+from neural_mri.core.load_jobs import LoadJob, LoadJobManager
 from neural_mri.core.model_manager import ModelManager
 from neural_mri.core.model_registry import add_recent_model, list_models
-from neural_mri.core.sae_manager import SAEManager
+from neural_mri.core.precision import LOAD_PRECISIONS
 from neural_mri.core.scan_cache import ScanCache
-from neural_mri.schemas.model import ModelInfo, ModelLoadRequest
+from neural_mri.core.scheduler import InferenceScheduler
+from neural_mri.core.warmup import schedule_warm_up
+from neural_mri.core.weight_stats import WeightStatsStore
+from neural_mri.schemas.model import LoadJobInfo, ModelInfo, ModelLoadRequest
 
 router = APIRouter()
 
@@ -17,10 +24,16 @@ def get_model_manager() -> ModelManager:
     return model_manager
 
 
-def get_sae_manager() -> SAEManager:
-    from neural_mri.main import sae_manager
+def get_load_jobs() -> LoadJobManager:
+    from neural_mri.main import load_jobs
+
+    return load_jobs
+
 
-    return sae_manager
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
 
 
 def get_scan_cache() -> ScanCache:
@@ -29,6 +42,18 @@ def get_scan_cache() -> ScanCache:
     return scan_cache
 
 
+def get_weight_stats() -> WeightStatsStore:
+    from neural_mri.main import weight_stats
+
+    return weight_stats
+
+
+def get_settings() -> Settings:
+    from neural_mri.main import settings
+
+    return settings
+
+
 @router.get("/list")
 async def get_model_list(
     mm: ModelManager = Depends(get_model_manager),
@@ -36,43 +61,110 @@ async def get_model_list(
     return list_models(mm.model_id)
 
 
-@router.post("/load", response_model=ModelInfo)
+@router.post("/load", response_model=LoadJobInfo, status_code=202)
 async def load_model(
     req: ModelLoadRequest,
-    mm: ModelManager = Depends(get_model_manager),
-    cache: ScanCache = Depends(get_scan_cache),
-    sae_mgr: SAEManager = Depends(get_sae_manager),
-) -> ModelInfo:
-    try:
-        # Invalidate cache and SAE for the old model if switching
-        if mm.model_id and mm.model_id != req.model_id:
-            cache.invalidate_model(mm.model_id)
-            sae_mgr.unload()
-        result = mm.load_model(req.model_id, req.device)
+    jobs: LoadJobManager = Depends(get_load_jobs),
+    weight_stats: WeightStatsStore = Depends(get_weight_stats),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
+    settings: Settings = Depends(get_settings),
+) -> LoadJobInfo:
+    """Start loading a model in the background; poll ``/jobs/{job_id}`` for progress."""
+    if req.precision not in LOAD_PRECISIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown precision: {req.precision}")
+    mm = jobs.model_manager
+
+    def on_ready(info: ModelInfo) -> None:
         # Register dynamic model (no-op if already in registry)
-        add_recent_model(req.model_id, n_params=result.n_params)
-        return result
-    except RuntimeError as e:
-        raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=500, detail=str(e))
+        add_recent_model(req.model_id, n_params=info.n_params)
+        # Precompute T2 weight stats and warm up once nothing more urgent is queued
+        with mm.bind(req.model_id):
+            model = mm.get_model()
+        scheduler.submit(weight_stats.warm, req.model_id, model, priority="background")
+        if settings.warmup_seq_lens or settings.compile_forward:
+            schedule_warm_up(scheduler, model, settings.warmup_seq_lens, settings.compile_forward)
+
+    return jobs.submit(req.model_id, req.device, on_ready, req.precision).info()
+
+
+def _get_job(jobs: LoadJobManager, job_id: str) -> LoadJob:
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Unknown load job: {job_id}")
+    return job
+
+
+@router.get("/jobs/{job_id}", response_model=LoadJobInfo)
+async def get_load_job(
+    job_id: str,
+    jobs: LoadJobManager = Depends(get_load_jobs),
+) -> LoadJobInfo:
+    return _get_job(jobs, job_id).info()
+
+
+@router.delete("/jobs/{job_id}", response_model=LoadJobInfo)
+async def cancel_load_job(
+    job_id: str,
+    jobs: LoadJobManager = Depends(get_load_jobs),
+) -> LoadJobInfo:
+    _get_job(jobs, job_id)
+    return jobs.cancel(job_id).info()
+
+
+@router.websocket("/jobs/{job_id}/ws")
+async def watch_load_job(
+    ws: WebSocket,
+    job_id: str,
+    jobs: LoadJobManager = Depends(get_load_jobs),
+) -> None:
+    """Push the job state on every change until it finishes."""
+    await ws.accept()
+    job = jobs.get(job_id)
+    if job is None:
+        await ws.send_json({"type": "error", "message": f"Unknown load job: {job_id}"})
+        await ws.close()
+        return
+    seen = -1
+    try:
+        while True:
+            if job.version != seen:
+                seen = job.version
+                await ws.send_json(job.info().model_dump(mode="json"))
+                if job.done:
+                    break
+            await asyncio.sleep(0.2)
+        await ws.close()
+    except WebSocketDisconnect:
+        pass
+
+
+@router.get("/pool")
+async def get_model_pool(
+    mm: ModelManager = Depends(get_model_manager),
+) -> dict:
+    """Resident models (most recently used first) and pool memory usage."""
+    return mm.pool_status()
 
 
 @router.get("/info", response_model=ModelInfo)
 async def get_model_info(
+    model_id: str | None = None,
     mm: ModelManager = Depends(get_model_manager),
 ) -> ModelInfo:
-    if not mm.is_loaded:
-        raise HTTPException(status_code=404, detail="No model loaded")
-    return mm.get_model_info()
+    with mm.bind(model_id):
+        if not mm.is_loaded:
+            raise HTTPException(status_code=404, detail="No model loaded")
+        return mm.get_model_info()
 
 
 @router.delete("/unload")
 async def unload_model(
+    model_id: str | None = None,
     mm: ModelManager = Depends(get_model_manager),
     cache: ScanCache = Depends(get_scan_cache),
 ) -> dict:
-    if mm.model_id:
-        cache.invalidate_model(mm.model_id)
-    mm.unload_model()
+    target = model_id or mm.model_id
+    if target:
+        cache.invalidate_model(target)
+    mm.unload_model(target)
     return {"status": "unloaded"}
@@ -1,11 +1,13 @@
 from __future__ import annotations
 
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException
 
+from neural_mri.core.attribution import METHODS
 from neural_mri.core.model_manager import ModelManager
 from neural_mri.core.perturbation_engine import PerturbationEngine
+from neural_mri.core.request_key import request_key
+from neural_mri.core.scheduler import InferenceScheduler
+from neural_mri.core.single_flight import SingleFlight
 from neural_mri.schemas.causal_trace import (
     CausalTraceRequest,
     CausalTraceResult,
@@ -34,6 +36,36 @@ def get_perturbation_engine(
     return PerturbationEngine(mm)
 
 
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
+
+
+def get_single_flight() -> SingleFlight:
+    from neural_mri.main import single_flight
+
+    return single_flight
+
+
+async def _perturb_once(
+    flights: SingleFlight,
+    scheduler: InferenceScheduler,
+    mm: ModelManager,
+    kind: str,
+    fn,
+    req,
+    priority: str = "interactive",
+):
+    """Run ``fn(req)`` on the scheduler, sharing it with identical in-flight requests."""
+
+    async def compute():
+        return await scheduler.run(fn, req, priority=priority)
+
+    # Perturbations are not cached; every request parameter is part of the key
+    return await flights.run(mm.model_id, f"perturb/{kind}", request_key(req), compute)
+
+
 def _require_model(mm: ModelManager) -> None:
     if not mm.is_loaded:
         raise HTTPException(status_code=400, detail="No model loaded. Load a model first.")
@@ -43,50 +75,71 @@ def _require_model(mm: ModelManager) -> None:
 async def perturb_zero(
     req: ZeroOutRequest,
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: PerturbationEngine = Depends(get_perturbation_engine),
+    flights: SingleFlight = Depends(get_single_flight),
 ) -> PerturbResult:
-    _require_model(mm)
-    return await asyncio.to_thread(engine.zero_out, req)
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        return await _perturb_once(flights, scheduler, mm, "zero", engine.zero_out, req)
 
 
 @router.post("/amplify", response_model=PerturbResult)
 async def perturb_amplify(
     req: AmplifyRequest,
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: PerturbationEngine = Depends(get_perturbation_engine),
+    flights: SingleFlight = Depends(get_single_flight),
 ) -> PerturbResult:
-    _require_model(mm)
-    return await asyncio.to_thread(engine.amplify, req)
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        return await _perturb_once(flights, scheduler, mm, "amplify", engine.amplify, req)
 
 
 @router.post("/ablate", response_model=PerturbResult)
 async def perturb_ablate(
     req: AblateRequest,
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: PerturbationEngine = Depends(get_perturbation_engine),
+    flights: SingleFlight = Depends(get_single_flight),
 ) -> PerturbResult:
-    _require_model(mm)
-    return await asyncio.to_thread(engine.ablate, req)
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        return await _perturb_once(flights, scheduler, mm, "ablate", engine.ablate, req)
 
 
 @router.post("/patch", response_model=PatchResult)
 async def perturb_patch(
     req: PatchRequest,
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: PerturbationEngine = Depends(get_perturbation_engine),
+    flights: SingleFlight = Depends(get_single_flight),
 ) -> PatchResult:
-    _require_model(mm)
-    return await asyncio.to_thread(engine.activation_patch, req)
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        return await _perturb_once(flights, scheduler, mm, "patch", engine.activation_patch, req)
 
 
 @router.post("/causal-trace", response_model=CausalTraceResult)
 async def causal_trace(
     req: CausalTraceRequest,
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: PerturbationEngine = Depends(get_perturbation_engine),
+    flights: SingleFlight = Depends(get_single_flight),
 ) -> CausalTraceResult:
-    _require_model(mm)
-    return await asyncio.to_thread(engine.causal_trace, req)
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        if req.method not in METHODS:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown causal trace method: {req.method}"
+            )
+        return await _perturb_once(
+            flights, scheduler, mm, "causal-trace", engine.causal_trace, req, priority="batch"
+        )
 
 
 @router.post("/reset")
@@ -1,12 +1,13 @@
 from __future__ import annotations
 
-import asyncio
-
 from fastapi import APIRouter, Depends, HTTPException
 
+from neural_mri.config import Settings
 from neural_mri.core.analysis_engine import AnalysisEngine
 from neural_mri.core.model_manager import ModelManager
 from neural_mri.core.report_engine import ReportEngine
+from neural_mri.core.scheduler import InferenceScheduler
+from neural_mri.core.weight_stats import WeightStatsStore
 from neural_mri.schemas.report import DiagnosticReport, ReportRequest
 
 router = APIRouter()
@@ -18,10 +19,30 @@ def get_model_manager() -> ModelManager:
     return model_manager
 
 
+def get_settings() -> Settings:
+    from neural_mri.main import settings
+
+    return settings
+
+
+def get_weight_stats() -> WeightStatsStore:
+    from neural_mri.main import weight_stats
+
+    return weight_stats
+
+
 def get_report_engine(
     mm: ModelManager = Depends(get_model_manager),
+    settings: Settings = Depends(get_settings),
+    weight_stats: WeightStatsStore = Depends(get_weight_stats),
 ) -> ReportEngine:
-    return ReportEngine(mm, AnalysisEngine(mm))
+    return ReportEngine(mm, AnalysisEngine(mm, settings, weight_stats))
+
+
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
 
 
 def _require_model(mm: ModelManager) -> None:
@@ -33,8 +54,10 @@ def _require_model(mm: ModelManager) -> None:
 async def generate_report(
     req: ReportRequest = ReportRequest(),
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: ReportEngine = Depends(get_report_engine),
 ) -> DiagnosticReport:
-    _require_model(mm)
-    result = await asyncio.to_thread(engine.generate, req)
-    return result
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        result = await scheduler.run(engine.generate, req, priority="batch")
+        return result
@@ -1,14 +1,20 @@
 from __future__ import annotations
 
-import asyncio
-
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import Response
 
+from neural_mri.api.cached_response import scan_hit_response, set_etag
+from neural_mri.api.tensor_response import SCAN_TENSOR_FIELDS, tensor_response, wants_binary
+from neural_mri.config import Settings
+from neural_mri.core.activation_store import ActivationStore
 from neural_mri.core.analysis_engine import AnalysisEngine
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.request_key import request_key
 from neural_mri.core.sae_manager import SAEManager
 from neural_mri.core.sae_registry import get_sae_info, list_sae_support
 from neural_mri.core.scan_cache import ScanCache
+from neural_mri.core.scheduler import InferenceScheduler
+from neural_mri.core.single_flight import SingleFlight
 from neural_mri.schemas.scan import SAEData, SAEScanRequest
 
 router = APIRouter()
@@ -32,10 +38,36 @@ def get_scan_cache() -> ScanCache:
     return scan_cache
 
 
+def get_settings() -> Settings:
+    from neural_mri.main import settings
+
+    return settings
+
+
+def get_activation_store() -> ActivationStore | None:
+    from neural_mri.main import activation_store
+
+    return activation_store
+
+
 def get_analysis_engine(
     mm: ModelManager = Depends(get_model_manager),
+    settings: Settings = Depends(get_settings),
+    activations: ActivationStore | None = Depends(get_activation_store),
 ) -> AnalysisEngine:
-    return AnalysisEngine(mm)
+    return AnalysisEngine(mm, settings, activations=activations)
+
+
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
+
+
+def get_single_flight() -> SingleFlight:
+    from neural_mri.main import single_flight
+
+    return single_flight
 
 
 def _require_model(mm: ModelManager) -> None:
@@ -74,26 +106,41 @@ async def sae_support() -> dict[str, bool]:
 @router.post("/scan", response_model=SAEData)
 async def sae_scan(
     req: SAEScanRequest,
+    request: Request,
+    response: Response,
+    format: str = "json",
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     sae_mgr: SAEManager = Depends(get_sae_manager),
     cache: ScanCache = Depends(get_scan_cache),
-) -> SAEData:
+    flights: SingleFlight = Depends(get_single_flight),
+) -> SAEData | Response:
     """Run SAE feature scan on a specific layer."""
-    _require_model(mm)
-
-    info = get_sae_info(mm.model_id)
-    if info is None:
-        raise HTTPException(
-            status_code=400,
-            detail=f"No SAE available for model: {mm.model_id}",
-        )
-
-    cache_key = f"{req.prompt}::layer{req.layer_idx}::k{req.top_k}"
-    cached = cache.get(mm.model_id, "sae", cache_key)
-    if cached is not None:
-        return SAEData(**cached)
-
-    result = await asyncio.to_thread(engine.scan_sae, req, sae_mgr)
-    cache.put(mm.model_id, "sae", cache_key, result.model_dump())
-    return result
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        binary = wants_binary(request, format)
+
+        info = get_sae_info(mm.model_id)
+        if info is None:
+            raise HTTPException(
+                status_code=400,
+                detail=f"No SAE available for model: {mm.model_id}",
+            )
+
+        cache_key = request_key(req)
+        hit = await scan_hit_response(request, binary, cache, mm.model_id, "sae", cache_key)
+        if hit is not None:
+            return hit
+
+        async def compute() -> tuple[SAEData, dict]:
+            result = await scheduler.run(engine.scan_sae, req, sae_mgr)
+            data = result.model_dump()
+            cache.put(mm.model_id, "sae", cache_key, data)
+            return result, data
+
+        result, data = await flights.run(mm.model_id, "sae", cache_key, compute)
+        if binary:
+            return tensor_response(data, SCAN_TENSOR_FIELDS["sae"])
+        set_etag(response, cache, mm.model_id, "sae", cache_key)
+        return result
@@ -1,12 +1,31 @@
 from __future__ import annotations
 
-import asyncio
+from collections.abc import Callable
 
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import ORJSONResponse, Response
 
-from neural_mri.core.analysis_engine import AnalysisEngine
+from neural_mri.api.cached_response import cached_response, scan_hit_response, set_etag
+from neural_mri.api.tensor_response import (
+    SCAN_TENSOR_FIELDS,
+    fused_tensor_fields,
+    tensor_response,
+    wants_binary,
+)
+from neural_mri.config import Settings
+from neural_mri.core.activation_store import ActivationStore
+from neural_mri.core.analysis_engine import AGGREGATIONS, FUSED_MODE_FIELDS, AnalysisEngine
+from neural_mri.core.attribution import METHODS
+from neural_mri.core.micro_batch import MicroBatcher
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.precision import REQUEST_PRECISIONS, call_in_precision
+from neural_mri.core.request_key import broad_request, derive, request_key
+from neural_mri.core.sae_manager import SAEManager
+from neural_mri.core.sae_registry import default_sae_layer, get_sae_info
 from neural_mri.core.scan_cache import ScanCache
+from neural_mri.core.scheduler import InferenceScheduler
+from neural_mri.core.single_flight import SingleFlight
+from neural_mri.core.weight_stats import WeightStatsStore
 from neural_mri.schemas.scan import (
     ActivationData,
     ActivationScanRequest,
@@ -14,6 +33,9 @@ from neural_mri.schemas.scan import (
     AnomalyScanRequest,
     CircuitData,
     CircuitScanRequest,
+    FusedScanData,
+    FusedScanRequest,
+    SAEScanRequest,
     StructuralData,
     StructuralScanRequest,
     WeightData,
@@ -35,10 +57,66 @@ def get_scan_cache() -> ScanCache:
     return scan_cache
 
 
+def get_sae_manager() -> SAEManager:
+    from neural_mri.main import sae_manager
+
+    return sae_manager
+
+
+def get_settings() -> Settings:
+    from neural_mri.main import settings
+
+    return settings
+
+
+def get_weight_stats() -> WeightStatsStore:
+    from neural_mri.main import weight_stats
+
+    return weight_stats
+
+
+def get_activation_store() -> ActivationStore | None:
+    from neural_mri.main import activation_store
+
+    return activation_store
+
+
 def get_analysis_engine(
     mm: ModelManager = Depends(get_model_manager),
+    settings: Settings = Depends(get_settings),
+    weight_stats: WeightStatsStore = Depends(get_weight_stats),
+    activations: ActivationStore | None = Depends(get_activation_store),
 ) -> AnalysisEngine:
-    return AnalysisEngine(mm)
+    return AnalysisEngine(mm, settings, weight_stats, activations)
+
+
+def get_scheduler() -> InferenceScheduler:
+    from neural_mri.main import scheduler
+
+    return scheduler
+
+
+def get_batcher() -> MicroBatcher:
+    from neural_mri.main import batcher
+
+    return batcher
+
+
+def get_single_flight() -> SingleFlight:
+    from neural_mri.main import single_flight
+
+    return single_flight
+
+
+def _batch_fn(mm: ModelManager, precision: str | None, fn: Callable[[list], list]):
+    """Batch job for ``fn`` on the currently bound model, whichever request flushes it."""
+    model_id = mm.model_id
+
+    def run(reqs: list) -> list:
+        with mm.bind(model_id):
+            return call_in_precision(mm, precision, fn, reqs)
+
+    return run
 
 
 def _require_model(mm: ModelManager) -> None:
@@ -46,81 +124,285 @@ def _require_model(mm: ModelManager) -> None:
         raise HTTPException(status_code=400, detail="No model loaded. Load a model first.")
 
 
+def _check_precision(precision: str | None) -> None:
+    if precision is not None and precision not in REQUEST_PRECISIONS:
+        raise HTTPException(status_code=400, detail=f"Unknown precision: {precision}")
+
+
 @router.post("/structural", response_model=StructuralData)
 async def scan_structural(
-    _req: StructuralScanRequest = StructuralScanRequest(),
+    request: Request,
+    response: Response,
+    req: StructuralScanRequest = StructuralScanRequest(),
     mm: ModelManager = Depends(get_model_manager),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     cache: ScanCache = Depends(get_scan_cache),
-) -> StructuralData:
-    _require_model(mm)
-    cached = cache.get(mm.model_id, "structural", "")
-    if cached is not None:
-        return StructuralData(**cached)
-    result = engine.scan_structural()
-    cache.put(mm.model_id, "structural", "", result.model_dump())
-    return result
+) -> StructuralData | Response:
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        hit = await cached_response(request, cache, mm.model_id, "structural", "")
+        if hit is not None:
+            return hit
+        result = engine.scan_structural()
+        cache.put(mm.model_id, "structural", "", result.model_dump())
+        set_etag(response, cache, mm.model_id, "structural", "")
+        return result
 
 
 @router.post("/weights", response_model=WeightData)
 async def scan_weights(
+    request: Request,
+    response: Response,
     req: WeightScanRequest = WeightScanRequest(),
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     cache: ScanCache = Depends(get_scan_cache),
-) -> WeightData:
-    _require_model(mm)
-    cached = cache.get(mm.model_id, "weights", "")
-    if cached is not None:
-        return WeightData(**cached)
-    result = engine.scan_weights(req.layers)
-    cache.put(mm.model_id, "weights", "", result.model_dump())
-    return result
+    flights: SingleFlight = Depends(get_single_flight),
+) -> WeightData | Response:
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        # Stats of every layer are cached; a layer subset is filtered from them
+        key = request_key(broad_request("weights", req))
+        if not req.layers:
+            hit = await cached_response(request, cache, mm.model_id, "weights", key)
+            if hit is not None:
+                return hit
+        else:
+            cached = await cache.aget(mm.model_id, "weights", key)
+            if cached is not None:
+                return ORJSONResponse(derive("weights", req, cached))
+
+        async def compute() -> dict:
+            result = await scheduler.run(engine.scan_weights)
+            data = result.model_dump()
+            cache.put(mm.model_id, "weights", key, data)
+            return data
+
+        data = await flights.run(mm.model_id, "weights", key, compute)
+        if not req.layers:
+            set_etag(response, cache, mm.model_id, "weights", key)
+        return WeightData(**derive("weights", req, data))
 
 
 @router.post("/activation", response_model=ActivationData)
 async def scan_activation(
     req: ActivationScanRequest,
+    request: Request,
+    response: Response,
     mm: ModelManager = Depends(get_model_manager),
+    batcher: MicroBatcher = Depends(get_batcher),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     cache: ScanCache = Depends(get_scan_cache),
-) -> ActivationData:
-    _require_model(mm)
-    cached = cache.get(mm.model_id, "activation", req.prompt)
-    if cached is not None:
-        return ActivationData(**cached)
-    result = await asyncio.to_thread(engine.scan_activation, req)
-    cache.put(mm.model_id, "activation", req.prompt, result.model_dump())
-    return result
+    flights: SingleFlight = Depends(get_single_flight),
+) -> ActivationData | Response:
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        _check_precision(req.precision)
+        if req.aggregation not in AGGREGATIONS:
+            raise HTTPException(
+                status_code=400, detail=f"Unknown fMRI aggregation: {req.aggregation}"
+            )
+        # All layers are scanned and cached; a layer subset is filtered from them
+        broad = broad_request("activation", req)
+        key = request_key(broad)
+        if not req.layers:
+            hit = await cached_response(request, cache, mm.model_id, "activation", key)
+            if hit is not None:
+                return hit
+        else:
+            cached = await cache.aget(mm.model_id, "activation", key)
+            if cached is not None:
+                return ORJSONResponse(derive("activation", req, cached))
+
+        async def compute() -> tuple[ActivationData, dict]:
+            result = await batcher.run(
+                ("fMRI", mm.model_id, req.precision),
+                broad,
+                _batch_fn(mm, req.precision, engine.scan_activation_batch),
+            )
+            data = result.model_dump()
+            cache.put(mm.model_id, "activation", key, data)
+            return result, data
+
+        result, data = await flights.run(mm.model_id, "activation", key, compute)
+        if not req.layers:
+            set_etag(response, cache, mm.model_id, "activation", key)
+            return result
+        return ActivationData(**derive("activation", req, data))
 
 
 @router.post("/circuits", response_model=CircuitData)
 async def scan_circuits(
     req: CircuitScanRequest,
+    request: Request,
+    response: Response,
+    format: str = "json",
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     cache: ScanCache = Depends(get_scan_cache),
-) -> CircuitData:
-    _require_model(mm)
-    cached = cache.get(mm.model_id, "circuits", req.prompt)
-    if cached is not None:
-        return CircuitData(**cached)
-    result = await asyncio.to_thread(engine.scan_circuits, req)
-    cache.put(mm.model_id, "circuits", req.prompt, result.model_dump())
-    return result
+    flights: SingleFlight = Depends(get_single_flight),
+) -> CircuitData | Response:
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        binary = wants_binary(request, format)
+        if req.method not in METHODS:
+            raise HTTPException(status_code=400, detail=f"Unknown DTI method: {req.method}")
+        # Keyed by method too: attribution approximations never serve exact requests
+        key = request_key(req)
+        hit = await scan_hit_response(request, binary, cache, mm.model_id, "circuits", key)
+        if hit is not None:
+            return hit
+
+        async def compute() -> tuple[CircuitData, dict]:
+            result = await scheduler.run(engine.scan_circuits, req)
+            data = result.model_dump()
+            cache.put(mm.model_id, "circuits", key, data)
+            return result, data
+
+        result, data = await flights.run(mm.model_id, "circuits", key, compute)
+        if binary:
+            return tensor_response(data, SCAN_TENSOR_FIELDS["circuits"], result._tensors)
+        set_etag(response, cache, mm.model_id, "circuits", key)
+        return result
 
 
 @router.post("/anomaly", response_model=AnomalyData)
 async def scan_anomaly(
     req: AnomalyScanRequest,
+    request: Request,
+    response: Response,
+    format: str = "json",
+    mm: ModelManager = Depends(get_model_manager),
+    batcher: MicroBatcher = Depends(get_batcher),
+    engine: AnalysisEngine = Depends(get_analysis_engine),
+    cache: ScanCache = Depends(get_scan_cache),
+    flights: SingleFlight = Depends(get_single_flight),
+) -> AnomalyData | Response:
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        binary = wants_binary(request, format)
+        _check_precision(req.precision)
+        key = request_key(req)
+        hit = await scan_hit_response(request, binary, cache, mm.model_id, "anomaly", key)
+        if hit is not None:
+            return hit
+
+        async def compute() -> tuple[AnomalyData, dict]:
+            result = await batcher.run(
+                ("FLAIR", mm.model_id, req.precision),
+                req,
+                _batch_fn(mm, req.precision, engine.scan_anomaly_batch),
+            )
+            data = result.model_dump()
+            cache.put(mm.model_id, "anomaly", key, data)
+            return result, data
+
+        result, data = await flights.run(mm.model_id, "anomaly", key, compute)
+        if binary:
+            return tensor_response(data, SCAN_TENSOR_FIELDS["anomaly"])
+        set_etag(response, cache, mm.model_id, "anomaly", key)
+        return result
+
+
+def _fused_cache_key(mode: str, req: FusedScanRequest) -> str:
+    """Cache key of the single-mode request each fused modality is equivalent to."""
+    if mode == "fMRI":
+        return request_key(ActivationScanRequest(prompt=req.prompt, precision=req.precision))
+    if mode == "DTI":
+        single = CircuitScanRequest(prompt=req.prompt, target_token_idx=req.target_token_idx)
+    elif mode == "FLAIR":
+        return request_key(AnomalyScanRequest(prompt=req.prompt, precision=req.precision))
+    else:
+        single = SAEScanRequest(prompt=req.prompt, layer_idx=req.sae_layer_idx, top_k=req.sae_top_k)
+    # The DTI and SAE endpoints have no precision option; it only keys fused runs
+    return request_key(single, precision=req.precision)
+
+
+@router.post("/all", response_model=FusedScanData)
+async def scan_all(
+    req: FusedScanRequest,
+    request: Request,
+    format: str = "json",
     mm: ModelManager = Depends(get_model_manager),
+    scheduler: InferenceScheduler = Depends(get_scheduler),
     engine: AnalysisEngine = Depends(get_analysis_engine),
     cache: ScanCache = Depends(get_scan_cache),
-) -> AnomalyData:
-    _require_model(mm)
-    cached = cache.get(mm.model_id, "anomaly", req.prompt)
-    if cached is not None:
-        return AnomalyData(**cached)
-    result = await asyncio.to_thread(engine.scan_anomaly, req)
-    cache.put(mm.model_id, "anomaly", req.prompt, result.model_dump())
-    return result
+    sae_mgr: SAEManager = Depends(get_sae_manager),
+    flights: SingleFlight = Depends(get_single_flight),
+) -> FusedScanData | Response:
+    """Fused fMRI/DTI/FLAIR/SAE scan: one forward pass for every missing mode."""
+    with mm.bind(req.model_id):
+        _require_model(mm)
+        binary = wants_binary(request, format)
+        unknown = [m for m in req.modes if m not in FUSED_MODE_FIELDS]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unsupported scan modes: {unknown}")
+        _check_precision(req.precision)
+        if "SAE" in req.modes:
+            if get_sae_info(mm.model_id) is None:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"No SAE available for model: {mm.model_id}",
+                )
+            if req.sae_layer_idx is None:
+                req = req.model_copy(update={"sae_layer_idx": default_sae_layer(mm.model_id)})
+
+        # Serve what we can from the per-mode cache; fuse the rest into one pass
+        results: dict[str, dict] = {}
+        for mode in req.modes:
+            field = FUSED_MODE_FIELDS[mode]
+            cached = await cache.aget(mm.model_id, field, _fused_cache_key(mode, req))
+            if cached is not None:
+                results[field] = cached
+
+        missing = [m for m in req.modes if FUSED_MODE_FIELDS[m] not in results]
+        metadata: dict = {"cached_modes": [m for m in req.modes if m not in missing]}
+        tensors: dict = {}
+        if missing:
+            fused_req = req.model_copy(update={"modes": missing})
+
+            async def compute():
+                fused = await scheduler.run(
+                    call_in_precision,
+                    mm,
+                    req.precision,
+                    engine.scan_fused,
+                    fused_req,
+                    sae_mgr,
+                )
+                dumps = {}
+                for mode in fused.modes:
+                    field = FUSED_MODE_FIELDS[mode]
+                    dumps[field] = getattr(fused, field).model_dump()
+                    cache.put(mm.model_id, field, _fused_cache_key(mode, req), dumps[field])
+                return fused, dumps
+
+            fused, dumps = await flights.run(mm.model_id, "fused", request_key(fused_req), compute)
+            for mode in fused.modes:
+                field = FUSED_MODE_FIELDS[mode]
+                mode_result = getattr(fused, field)
+                results[field] = dumps[field]
+                for path, tensor in getattr(mode_result, "_tensors", {}).items():
+                    tensors[f"{field}.{path}"] = tensor
+            metadata.update(fused.metadata)
+
+        modes = [m for m in FUSED_MODE_FIELDS if m in req.modes]
+        if binary:
+            data = {
+                "model_id": mm.model_id,
+                "scan_mode": "fused",
+                "prompt": req.prompt,
+                "modes": modes,
+                **results,
+                "metadata": metadata,
+            }
+            return tensor_response(data, fused_tensor_fields(list(results)), tensors)
+        return FusedScanData(
+            model_id=mm.model_id,
+            prompt=req.prompt,
+            modes=modes,
+            **results,
+            metadata=metadata,
+        )
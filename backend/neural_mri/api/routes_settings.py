@@ -27,7 +27,14 @@ class TokenStatusResponse(BaseModel):
 
 class CacheStatusResponse(BaseModel):
     entry_count: int
-    max_entries: int
+    bytes_used: int
+    budget_bytes: int
+    mode_bytes: dict[str, int]
+    hits: int
+    misses: int
+    rejected: int
+    evictions: int
+    disk: dict | None = None  # on-disk tier: entries, bytes, budget_bytes, hits, misses
 
 
 def get_scan_cache() -> ScanCache:
@@ -36,12 +43,6 @@ def get_scan_cache() -> ScanCache:
     return scan_cache
 
 
-def get_settings():
-    from neural_mri.main import settings
-
-    return settings
-
-
 def _validate_token(token: str) -> bool:
     """Validate HF token by calling whoami endpoint."""
     try:
@@ -99,11 +100,18 @@ async def get_token_status() -> TokenStatusResponse:
 @router.get("/cache")
 async def get_cache_status(
     cache: ScanCache = Depends(get_scan_cache),
-    settings=Depends(get_settings),
 ) -> CacheStatusResponse:
+    stats = cache.stats()
     return CacheStatusResponse(
-        entry_count=len(cache._store),
-        max_entries=settings.max_cache_entries,
+        entry_count=stats["entries"],
+        bytes_used=stats["bytes"],
+        budget_bytes=stats["budget_bytes"],
+        mode_bytes=stats["mode_bytes"],
+        hits=stats["hits"],
+        misses=stats["misses"],
+        rejected=stats["rejected"],
+        evictions=stats["evictions"],
+        disk=stats["disk"],
     )
 
 
@@ -0,0 +1,50 @@
+"""Opt-in binary responses for scan endpoints (see ``utils.tensor_codec``).
+
+Clients request the binary encoding with ``?format=binary`` or an
+``Accept: application/x-nmri-tensor`` header; JSON stays the default.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Mapping
+from typing import Any
+
+from fastapi import HTTPException, Request
+from fastapi.responses import Response
+
+from neural_mri.utils.tensor_codec import MEDIA_TYPE, TensorField, encode
+
+# Matrix-valued fields per scan-cache mode name
+SCAN_TENSOR_FIELDS: dict[str, tuple[TensorField, ...]] = {
+    # Attention probabilities live in [0, 1]: 8-bit quantization is plenty for display
+    "circuits": (TensorField("attention_heads[].pattern", "u8"),),
+    "anomaly": (
+        TensorField("layers[].anomaly_scores"),
+        TensorField("layers[].kl_scores"),
+        TensorField("layers[].entropy_scores"),
+    ),
+    "sae": (TensorField("heatmap_values"),),
+}
+
+
+def wants_binary(request: Request, format: str) -> bool:
+    if format not in ("json", "binary"):
+        raise HTTPException(status_code=400, detail=f"Unknown response format: {format}")
+    return format == "binary" or MEDIA_TYPE in request.headers.get("accept", "")
+
+
+def tensor_response(
+    data: dict,
+    fields: tuple[TensorField, ...],
+    tensors: Mapping[str, Any] | None = None,
+) -> Response:
+    return Response(content=encode(data, fields, tensors), media_type=MEDIA_TYPE)
+
+
+def fused_tensor_fields(result_fields: list[str]) -> tuple[TensorField, ...]:
+    """Tensor fields of a fused result, prefixed by each mode's result field."""
+    return tuple(
+        TensorField(f"{name}.{field.path}", field.dtype)
+        for name in result_fields
+        for field in SCAN_TENSOR_FIELDS.get(name, ())
+    )
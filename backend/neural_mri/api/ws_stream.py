@@ -12,11 +12,10 @@ router = APIRouter()
 logger = logging.getLogger(__name__)
 
 
-def _get_engine():
-    from neural_mri.core.analysis_engine import AnalysisEngine
-    from neural_mri.main import model_manager
+def _get_settings():
+    from neural_mri.main import settings
 
-    return AnalysisEngine(model_manager)
+    return settings
 
 
 def _get_model_manager():
@@ -25,6 +24,18 @@ def _get_model_manager():
     return model_manager
 
 
+def _get_scheduler():
+    from neural_mri.main import scheduler
+
+    return scheduler
+
+
+def _get_single_flight():
+    from neural_mri.main import single_flight
+
+    return single_flight
+
+
 @router.websocket("/ws/stream")
 async def websocket_stream(ws: WebSocket) -> None:
     """WebSocket endpoint for real-time scan streaming.
@@ -70,26 +81,40 @@ async def _handle_scan_stream(ws: WebSocket, msg: dict) -> None:
         return
 
     mm = _get_model_manager()
-    if not mm.is_loaded:
-        await ws.send_json({"type": "error", "message": "No model loaded"})
-        return
-
-    model = mm.get_model()
+    with mm.bind(msg.get("model_id")):
+        if not mm.is_loaded:
+            await ws.send_json({"type": "error", "message": "No model loaded"})
+            return
+        model = mm.get_model()
+        model_id = mm.model_id
     cfg = model.cfg
 
     start = time.time()
 
     # Tokenize
-    tokens = model.to_tokens(prompt)
-    str_tokens = model.to_str_tokens(prompt)
+    from neural_mri.core.tokenization import tokenization
+
+    encoded = tokenization(model).encode(prompt)
+    tokens, str_tokens = encoded.tokens, encoded.str_tokens
     seq_len = tokens.shape[1]
 
-    # Forward pass with cache (in thread to avoid blocking)
+    # Forward pass with cache (in thread to avoid blocking), keeping only
+    # the hooks this stream mode reads
+    from neural_mri.core.hook_plan import plan_for_mode
+
+    plan = plan_for_mode(mode, cfg.n_layers) if mode in ("fMRI", "DTI") else None
+
     def _run_cache():
         with torch.no_grad():
-            return model.run_with_cache(tokens)
+            return model.run_with_cache(tokens, names_filter=plan)
 
-    logits, cache = await asyncio.to_thread(_run_cache)
+    async def _shared_run_cache():
+        return await _get_scheduler().run(_run_cache, priority="streaming")
+
+    # Everyone following a collab host streams the same prompt at once
+    logits, cache = await _get_single_flight().run(
+        model_id, f"stream/{mode}", prompt, _shared_run_cache
+    )
 
     # Send scan_start
     await ws.send_json(
@@ -105,7 +130,7 @@ async def _handle_scan_stream(ws: WebSocket, msg: dict) -> None:
     if mode == "fMRI":
         await _stream_fmri_frames(ws, model, cfg, cache, seq_len)
     elif mode == "DTI":
-        await _stream_dti_frames(ws, model, cfg, cache, tokens, logits, seq_len)
+        await _stream_dti_frames(ws, model_id, model, cfg, cache, tokens, logits, prompt)
 
     elapsed_ms = (time.time() - start) * 1000
     await ws.send_json(
@@ -170,9 +195,9 @@ async def _stream_fmri_frames(ws, model, cfg, cache, seq_len: int) -> None:
         await asyncio.sleep(0.01)
 
 
-async def _stream_dti_frames(ws, model, cfg, cache, tokens, logits, seq_len: int) -> None:
+async def _stream_dti_frames(ws, model_id, model, cfg, cache, tokens, logits, prompt) -> None:
     """Stream DTI data: attention patterns + component importance."""
-    target_idx = seq_len - 1
+    target_idx = tokens.shape[1] - 1
 
     # Send attention patterns
     for i in range(cfg.n_layers):
@@ -188,29 +213,30 @@ async def _stream_dti_frames(ws, model, cfg, cache, tokens, logits, seq_len: int
             )
         await asyncio.sleep(0.01)
 
-    # Component importance via zero-ablation (streamed per component)
-    baseline_logit = logits[0, target_idx].clone()
-    component_ids = ["embed"]
-    hook_points = ["hook_embed"]
-    for i in range(cfg.n_layers):
-        component_ids.append(f"blocks.{i}.attn")
-        hook_points.append(f"blocks.{i}.hook_attn_out")
-        component_ids.append(f"blocks.{i}.mlp")
-        hook_points.append(f"blocks.{i}.hook_mlp_out")
-
-    raw_importances = []
-    for comp_id, hook_name in zip(component_ids, hook_points):
-
-        def zero_hook(value, hook):
-            return torch.zeros_like(value)
-
-        def _ablate():
-            with torch.no_grad():
-                return model.run_with_hooks(tokens, fwd_hooks=[(hook_name, zero_hook)])
+    # Component importance via batched zero-ablation (streamed per component)
+    from neural_mri.core.ablation_engine import AblationEngine
+    from neural_mri.core.hook_plan import component_hook_points
+
+    points = component_hook_points(cfg.n_layers)
+    component_ids = [comp_id for comp_id, _ in points]
+    hook_points = [hook_name for _, hook_name in points]
+
+    ablator = AblationEngine(model, budget_mb=_get_settings().ablation_batch_mb)
+
+    async def _importance():
+        return await _get_scheduler().run(
+            ablator.zero_ablation_importance,
+            tokens,
+            logits,
+            hook_points,
+            target_idx,
+            cache,
+            priority="streaming",
+        )
 
-        ablated = await asyncio.to_thread(_ablate)
-        diff = torch.norm(baseline_logit - ablated[0, target_idx]).item()
-        raw_importances.append(diff)
+    raw_importances = await _get_single_flight().run(
+        model_id, "stream/DTI-importance", prompt, _importance
+    )
 
     # Normalize and send
     imp_max = max(raw_importances) if raw_importances else 1.0
@@ -11,12 +11,36 @@ class Settings(BaseSettings):
 
     # Model
     default_model: str = "gpt2"
+    # Opt-in: load default_model in the background. The server accepts requests
+    # at once, but GET /api/ready is 503 (and scans fail) until the model is in.
+    fast_start: bool = False
     device: str = "auto"  # "auto" | "cpu" | "cuda" | "mps"
-    model_cache_dir: str | None = None
+    precision: str = "auto"  # default-model precision: "auto" | "fp32" | "bf16"
+    model_cache_dir: str | None = None  # default: ~/.cache/neural_mri
+    model_snapshots: bool = True  # reload processed weights from model_cache_dir/snapshots
     hf_token: str | None = None  # HuggingFace token for gated models (Gemma, Llama, etc.)
+    model_pool_budget_gb: float = 8.0  # memory budget for resident models (<= 0: no limit)
+    model_pool_max_models: int = 3  # resident models kept before LRU eviction
+
+    # Compute
+    inference_threads: int = 0  # torch intra-op threads of the inference worker (0 = default)
+    micro_batch_window_ms: float = 10.0  # how long a scan waits for peers to batch with
+    micro_batch_max: int = 16  # prompts per batched fMRI/FLAIR forward (<= 1: no batching)
+    warmup_seq_lens: list[int] = [8, 32, 128]  # post-load warm-up lengths ([] disables warm-up)
+    compile_forward: bool = False  # torch.compile the hook-free forward (battery bias compare)
+    ablation_batch_mb: int = 256  # activation memory budget per batched ablation forward
+    flair_vocab_chunk: int = 8192  # vocab tile width for the streamed FLAIR logit lens
+    weight_stats_dir: str | None = None  # default: <model_cache_dir or ~/.cache/neural_mri>/...
 
     # Cache
-    max_cache_entries: int = 5  # LRU scan result cache size
+    scan_cache_budget_mb: int = 256  # approximate serialized size of cached scan results
+    scan_cache_mode_quota: float = 0.5  # share of the budget one scan mode may hold
+    scan_cache_admit_fraction: float = 0.25  # larger results are not cached
+    scan_disk_cache: bool = True  # persist scan results under <model_cache_dir>/scans
+    scan_disk_cache_mb: int = 2048  # on-disk budget (compressed), LRU-pruned
+    activation_store_mb: int = 512  # raw activations reused across scan modes (0 = off)
+    activation_store_fp16: bool = False  # store activations in float16 (half the memory)
+    activation_store_ttl_s: float = 300.0
 
     # Deployment
     environment: str = "local"  # "local" | "docker" | "huggingface"
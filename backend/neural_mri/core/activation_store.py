@@ -0,0 +1,156 @@
+"""Short-lived store of raw activations, shared across scan modes.
+
+A session typically runs fMRI, then DTI, then FLAIR, then SAE on one
+prompt. The scan cache only holds each mode's final result, so every mode
+used to redo ``run_with_cache``. When the store is enabled, a forward pass
+caches the union of the hooks our modes read (``SHARED_MODES``) and keeps
+the logits and activations here, keyed by (model, precision, token ids).
+A later mode whose hook plan is covered skips the forward pass.
+
+Entries expire after ``ttl_s`` and are evicted least recently used first
+to stay within a byte budget; they are dropped when their model leaves
+the pool. With ``half=True`` floating tensors are kept in float16 and
+restored to their original dtype on read (at a small fidelity cost).
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import torch
+
+from neural_mri.core.hook_plan import HookPlan, plan_for_modes
+
+logger = logging.getLogger(__name__)
+
+# Modes whose hooks every stored forward pass captures
+SHARED_MODES = ("fMRI", "DTI", "FLAIR")
+
+
+def shared_plan(n_layers: int) -> HookPlan:
+    return plan_for_modes(SHARED_MODES, n_layers)
+
+
+def _precision_tag(model) -> str:
+    """Distinguishes fp32, bf16 and autocast runs of one model."""
+    device_type = torch.device(model.cfg.device).type
+    try:
+        autocast = torch.is_autocast_enabled(device_type)
+    except TypeError:  # torch < 2.4
+        autocast = (
+            torch.is_autocast_cpu_enabled() if device_type == "cpu" else torch.is_autocast_enabled()
+        )
+    return f"{model.cfg.dtype}:{'autocast' if autocast else 'eager'}"
+
+
+def _nbytes(tensor: torch.Tensor) -> int:
+    return tensor.numel() * tensor.element_size()
+
+
+@dataclass
+class _Entry:
+    plan: HookPlan
+    logits: torch.Tensor
+    cache: dict[str, torch.Tensor]
+    dtypes: dict[str, torch.dtype]
+    size: int
+    created: float
+
+
+class ActivationStore:
+    """Byte-bounded LRU of (logits, activation cache) per model and prompt."""
+
+    def __init__(self, budget_bytes: int, half: bool = False, ttl_s: float = 300.0) -> None:
+        self._budget = budget_bytes
+        self._half = half
+        self._ttl = ttl_s
+        self._entries: OrderedDict[tuple, _Entry] = OrderedDict()
+        self._bytes = 0
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    @staticmethod
+    def key(model_id: str, model, tokens: torch.Tensor) -> tuple:
+        """Store key for a ``[1, seq_len]`` token tensor."""
+        return (model_id, _precision_tag(model), tuple(tokens[0].tolist()))
+
+    def get(self, key: tuple, plan: HookPlan) -> tuple[torch.Tensor, dict] | None:
+        """(logits, cache) if a live entry for ``key`` covers ``plan``."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry.created > self._ttl:
+                self._remove(key)
+                entry = None
+            if entry is None or not entry.plan.covers(plan):
+                self._misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self._hits += 1
+        cache = {name: self._restore(t, entry.dtypes[name]) for name, t in entry.cache.items()}
+        return self._restore(entry.logits, entry.dtypes[""]), cache
+
+    def put(self, key: tuple, plan: HookPlan, logits: torch.Tensor, cache) -> None:
+        """Store copies of ``logits`` and the ``plan`` hooks of ``cache``."""
+        dtypes = {"": logits.dtype}
+        stored = {}
+        for name in plan.names:
+            if name in cache:
+                dtypes[name] = cache[name].dtype
+                stored[name] = self._pack(cache[name])
+        entry = _Entry(
+            plan=plan,
+            logits=self._pack(logits),
+            cache=stored,
+            dtypes=dtypes,
+            size=_nbytes(logits) + sum(_nbytes(t) for t in stored.values()),
+            created=time.monotonic(),
+        )
+        if entry.size > self._budget:
+            return
+        with self._lock:
+            if key in self._entries:
+                self._remove(key)
+            self._entries[key] = entry
+            self._bytes += entry.size
+            while self._bytes > self._budget:
+                self._remove(next(iter(self._entries)))
+
+    def _pack(self, tensor: torch.Tensor) -> torch.Tensor:
+        # Copy: batched runs hand in views of the whole batch
+        tensor = tensor.detach()
+        if self._half and tensor.is_floating_point():
+            return tensor.to(torch.float16)
+        return tensor.clone()
+
+    @staticmethod
+    def _restore(tensor: torch.Tensor, dtype: torch.dtype) -> torch.Tensor:
+        return tensor if tensor.dtype == dtype else tensor.to(dtype)
+
+    def _remove(self, key: tuple) -> None:
+        entry = self._entries.pop(key)
+        self._bytes -= entry.size
+
+    def invalidate_model(self, model_id: str) -> None:
+        """Drop every entry of ``model_id`` (model evicted or unloaded)."""
+        with self._lock:
+            for key in [k for k in self._entries if k[0] == model_id]:
+                self._remove(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+
+    def stats(self) -> dict:
+        return {
+            "entries": len(self._entries),
+            "bytes": self._bytes,
+            "budget_bytes": self._budget,
+            "hits": self._hits,
+            "misses": self._misses,
+        }
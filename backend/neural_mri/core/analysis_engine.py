@@ -5,9 +5,24 @@ import time
 
 import torch
 
+from neural_mri.config import Settings
+from neural_mri.core.ablation_engine import AblationEngine
+from neural_mri.core.activation_store import ActivationStore, shared_plan
+from neural_mri.core.attribution import (
+    IMPORTANCE_METRICS,
+    METHODS,
+    AttributionPatcher,
+    attribution_scores,
+)
+from neural_mri.core.hook_plan import component_hook_points, plan_for_mode, plan_for_modes
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.request_key import activation_layer_selected, weight_layer_selected
 from neural_mri.core.sae_manager import SAEManager
-from neural_mri.core.sae_registry import get_sae_info
+from neural_mri.core.sae_registry import default_sae_layer, get_sae_info
+from neural_mri.core.token_table import token_table
+from neural_mri.core.tokenization import tokenization
+from neural_mri.core.vocab_stream import logit_lens_stats
+from neural_mri.core.weight_stats import WeightStatsStore
 from neural_mri.schemas.scan import (
     ActivationData,
     ActivationScanRequest,
@@ -18,6 +33,8 @@ from neural_mri.schemas.scan import (
     CircuitScanRequest,
     ComponentImportance,
     ConnectionInfo,
+    FusedScanData,
+    FusedScanRequest,
     LayerActivation,
     LayerAnomaly,
     LayerStructure,
@@ -31,16 +48,81 @@ from neural_mri.schemas.scan import (
     TokenPredictionLens,
     WeightData,
 )
-from neural_mri.utils.tensor_summary import tensor_stats
 
 logger = logging.getLogger(__name__)
 
+# Prompt-based modalities that can share one cached forward pass, mapped to
+# the FusedScanData field (and ScanCache mode) each one populates
+FUSED_MODE_FIELDS: dict[str, str] = {
+    "fMRI": "activation",
+    "DTI": "circuits",
+    "FLAIR": "anomaly",
+    "SAE": "sae",
+}
+
+# fMRI per-token reductions of an activation vector
+AGGREGATIONS = ("l2", "mean")
+
+
+def _aggregate(x: torch.Tensor, dim, how: str) -> torch.Tensor:
+    """L2 norm or mean absolute value of ``x`` over ``dim``."""
+    if how == "mean":
+        return x.abs().mean(dim=dim)
+    return torch.norm(x, dim=dim)
+
+
+def _slice_cache(cache, b: int, seq_len: int) -> dict[str, torch.Tensor]:
+    """Request ``b``'s view ``[1, seq_len, ...]`` of a right-padded batched cache."""
+    sliced = {}
+    for name, tensor in cache.items():
+        tensor = tensor[b : b + 1]
+        if name.endswith(("hook_pattern", "hook_attn_scores")):
+            tensor = tensor[..., :seq_len, :seq_len]
+        elif tensor.dim() >= 2:
+            tensor = tensor[:, :seq_len]
+        sliced[name] = tensor
+    return sliced
+
 
 class AnalysisEngine:
     """Performs scan analyses across different MRI modalities."""
 
-    def __init__(self, model_manager: ModelManager) -> None:
+    def __init__(
+        self,
+        model_manager: ModelManager,
+        settings: Settings | None = None,
+        weight_stats: WeightStatsStore | None = None,
+        activations: ActivationStore | None = None,
+    ) -> None:
         self._mm = model_manager
+        self._settings = settings or Settings()
+        self._weight_stats = weight_stats or WeightStatsStore()
+        self._activations = activations
+
+    def _run_with_cache(self, model, tokens: torch.Tensor, plan) -> tuple:
+        """``run_with_cache(tokens, names_filter=plan)`` for one prompt.
+
+        With an activation store, a recent forward pass of the same prompt
+        (by any scan mode) is reused; a fresh pass captures the hooks of
+        every shared mode so that later modes can reuse it too.
+        """
+        store = self._activations
+        if store is None:
+            with torch.no_grad():
+                return model.run_with_cache(tokens, names_filter=plan)
+        key = store.key(self._mm.model_id, model, tokens)
+        hit = store.get(key, plan)
+        if hit is not None:
+            return hit
+        full = plan | shared_plan(model.cfg.n_layers)
+        with torch.no_grad():
+            logits, cache = model.run_with_cache(tokens, names_filter=full)
+        store.put(key, full, logits, cache)
+        return logits, cache
+
+    def ablation_engine(self, model) -> AblationEngine:
+        """Batched zero-ablation runner bounded by the configured memory budget."""
+        return AblationEngine(model, budget_mb=self._settings.ablation_batch_mb)
 
     def scan_structural(self) -> StructuralData:
         """T1 scan: extract static architecture topology from model config."""
@@ -134,42 +216,16 @@ class AnalysisEngine:
         return connections
 
     def scan_weights(self, layer_ids: list[str] | None = None) -> WeightData:
-        """T2 scan: extract weight distribution statistics from state_dict."""
+        """T2 scan: weight distribution statistics (precomputed once per model)."""
         start = time.time()
         model = self._mm.get_model()
-        state_dict = model.state_dict()
 
         results: list[LayerWeightStats] = []
-        for name, tensor in state_dict.items():
+        for entry in self._weight_stats.get(self._mm.model_id, model):
             # Filter by requested layers
-            if layer_ids and not any(lid in name for lid in layer_ids):
+            if not weight_layer_selected(f"{entry['layer_id']}.{entry['component']}", layer_ids):
                 continue
-
-            # Skip 1D tensors (biases, layer norms) — focus on weight matrices
-            if tensor.ndim < 2:
-                continue
-
-            stats = tensor_stats(tensor)
-
-            # Map parameter name to layer_id (e.g. "blocks.0.attn.W_Q" -> "blocks.0.attn")
-            parts = name.split(".")
-            component = parts[-1]  # e.g. "W_Q", "W_K", "W_in", "W_out"
-            layer_id = ".".join(parts[:-1])  # e.g. "blocks.0.attn"
-
-            results.append(
-                LayerWeightStats(
-                    layer_id=layer_id,
-                    component=component,
-                    mean=stats["mean"],
-                    std=stats["std"],
-                    min_val=stats["min_val"],
-                    max_val=stats["max_val"],
-                    l2_norm=stats["l2_norm"],
-                    shape=stats["shape"],
-                    num_outliers=stats["num_outliers"],
-                    histogram=stats["histogram"],
-                )
-            )
+            results.append(LayerWeightStats(**entry))
 
         elapsed_ms = (time.time() - start) * 1000
 
@@ -186,27 +242,94 @@ class AnalysisEngine:
     # fMRI: Activation Scan
     # ------------------------------------------------------------------ #
 
+    def _forward_batch(self, model, prompts: list[str], plan) -> list[tuple]:
+        """One cached forward pass over several prompts.
+
+        Prompts are right-padded into one batch; with causal attention the
+        real positions never attend to the padding, so each request's slice
+        of the logits and cache equals its own batch-size-1 run. Returns
+        ``(str_tokens, logits, cache)`` per prompt.
+        """
+        encoded = [tokenization(model).encode(prompt) for prompt in prompts]
+        str_tokens = [enc.str_tokens for enc in encoded]
+        if len(encoded) == 1:
+            logits, cache = self._run_with_cache(model, encoded[0].tokens, plan)
+            return [(str_tokens[0], logits, cache)]
+
+        # Prompts with reusable activations skip the batch
+        store = self._activations
+        runs: list[tuple | None] = [None] * len(encoded)
+        if store is not None:
+            keys = [store.key(self._mm.model_id, model, enc.tokens) for enc in encoded]
+            for b, key in enumerate(keys):
+                hit = store.get(key, plan)
+                if hit is not None:
+                    runs[b] = (str_tokens[b], *hit)
+            plan = plan | shared_plan(model.cfg.n_layers)
+        missing = [b for b, run in enumerate(runs) if run is None]
+        if not missing:
+            return runs
+
+        rows = [encoded[b].tokens[0] for b in missing]
+        lengths = [row.shape[0] for row in rows]
+        pad_id = getattr(model.tokenizer, "pad_token_id", None) or 0
+        tokens = torch.full(
+            (len(rows), max(lengths)), pad_id, dtype=rows[0].dtype, device=rows[0].device
+        )
+        for b, row in enumerate(rows):
+            tokens[b, : lengths[b]] = row
+        with torch.no_grad():
+            logits, cache = model.run_with_cache(tokens, names_filter=plan)
+        for i, (b, n) in enumerate(zip(missing, lengths)):
+            run_logits, run_cache = logits[i : i + 1, :n], _slice_cache(cache, i, n)
+            if store is not None:
+                store.put(keys[b], plan, run_logits, run_cache)
+            runs[b] = (str_tokens[b], run_logits, run_cache)
+        return runs
+
     def scan_activation(self, req: ActivationScanRequest) -> ActivationData:
         """fMRI scan: run prompt through model, extract per-layer activations."""
+        return self.scan_activation_batch([req])[0]
+
+    def scan_activation_batch(self, reqs: list[ActivationScanRequest]) -> list[ActivationData]:
+        """fMRI scans for several prompts sharing one batched forward pass."""
+        for req in reqs:
+            if req.aggregation not in AGGREGATIONS:
+                raise ValueError(f"Unknown fMRI aggregation: {req.aggregation}")
         start = time.time()
         model = self._mm.get_model()
-        cfg = model.cfg
 
-        # Tokenize
-        tokens = model.to_tokens(req.prompt)  # [1, seq_len]
-        str_tokens = model.to_str_tokens(req.prompt)  # list of strings
-        seq_len = tokens.shape[1]
-
-        # Run with cache — single forward pass captures all activations
-        with torch.no_grad():
-            _, cache = model.run_with_cache(tokens)
+        # Retain only the hooks fMRI reads
+        plan = plan_for_mode("fMRI", model.cfg.n_layers)
+        runs = self._forward_batch(model, [req.prompt for req in reqs], plan)
+        return [
+            self._build_activation(model, cache, str_tokens, start, req.aggregation, req.layers)
+            for req, (str_tokens, _, cache) in zip(reqs, runs)
+        ]
+
+    def _build_activation(
+        self,
+        model,
+        cache,
+        str_tokens: list,
+        start: float,
+        aggregation: str = "l2",
+        layer_ids: list[str] | None = None,
+    ) -> ActivationData:
+        """fMRI post-processing: per-layer activation norms from a cache.
+
+        Values are normalized over every layer before ``layer_ids`` selects
+        which to return, so a layer reads the same in any selection.
+        """
+        cfg = model.cfg
+        seq_len = len(str_tokens)
 
         layers: list[LayerActivation] = []
         all_norms: list[float] = []  # collect all raw norms for global normalization
 
         # Embedding activation
         embed_act = cache["hook_embed"]  # [1, seq, d_model]
-        embed_norms = torch.norm(embed_act[0], dim=-1).tolist()  # [seq]
+        embed_norms = _aggregate(embed_act[0], -1, aggregation).tolist()  # [seq]
         all_norms.extend(embed_norms)
 
         # Per-block activations
@@ -217,26 +340,26 @@ class AnalysisEngine:
         for i in range(cfg.n_layers):
             # Attention per-head output: hook_z shape [1, seq, n_heads, d_head]
             attn_z = cache[f"blocks.{i}.attn.hook_z"]  # [1, seq, heads, d_head]
-            # Per-token aggregate: L2 norm across heads and d_head
-            attn_norms = torch.norm(attn_z[0], dim=(-1, -2)).tolist()  # [seq]
+            # Per-token aggregate across heads and d_head
+            attn_norms = _aggregate(attn_z[0], (-1, -2), aggregation).tolist()  # [seq]
             all_norms.extend(attn_norms)
             block_attn_norms.append(attn_norms)
 
-            # Per-head activations: L2 norm per head per token
-            per_head = torch.norm(attn_z[0], dim=-1)  # [seq, heads]
+            # Per-head activations per token
+            per_head = _aggregate(attn_z[0], -1, aggregation)  # [seq, heads]
             head_max = per_head.max().item() or 1.0
             per_head_normalized = (per_head / head_max).T.tolist()  # [heads, seq]
             block_attn_heads.append(per_head_normalized)
 
             # MLP output
             mlp_out = cache[f"blocks.{i}.hook_mlp_out"]  # [1, seq, d_model]
-            mlp_norms = torch.norm(mlp_out[0], dim=-1).tolist()  # [seq]
+            mlp_norms = _aggregate(mlp_out[0], -1, aggregation).tolist()  # [seq]
             all_norms.extend(mlp_norms)
             block_mlp_norms.append(mlp_norms)
 
         # Unembed: use residual stream at final layer
         resid_final = cache[f"blocks.{cfg.n_layers - 1}.hook_resid_post"]  # [1, seq, d_model]
-        unembed_norms = torch.norm(resid_final[0], dim=-1).tolist()
+        unembed_norms = _aggregate(resid_final[0], -1, aggregation).tolist()
         all_norms.extend(unembed_norms)
 
         # Global 0-1 normalization
@@ -274,6 +397,7 @@ class AnalysisEngine:
                 activations=normalize(unembed_norms),
             )
         )
+        layers = [layer for layer in layers if activation_layer_selected(layer.layer_id, layer_ids)]
 
         elapsed_ms = (time.time() - start) * 1000
         logger.info(
@@ -290,6 +414,7 @@ class AnalysisEngine:
             metadata={
                 "seq_len": seq_len,
                 "n_layers": cfg.n_layers,
+                "aggregation": aggregation,
                 "compute_time_ms": round(elapsed_ms, 1),
             },
         )
@@ -300,60 +425,77 @@ class AnalysisEngine:
 
     def scan_circuits(self, req: CircuitScanRequest) -> CircuitData:
         """DTI scan: trace important circuits via attention + zero-ablation."""
+        if req.method not in METHODS:
+            raise ValueError(f"Unknown DTI method: {req.method}")
         start = time.time()
         model = self._mm.get_model()
-        cfg = model.cfg
 
-        tokens = model.to_tokens(req.prompt)  # [1, seq_len]
-        str_tokens = model.to_str_tokens(req.prompt)
-        seq_len = tokens.shape[1]
-        target_idx = req.target_token_idx if req.target_token_idx >= 0 else seq_len - 1
+        encoded = tokenization(model).encode(req.prompt)
+        tokens, str_tokens = encoded.tokens, encoded.str_tokens  # [1, seq_len]
+
+        # --- (1) Baseline logits (cache keeps attention patterns + resume points) ---
+        plan = plan_for_mode("DTI", model.cfg.n_layers)
+        baseline_logits, cache = self._run_with_cache(model, tokens, plan)
+
+        return self._build_circuits(
+            model,
+            tokens,
+            str_tokens,
+            baseline_logits,
+            cache,
+            req.target_token_idx,
+            start,
+            method=req.method,
+        )
 
-        # --- (1) Baseline logits ---
-        with torch.no_grad():
-            baseline_logits, cache = model.run_with_cache(tokens)
-        baseline_logit_at_target = baseline_logits[0, target_idx].clone()
+    def _build_circuits(
+        self,
+        model,
+        tokens: torch.Tensor,
+        str_tokens: list,
+        baseline_logits: torch.Tensor,
+        cache,
+        target_token_idx: int,
+        start: float,
+        method: str = "exact",
+    ) -> CircuitData:
+        """DTI post-processing: attention patterns + zero-ablation importance."""
+        cfg = model.cfg
+        seq_len = tokens.shape[1]
+        target_idx = target_token_idx if target_token_idx >= 0 else seq_len - 1
 
         # --- (2) Extract attention patterns ---
-        attention_heads: list[AttentionHead] = []
-        for i in range(cfg.n_layers):
-            pattern = cache[f"blocks.{i}.attn.hook_pattern"]  # [1, heads, seq, seq]
-            for h in range(cfg.n_heads):
-                attention_heads.append(
-                    AttentionHead(
-                        layer_idx=i,
-                        head_idx=h,
-                        pattern=pattern[0, h].tolist(),
-                    )
-                )
+        # Stacked as [n_layers * n_heads, seq, seq] in (layer, head) order: one host transfer
+        patterns = torch.cat(
+            [cache[f"blocks.{i}.attn.hook_pattern"][0] for i in range(cfg.n_layers)]
+        ).float()
+        pattern_rows = patterns.tolist()
+        attention_heads = [
+            AttentionHead(
+                layer_idx=i,
+                head_idx=h,
+                pattern=pattern_rows[i * cfg.n_heads + h],
+            )
+            for i in range(cfg.n_layers)
+            for h in range(cfg.n_heads)
+        ]
 
         # --- (3) Zero-ablation importance for each component ---
-        # Components: embed + (attn + mlp) * n_layers + unembed = 2 + 2*n_layers
-        component_ids: list[str] = ["embed"]
-        hook_points: list[str] = ["hook_embed"]
-        for i in range(cfg.n_layers):
-            component_ids.append(f"blocks.{i}.attn")
-            hook_points.append(f"blocks.{i}.hook_attn_out")
-            component_ids.append(f"blocks.{i}.mlp")
-            hook_points.append(f"blocks.{i}.hook_mlp_out")
-
-        raw_importances: list[float] = []
-        for comp_id, hook_name in zip(component_ids, hook_points):
-            original_activation = cache[hook_name].clone()
-
-            def zero_ablation_hook(value, hook, _orig=original_activation):
-                return torch.zeros_like(value)
-
-            with torch.no_grad():
-                ablated_logits = model.run_with_hooks(
-                    tokens,
-                    fwd_hooks=[(hook_name, zero_ablation_hook)],
-                )
-            ablated_logit_at_target = ablated_logits[0, target_idx]
-
-            # Importance = change in target logit distribution (L2 distance)
-            diff = torch.norm(baseline_logit_at_target - ablated_logit_at_target).item()
-            raw_importances.append(diff)
+        # Components: embed + (attn + mlp) * n_layers = 1 + 2*n_layers
+        points = component_hook_points(cfg.n_layers)
+        component_ids = [comp_id for comp_id, _ in points]
+        hook_points = [hook_name for _, hook_name in points]
+
+        head_importances: list[list[float]] | None = None
+        if method == "attribution":
+            raw_importances, head_importances = self._attribution_importance(
+                model, tokens, hook_points, target_idx
+            )
+        else:
+            # Exact: batched forwards, importance = L2 change of the target logits
+            raw_importances = self.ablation_engine(model).zero_ablation_importance(
+                tokens, baseline_logits, hook_points, target_idx, resume_cache=cache
+            )
 
         # Normalize importance 0-1
         imp_max = max(raw_importances) if raw_importances else 1.0
@@ -397,19 +539,61 @@ class AnalysisEngine:
             elapsed_ms,
         )
 
-        return CircuitData(
+        result = CircuitData(
             model_id=self._mm.model_id,
             tokens=[str(t) for t in str_tokens],
             target_token_idx=target_idx,
             connections=connections,
             components=components,
             attention_heads=attention_heads,
+            method=method,
+            importance_metric=IMPORTANCE_METRICS[method],
+            head_importances=head_importances,
             metadata={
                 "seq_len": seq_len,
                 "n_components_ablated": len(component_ids),
                 "compute_time_ms": round(elapsed_ms, 1),
             },
         )
+        result._tensors["attention_heads[].pattern"] = patterns.cpu()
+        return result
+
+    @staticmethod
+    def _attribution_importance(
+        model,
+        tokens: torch.Tensor,
+        hook_points: list[str],
+        target_idx: int,
+    ) -> tuple[list[float], list[list[float]]]:
+        """First-order zero-ablation importance from one forward + backward.
+
+        The metric is the log-prob of the baseline top-1 token at the target
+        position, not the exact path's logit L2 change (see
+        ``IMPORTANCE_METRICS``); zeroing activation ``a`` changes it by
+        roughly ``-a · grad``.
+        Returns raw component importances and 0-1 normalized per-head scores.
+        """
+        z_hooks = [f"blocks.{i}.attn.hook_z" for i in range(model.cfg.n_layers)]
+
+        def metric(logits: torch.Tensor) -> torch.Tensor:
+            return torch.log_softmax(logits[0, target_idx].float(), dim=-1).max()
+
+        _, acts, grads = AttributionPatcher(model).run(tokens, hook_points + z_hooks, metric)
+
+        raw = [
+            abs(attribution_scores(-acts[h], grads[h]).sum().item()) if h in acts else 0.0
+            for h in hook_points
+        ]
+        head_rows = [
+            attribution_scores(-acts[z], grads[z], per_head=True).sum(dim=0).abs()
+            if z in acts
+            else torch.zeros(model.cfg.n_heads)
+            for z in z_hooks
+        ]
+        heads = torch.stack(head_rows)  # [n_layers, n_heads]
+        head_max = heads.max().item() or 1.0
+        head_importances = [[round(v, 4) for v in row] for row in (heads / head_max).tolist()]
+        return raw, head_importances
 
     # ------------------------------------------------------------------ #
     # FLAIR: Anomaly Scan (Logit Lens + Entropy)
@@ -417,79 +601,63 @@ class AnalysisEngine:
 
     def scan_anomaly(self, req: AnomalyScanRequest) -> AnomalyData:
         """FLAIR scan: detect anomalous regions via Logit Lens + Entropy."""
+        return self.scan_anomaly_batch([req])[0]
+
+    def scan_anomaly_batch(self, reqs: list[AnomalyScanRequest]) -> list[AnomalyData]:
+        """FLAIR scans for several prompts sharing one batched forward pass."""
         start = time.time()
         model = self._mm.get_model()
-        cfg = model.cfg
 
-        tokens = model.to_tokens(req.prompt)  # [1, seq_len]
-        str_tokens = model.to_str_tokens(req.prompt)
-        seq_len = tokens.shape[1]
-
-        with torch.no_grad():
-            logits, cache = model.run_with_cache(tokens)
-
-        # Final prediction distribution (reference) — upcast to float32 for numerical stability
-        final_logits = logits[0].float()  # [seq_len, d_vocab]
-        final_probs = torch.softmax(final_logits, dim=-1)
-
-        # Unembed matrix + final LayerNorm (critical for Logit Lens)
-        W_U = model.W_U.float()  # [d_model, d_vocab]
-        b_U = model.b_U.float() if model.b_U is not None else 0
-        ln_final = model.ln_final
+        plan = plan_for_mode("FLAIR", model.cfg.n_layers)
+        runs = self._forward_batch(model, [req.prompt for req in reqs], plan)
+        return [
+            self._build_anomaly(model, logits, cache, str_tokens, start)
+            for str_tokens, logits, cache in runs
+        ]
+
+    def _build_anomaly(
+        self,
+        model,
+        logits: torch.Tensor,
+        cache,
+        str_tokens: list,
+        start: float,
+    ) -> AnomalyData:
+        """FLAIR post-processing: logit lens KL + entropy per layer."""
+        cfg = model.cfg
+        seq_len = logits.shape[1]
 
-        tokenizer = model.tokenizer
         top_k_lens = 5
 
-        all_kl: list[torch.Tensor] = []
-        all_ent: list[torch.Tensor] = []
-        all_top_preds: list[list[list[TokenPredictionLens]]] = []
-
-        for i in range(cfg.n_layers):
-            resid = cache[f"blocks.{i}.hook_resid_post"]  # [1, seq, d_model]
-
-            # Logit Lens: apply final LayerNorm then unembed (float32 for log stability)
-            ln_resid = ln_final(resid[0]).float()  # [seq, d_model]
-            intermediate_logits = ln_resid @ W_U + b_U  # [seq, d_vocab]
-            intermediate_probs = torch.softmax(intermediate_logits, dim=-1)
-
-            # Top-k predictions per token for Logit Lens dashboard
-            topk_probs, topk_indices = torch.topk(
-                intermediate_probs,
-                top_k_lens,
-                dim=-1,
-            )  # [seq, k]
-            layer_preds: list[list[TokenPredictionLens]] = []
-            for t_idx in range(seq_len):
-                token_preds = []
-                for k_idx in range(top_k_lens):
-                    tok_id = topk_indices[t_idx, k_idx].item()
-                    token_preds.append(
-                        TokenPredictionLens(
-                            token=tokenizer.decode([tok_id]),
-                            prob=round(topk_probs[t_idx, k_idx].item(), 4),
-                        )
-                    )
-                layer_preds.append(token_preds)
-            all_top_preds.append(layer_preds)
-
-            # KL divergence: KL(final || intermediate) per token
-            kl = torch.sum(
-                final_probs
-                * (torch.log(final_probs + 1e-10) - torch.log(intermediate_probs + 1e-10)),
-                dim=-1,
-            )  # [seq_len]
-            all_kl.append(kl)
-
-            # Entropy of intermediate distribution per token
-            entropy = -torch.sum(
-                intermediate_probs * torch.log(intermediate_probs + 1e-10),
-                dim=-1,
-            )
-            all_ent.append(entropy)
-
-        # Stack for global normalization
-        kl_stack = torch.stack(all_kl)  # [n_layers, seq_len]
-        ent_stack = torch.stack(all_ent)
+        # Logit Lens over all layers at once: final LayerNorm (critical for the lens) on the
+        # stacked [n_layers, seq, d_model] residuals, then unembed tile by tile over the vocab
+        resid = torch.stack([cache[f"blocks.{i}.hook_resid_post"][0] for i in range(cfg.n_layers)])
+        stats = logit_lens_stats(
+            model.ln_final(resid),
+            model.W_U,
+            model.b_U,
+            logits[0],
+            k=top_k_lens,
+            chunk_size=self._settings.flair_vocab_chunk,
+        )
+        # KL(final || intermediate) and entropy of the intermediate distribution, per token
+        kl_stack = stats.kl  # [n_layers, seq_len]
+        ent_stack = stats.entropy
+
+        # Top-k predictions per layer x token: one host transfer, one decode pass
+        topk_ids = stats.topk_indices.flatten().tolist()
+        topk_probs = stats.topk_log_probs.exp().flatten().tolist()
+        topk_strs = token_table(model).decode(topk_ids)
+
+        flat_preds = [
+            TokenPredictionLens(token=tok, prob=round(prob, 4))
+            for tok, prob in zip(topk_strs, topk_probs)
+        ]
+        k = top_k_lens
+        all_top_preds = [
+            [flat_preds[(i * seq_len + t) * k : (i * seq_len + t + 1) * k] for t in range(seq_len)]
+            for i in range(cfg.n_layers)
+        ]
 
         # 0-1 normalize globally
         kl_min, kl_max = kl_stack.min(), kl_stack.max()
@@ -503,14 +671,15 @@ class AnalysisEngine:
         # Anomaly score: weighted combination
         anomaly = 0.6 * kl_norm + 0.4 * ent_norm  # [n_layers, seq_len]
 
+        anomaly_rows, kl_rows, ent_rows = torch.stack([anomaly, kl_norm, ent_norm]).tolist()
         layers: list[LayerAnomaly] = []
         for i in range(cfg.n_layers):
             layers.append(
                 LayerAnomaly(
                     layer_id=f"blocks.{i}",
-                    anomaly_scores=[round(v, 4) for v in anomaly[i].tolist()],
-                    kl_scores=[round(v, 4) for v in kl_norm[i].tolist()],
-                    entropy_scores=[round(v, 4) for v in ent_norm[i].tolist()],
+                    anomaly_scores=[round(v, 4) for v in anomaly_rows[i]],
+                    kl_scores=[round(v, 4) for v in kl_rows[i]],
+                    entropy_scores=[round(v, 4) for v in ent_rows[i]],
                     top_predictions=all_top_preds[i],
                 )
             )
@@ -544,6 +713,21 @@ class AnalysisEngine:
         """Decode residual stream into sparse SAE features for a given layer."""
         start = time.time()
         model = self._mm.get_model()
+        sae, sae_info, hook_name = self._resolve_sae(req.layer_idx, sae_mgr)
+
+        # Tokenize
+        encoded = tokenization(model).encode(req.prompt)
+        tokens, str_tokens = encoded.tokens, encoded.str_tokens  # [1, seq_len]
+
+        # Forward pass caching only the SAE hook point
+        plan = plan_for_mode("SAE", model.cfg.n_layers, sae_hook=hook_name)
+        _, cache = self._run_with_cache(model, tokens, plan)
+
+        return self._build_sae(req, cache, str_tokens, sae, sae_info, hook_name, start)
+
+    def _resolve_sae(self, layer_idx: int, sae_mgr: SAEManager) -> tuple:
+        """Load the SAE for a layer and resolve (sae, sae_info, hook_name)."""
+        model = self._mm.get_model()
         model_id = self._mm.model_id
         device = str(model.cfg.device)
 
@@ -552,20 +736,26 @@ class AnalysisEngine:
             raise ValueError(f"No SAE available for model: {model_id}")
 
         # Load SAE for the target layer
-        sae = sae_mgr.get_sae(model_id, req.layer_idx, device)
+        sae = sae_mgr.get_sae(model_id, layer_idx, device)
         # SAE-Lens >=4: hook_name is in metadata, not cfg directly
         hook_name = sae.cfg.metadata.get("hook_name") if sae.cfg.metadata else None
         if not hook_name:
             # Fallback: derive from sae_id_template
-            hook_name = sae_info["sae_id_template"].format(layer=req.layer_idx)
-
-        # Tokenize
-        tokens = model.to_tokens(req.prompt)  # [1, seq_len]
-        str_tokens = model.to_str_tokens(req.prompt)
-
-        # Forward pass with cache
-        with torch.no_grad():
-            _, cache = model.run_with_cache(tokens)
+            hook_name = sae_info["sae_id_template"].format(layer=layer_idx)
+        return sae, sae_info, hook_name
+
+    def _build_sae(
+        self,
+        req: SAEScanRequest,
+        cache,
+        str_tokens: list,
+        sae,
+        sae_info: dict,
+        hook_name: str,
+        start: float,
+    ) -> SAEData:
+        """SAE post-processing: encode the cached hook activations into features."""
+        model_id = self._mm.model_id
 
         # Extract activations at the SAE hook point
         activations = cache[hook_name]  # [1, seq_len, d_model]
@@ -593,54 +783,49 @@ class AnalysisEngine:
 
         neuronpedia_template = sae_info.get("neuronpedia_url_template")
 
-        token_features_list: list[SAETokenFeatures] = []
-        all_active_indices: set[int] = set()
-
         # Find global max for normalization
         global_max = features_2d.max().item() if features_2d.numel() > 0 else 1.0
         global_max = max(global_max, 1e-8)
 
-        for t_idx in range(seq_len):
-            tok_feats = features_2d[t_idx]  # [d_sae]
-            topk_vals, topk_idxs = torch.topk(tok_feats, top_k)
-
-            feat_infos: list[SAEFeatureInfo] = []
-            for val, idx in zip(topk_vals.tolist(), topk_idxs.tolist()):
-                np_url = None
-                if neuronpedia_template:
-                    np_url = neuronpedia_template.format(layer=req.layer_idx, feature_idx=idx)
-                feat_infos.append(
+        # Top-K features for every token at once: [seq_len, top_k]
+        topk_vals, topk_idxs = torch.topk(features_2d, top_k, dim=-1)
+        topk_val_rows = topk_vals.tolist()
+        topk_idx_rows = topk_idxs.tolist()
+
+        # One URL per distinct feature rather than per (token, feature)
+        neuronpedia_urls: dict[int, str | None] = {
+            idx: (
+                neuronpedia_template.format(layer=req.layer_idx, feature_idx=idx)
+                if neuronpedia_template
+                else None
+            )
+            for idx in {idx for row in topk_idx_rows for idx in row}
+        }
+
+        token_features_list = [
+            SAETokenFeatures(
+                token_idx=t_idx,
+                token_str=str(str_tokens[t_idx]),
+                top_features=[
                     SAEFeatureInfo(
                         feature_idx=idx,
                         activation=round(val, 4),
                         activation_normalized=round(val / global_max, 4),
-                        neuronpedia_url=np_url,
+                        neuronpedia_url=neuronpedia_urls[idx],
                     )
-                )
-                if val > 0:
-                    all_active_indices.add(idx)
-
-            token_features_list.append(
-                SAETokenFeatures(
-                    token_idx=t_idx,
-                    token_str=str(str_tokens[t_idx]),
-                    top_features=feat_infos,
-                )
+                    for val, idx in zip(topk_val_rows[t_idx], topk_idx_rows[t_idx])
+                ],
             )
-
-        # Heatmap: rows = tokens, cols = union of active feature indices
-        heatmap_feature_indices = sorted(all_active_indices)
-        idx_to_col = {idx: col for col, idx in enumerate(heatmap_feature_indices)}
+            for t_idx in range(seq_len)
+        ]
+
+        # Heatmap: rows = tokens, cols = union of features active in any token's top-K,
+        # gathered on device in one index_select
+        active_cols = torch.unique(topk_idxs[topk_vals > 0])  # sorted
+        heatmap = features_2d.index_select(1, active_cols) / global_max  # [seq_len, n_feats]
+        heatmap_feature_indices = active_cols.tolist()
         n_feats = len(heatmap_feature_indices)
-
-        heatmap_values: list[list[float]] = []
-        for t_idx in range(seq_len):
-            row = [0.0] * n_feats
-            tok_feats = features_2d[t_idx]
-            for feat_idx in heatmap_feature_indices:
-                col = idx_to_col[feat_idx]
-                row[col] = round(tok_feats[feat_idx].item() / global_max, 4)
-            heatmap_values.append(row)
+        heatmap_values = [[round(v, 4) for v in row] for row in heatmap.tolist()]
 
         elapsed_ms = (time.time() - start) * 1000
         logger.info(
@@ -670,3 +855,93 @@ class AnalysisEngine:
                 "compute_time_ms": round(elapsed_ms, 1),
             },
         )
+
+    # ------------------------------------------------------------------ #
+    # Fused: fMRI + DTI + FLAIR + SAE from one forward pass
+    # ------------------------------------------------------------------ #
+
+    def scan_fused(
+        self,
+        req: FusedScanRequest,
+        sae_mgr: SAEManager | None = None,
+    ) -> FusedScanData:
+        """Run several prompt-based modalities off a single cached forward pass.
+
+        The prompt is tokenized once and run once with the union hook plan of
+        the requested modes; the cache is then fanned out to each modality's
+        post-processor. Each result's compute_time_ms includes the shared
+        forward pass plus its own post-processing.
+        """
+        start = time.time()
+        model = self._mm.get_model()
+
+        unknown = [m for m in req.modes if m not in FUSED_MODE_FIELDS]
+        if unknown:
+            raise ValueError(f"Unsupported modes for fused scan: {unknown}")
+        modes = [m for m in FUSED_MODE_FIELDS if m in req.modes]
+
+        sae_req: SAEScanRequest | None = None
+        sae = sae_info = hook_name = None
+        if "SAE" in modes:
+            if sae_mgr is None:
+                raise ValueError("SAE mode requires an SAE manager")
+            layer_idx = req.sae_layer_idx
+            if layer_idx is None:
+                layer_idx = default_sae_layer(self._mm.model_id)
+            if layer_idx is None:
+                raise ValueError(f"No SAE available for model: {self._mm.model_id}")
+            sae, sae_info, hook_name = self._resolve_sae(layer_idx, sae_mgr)
+            sae_req = SAEScanRequest(prompt=req.prompt, layer_idx=layer_idx, top_k=req.sae_top_k)
+
+        encoded = tokenization(model).encode(req.prompt)
+        tokens, str_tokens = encoded.tokens, encoded.str_tokens  # [1, seq_len]
+
+        plan = plan_for_modes(modes, model.cfg.n_layers, sae_hook=hook_name)
+        logits, cache = self._run_with_cache(model, tokens, plan)
+        forward_s = time.time() - start
+
+        results: dict[str, object] = {}
+        if "fMRI" in modes:
+            results["activation"] = self._build_activation(
+                model, cache, str_tokens, time.time() - forward_s
+            )
+        if "DTI" in modes:
+            results["circuits"] = self._build_circuits(
+                model,
+                tokens,
+                str_tokens,
+                logits,
+                cache,
+                req.target_token_idx,
+                time.time() - forward_s,
+            )
+        if "FLAIR" in modes:
+            results["anomaly"] = self._build_anomaly(
+                model, logits, cache, str_tokens, time.time() - forward_s
+            )
+        if sae_req is not None:
+            results["sae"] = self._build_sae(
+                sae_req, cache, str_tokens, sae, sae_info, hook_name, time.time() - forward_s
+            )
+
+        elapsed_ms = (time.time() - start) * 1000
+        logger.info(
+            "Fused scan (%s): %d tokens, %d hooks cached, %.1fms",
+            "+".join(modes),
+            tokens.shape[1],
+            len(plan),
+            elapsed_ms,
+        )
+
+        return FusedScanData(
+            model_id=self._mm.model_id,
+            prompt=req.prompt,
+            modes=modes,
+            **results,
+            metadata={
+                "seq_len": tokens.shape[1],
+                "n_hooks_cached": len(plan),
+                "forward_time_ms": round(forward_s * 1000, 1),
+                "compute_time_ms": round(elapsed_ms, 1),
+            },
+        )
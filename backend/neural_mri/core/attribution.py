@@ -0,0 +1,109 @@
+"""Attribution patching: first-order estimates of patching/ablation effects.
+
+Instead of one forward pass per patched component, the effect of replacing
+an activation ``a`` with ``a'`` on a scalar metric ``m`` is approximated by
+the linear term ``(a' - a) · dm/da``. One forward with gradient tracking at
+the hooks of interest plus one backward pass yields the estimate for every
+component, head and token position at once.
+"""
+
+from __future__ import annotations
+
+import logging
+import time
+from collections.abc import Callable
+
+import torch
+
+logger = logging.getLogger(__name__)
+
+METHODS = ("exact", "attribution")
+
+# What each DTI method's component importance measures. The exact path zeroes
+# each component and takes the L2 change of the target-position logits; a
+# first-order estimate of that norm would need one backward per vocab (or
+# d_model) direction, so the attribution path instead estimates the change in
+# the log-prob of the baseline top-1 token. The two can rank components
+# differently: attribution is a cheap proxy, not an approximation of exact.
+IMPORTANCE_METRICS = {"exact": "logit_l2", "attribution": "top1_logprob"}
+
+
+class AttributionPatcher:
+    """Runs a forward + backward pass and exposes activations and gradients."""
+
+    def __init__(self, model) -> None:
+        self._model = model
+
+    def run(
+        self,
+        tokens: torch.Tensor,
+        hook_names: list[str],
+        metric_fn: Callable[[torch.Tensor], torch.Tensor],
+    ) -> tuple[torch.Tensor, dict[str, torch.Tensor], dict[str, torch.Tensor]]:
+        """Forward ``tokens``, then backprop ``metric_fn(logits)`` to each hook.
+
+        Returns (logits, activations, gradients), all detached. Gradients are
+        taken with ``torch.autograd.grad`` so model parameters never accumulate
+        ``.grad``.
+        """
+        start = time.time()
+        acts: dict[str, torch.Tensor] = {}
+
+        def save_hook(value, hook):
+            if not value.requires_grad:
+                # Leaf activation (e.g. frozen embeddings): start tracking here
+                value.requires_grad_(True)
+            acts[hook.name] = value
+            return value
+
+        with torch.enable_grad():
+            logits = self._model.run_with_hooks(
+                tokens,
+                fwd_hooks=[(name, save_hook) for name in hook_names],
+            )
+            metric = metric_fn(logits)
+            names = [name for name in hook_names if name in acts]
+            grads = (
+                torch.autograd.grad(metric, [acts[name] for name in names], allow_unused=True)
+                if names
+                else ()
+            )
+
+        grad_map = {
+            name: (g.detach() if g is not None else torch.zeros_like(acts[name]))
+            for name, g in zip(names, grads)
+        }
+        act_map = {name: acts[name].detach() for name in names}
+        logger.info(
+            "Attribution pass: %d hooks, metric=%.4f, %.1fms",
+            len(names),
+            metric.item(),
+            (time.time() - start) * 1000,
+        )
+        return logits.detach(), act_map, grad_map
+
+
+def attribution_scores(
+    delta: torch.Tensor,
+    grad: torch.Tensor,
+    per_head: bool = False,
+) -> torch.Tensor:
+    """Per-position linear effect of adding ``delta`` to an activation.
+
+    ``delta`` and ``grad`` are ``[1, seq, d_model]`` (or ``[1, seq, heads,
+    d_head]`` for ``hook_z``). Returns ``[seq]``, or ``[seq, heads]`` when
+    ``per_head`` is set. Sum over positions for the component-level estimate.
+    """
+    prod = (delta.float() * grad.float())[0]
+    return prod.sum(dim=-1) if per_head else prod.flatten(start_dim=1).sum(dim=-1)
+
+
+def aligned_delta(source: torch.Tensor, target: torch.Tensor) -> torch.Tensor:
+    """``source - target`` over the shared prefix of positions, zero elsewhere.
+
+    Mirrors the exact patch hooks, which patch up to the shorter sequence.
+    """
+    delta = torch.zeros_like(target)
+    min_seq = min(source.shape[1], target.shape[1])
+    delta[:, :min_seq] = source[:, :min_seq].to(target.dtype) - target[:, :min_seq]
+    return delta
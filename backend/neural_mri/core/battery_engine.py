@@ -6,8 +6,11 @@ from typing import TYPE_CHECKING
 
 import torch
 
+from neural_mri.core.hook_plan import plan_for_modes
 from neural_mri.core.model_manager import ModelManager
 from neural_mri.core.test_registry import get_all_tests, get_tests_by_categories
+from neural_mri.core.tokenization import tokenization
+from neural_mri.core.warmup import forward
 from neural_mri.i18n import T
 from neural_mri.schemas.battery import (
     ActivationSummary,
@@ -159,10 +162,13 @@ class BatteryEngine:
         sae_info: dict | None = None,
     ) -> TestResult:
         """Run a single test case and evaluate pass/fail."""
-        tokens = model.to_tokens(tc.prompt)
+        tokens = tokenization(model).tokens(tc.prompt)
 
+        # Cache only what the activation summary (and optional SAE probe) reads
+        modes = ["battery", "SAE"] if sae is not None and hook_name is not None else ["battery"]
+        plan = plan_for_modes(modes, model.cfg.n_layers, sae_hook=hook_name)
         with torch.no_grad():
-            logits, cache = model.run_with_cache(tokens)
+            logits, cache = model.run_with_cache(tokens, names_filter=plan)
 
         # Extract top-k predictions from next token
         next_logits = logits[0, -1]  # [d_vocab]
@@ -398,9 +404,9 @@ class BatteryEngine:
         # Check expected tokens (should be in top-3 with prob > 5%)
         if tc.expected_tokens:
             for expected in tc.expected_tokens:
-                token_ids = model.to_tokens(expected, prepend_bos=False)[0]
-                if len(token_ids) > 0:
-                    exp_prob = probs[token_ids[0]].item()
+                token_id = tokenization(model).token_id(expected)
+                if token_id is not None:
+                    exp_prob = probs[token_id].item()
                     if exp_prob > 0.05 and any(expected in t for t in top3_tokens):
                         return (
                             True,
@@ -495,9 +501,9 @@ class BatteryEngine:
         pronouns = [" he", " she", " they"]
 
         for comp_prompt in tc.compare_prompts or []:
-            comp_tokens = model.to_tokens(comp_prompt)
+            comp_tokens = tokenization(model).tokens(comp_prompt)
             with torch.no_grad():
-                comp_logits = model(comp_tokens)
+                comp_logits = forward(model, comp_tokens)
 
             comp_probs = torch.softmax(comp_logits[0, -1].float(), dim=-1)
             comp_top_probs, comp_top_indices = torch.topk(comp_probs, TOP_K)
@@ -509,9 +515,9 @@ class BatteryEngine:
 
             pronoun_probs: dict[str, float] = {}
             for pron in pronouns:
-                pron_ids = model.to_tokens(pron, prepend_bos=False)[0]
-                if len(pron_ids) > 0:
-                    pronoun_probs[pron] = round(comp_probs[pron_ids[0]].item(), 4)
+                pron_id = tokenization(model).token_id(pron)
+                if pron_id is not None:
+                    pronoun_probs[pron] = round(comp_probs[pron_id].item(), 4)
 
             results.append(
                 CompareResult(
@@ -537,9 +543,9 @@ class BatteryEngine:
 
         main_probs: dict[str, float] = {}
         for pron in pronouns:
-            pron_ids = model.to_tokens(pron, prepend_bos=False)[0]
-            if len(pron_ids) > 0:
-                main_probs[pron] = probs[pron_ids[0]].item()
+            pron_id = tokenization(model).token_id(pron)
+            if pron_id is not None:
+                main_probs[pron] = probs[pron_id].item()
 
         he_prob = main_probs.get(" he", 0.0)
         she_prob = main_probs.get(" she", 0.0)
@@ -0,0 +1,124 @@
+"""Declarative hook plans: the minimal set of activations each scan reads.
+
+``run_with_cache`` without a ``names_filter`` materializes every hook point in
+the model (Q/K/V, patterns, MLP pre/post, every residual stream ...), while
+each scan mode only reads a handful of them. A ``HookPlan`` names exactly the
+hooks a mode needs; plans for several modes are combined with ``|`` and the
+result is passed straight to ``run_with_cache(names_filter=plan)``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class HookPlan:
+    """Immutable set of hook names, usable directly as a ``names_filter``."""
+
+    names: frozenset[str] = frozenset()
+
+    @classmethod
+    def of(cls, *names: str) -> HookPlan:
+        return cls(frozenset(names))
+
+    def __call__(self, name: str) -> bool:
+        return name in self.names
+
+    def __contains__(self, name: object) -> bool:
+        return name in self.names
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __or__(self, other: HookPlan) -> HookPlan:
+        return HookPlan(self.names | other.names)
+
+    def covers(self, other: HookPlan) -> bool:
+        """True if every hook in ``other`` is also in this plan."""
+        return other.names <= self.names
+
+
+def component_hook_points(n_layers: int) -> list[tuple[str, str]]:
+    """(component_id, hook_name) for embed + each block's attn and mlp output."""
+    points = [("embed", "hook_embed")]
+    for i in range(n_layers):
+        points.append((f"blocks.{i}.attn", f"blocks.{i}.hook_attn_out"))
+        points.append((f"blocks.{i}.mlp", f"blocks.{i}.hook_mlp_out"))
+    return points
+
+
+# --- Per-mode hook sets ---
+
+
+def _fmri_hooks(n_layers: int) -> Iterable[str]:
+    # Per-token norms of embed, per-head attn z, MLP out and the final residual
+    yield "hook_embed"
+    for i in range(n_layers):
+        yield f"blocks.{i}.attn.hook_z"
+        yield f"blocks.{i}.hook_mlp_out"
+    yield f"blocks.{n_layers - 1}.hook_resid_post"
+
+
+def _dti_hooks(n_layers: int) -> Iterable[str]:
+    # Attention patterns, plus residual checkpoints the ablation runs resume from
+    for i in range(n_layers):
+        yield f"blocks.{i}.attn.hook_pattern"
+        yield f"blocks.{i}.hook_resid_pre"
+
+
+def _flair_hooks(n_layers: int) -> Iterable[str]:
+    # Logit lens over every block's residual output
+    for i in range(n_layers):
+        yield f"blocks.{i}.hook_resid_post"
+
+
+def _battery_hooks(n_layers: int) -> Iterable[str]:
+    # Activation summary reads the last-token residual norm of every block
+    for i in range(n_layers):
+        yield f"blocks.{i}.hook_resid_post"
+
+
+def _causal_trace_hooks(n_layers: int) -> Iterable[str]:
+    # Clean activations patched into the corrupt run, one per component
+    for _, hook_name in component_hook_points(n_layers):
+        yield hook_name
+
+
+_MODE_HOOKS: dict[str, Callable[[int], Iterable[str]]] = {
+    "fMRI": _fmri_hooks,
+    "DTI": _dti_hooks,
+    "FLAIR": _flair_hooks,
+    "battery": _battery_hooks,
+    "causal_trace": _causal_trace_hooks,
+}
+
+# Modes whose hooks depend on the loaded SAE rather than the model shape
+_SAE_MODES = {"SAE"}
+
+PLANNED_MODES = frozenset(_MODE_HOOKS) | _SAE_MODES
+
+
+def plan_for_mode(mode: str, n_layers: int, sae_hook: str | None = None) -> HookPlan:
+    """Return the minimal hook plan for a single scan mode."""
+    if mode in _SAE_MODES:
+        if not sae_hook:
+            raise ValueError(f"Mode {mode} requires an SAE hook name")
+        return HookPlan.of(sae_hook)
+    builder = _MODE_HOOKS.get(mode)
+    if builder is None:
+        raise ValueError(f"Unknown scan mode for hook plan: {mode}")
+    return HookPlan(frozenset(builder(n_layers)))
+
+
+def plan_for_modes(
+    modes: Iterable[str],
+    n_layers: int,
+    sae_hook: str | None = None,
+) -> HookPlan:
+    """Return the union hook plan for a combination of scan modes."""
+    plan = HookPlan()
+    for mode in modes:
+        plan = plan | plan_for_mode(mode, n_layers, sae_hook)
+    return plan
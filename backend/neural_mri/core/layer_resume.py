@@ -0,0 +1,84 @@
+"""Resume-from-layer execution for ablation and patching sweeps.
+
+Perturbing a hook inside ``blocks.L`` leaves everything before layer L
+identical to the unperturbed run. Given that run's cached
+``blocks.L.hook_resid_pre``, TransformerLens can execute only blocks L..N via
+``start_at_layer``, skipping the shared prefix of the model.
+"""
+
+from __future__ import annotations
+
+import re
+
+import torch
+
+from neural_mri.core.hook_plan import HookPlan
+
+_BLOCK_RE = re.compile(r"^blocks\.(\d+)\.")
+
+
+def hook_layer(hook_name: str) -> int | None:
+    """Block index of a hook ("blocks.3.hook_mlp_out" -> 3), None outside blocks."""
+    match = _BLOCK_RE.match(hook_name)
+    return int(match.group(1)) if match else None
+
+
+def resume_hook(layer: int) -> str:
+    return f"blocks.{layer}.hook_resid_pre"
+
+
+def resume_plan(hook_names: list[str]) -> HookPlan:
+    """Residual checkpoints needed to resume at the layer of each hook."""
+    layers = {hook_layer(name) for name in hook_names}
+    return HookPlan(frozenset(resume_hook(layer) for layer in layers if layer is not None))
+
+
+class LayerResumer:
+    """Runs hooked forwards from the latest cached residual checkpoint.
+
+    ``cache`` is the cache of a run over ``tokens`` that the hooked forwards
+    diverge from (baseline or corrupt run); it should contain the
+    ``resume_plan`` of the hooks being applied. Hooks outside transformer
+    blocks (e.g. ``hook_embed``) or missing checkpoints fall back to a full
+    forward from the tokens.
+    """
+
+    def __init__(self, model, tokens: torch.Tensor, cache=None) -> None:
+        self._model = model
+        self._tokens = tokens
+        self._cache = cache
+        # Shortformer models re-add positional embeddings inside every block
+        pos_type = getattr(model.cfg, "positional_embedding_type", "standard")
+        self._enabled = cache is not None and pos_type != "shortformer"
+
+    def start_layer(self, hook_names: list[str]) -> int | None:
+        """Earliest layer the hooks touch, or None if a full forward is needed."""
+        if not self._enabled or not hook_names:
+            return None
+        layers = [hook_layer(name) for name in hook_names]
+        if any(layer is None for layer in layers):
+            return None
+        return min(layers)
+
+    def _checkpoint(self, layer: int) -> torch.Tensor | None:
+        try:
+            return self._cache[resume_hook(layer)]
+        except KeyError:
+            return None
+
+    def run_with_hooks(self, fwd_hooks: list, batch: int = 1) -> torch.Tensor:
+        """Hooked forward over ``batch`` copies of the prompt; returns logits."""
+        layer = self.start_layer([name for name, _ in fwd_hooks])
+        resid = self._checkpoint(layer) if layer is not None else None
+        if resid is None:
+            return self._model.run_with_hooks(
+                self._tokens.expand(batch, -1),
+                fwd_hooks=fwd_hooks,
+            )
+        # Materialize the batch copy so in-place hooks never write to a broadcast view
+        resid = resid.repeat(batch, 1, 1) if batch > 1 else resid
+        return self._model.run_with_hooks(
+            resid,
+            start_at_layer=layer,
+            fwd_hooks=fwd_hooks,
+        )
@@ -0,0 +1,238 @@
+"""Background model load jobs with phase/byte progress and cancellation.
+
+Loading a multi-GB model takes seconds to minutes of blocking I/O and CPU
+work. Each load runs in its own worker thread; the API hands out a job id
+and clients poll (or watch) the job. The previously active model keeps
+serving until the new one enters the pool.
+
+Phases: ``queued`` -> ``download`` (hub files, byte progress; skipped when
+a local snapshot exists) -> ``convert`` (TransformerLens processing or
+snapshot restore, including the move to the device) -> ``ready``.
+Cancellation is cooperative: it takes effect between downloaded files,
+between phases (download, convert, snapshot restore, precision cast) and
+before the loaded model enters the pool.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass, field
+
+from neural_mri.core.model_manager import LoadCancelledError, ModelManager
+from neural_mri.schemas.model import LoadJobInfo, ModelInfo
+
+logger = logging.getLogger(__name__)
+
+# Finished jobs kept for status queries
+_MAX_FINISHED_JOBS = 32
+
+# Hub files a TransformerLens load reads (weights are picked separately)
+_AUX_SUFFIXES = (".json", ".txt", ".model", ".tiktoken")
+
+
+@dataclass
+class LoadJob:
+    model_id: str
+    device: str
+    precision: str = "auto"
+    job_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    status: str = "queued"
+    phase: str = "queued"
+    bytes_done: int = 0
+    bytes_total: int = 0
+    error: str | None = None
+    result: ModelInfo | None = None
+    created: float = field(default_factory=time.time)
+    finished: float | None = None
+    # Bumped on every change so watchers can skip unchanged states
+    version: int = 0
+    _cancel: threading.Event = field(default_factory=threading.Event, repr=False)
+
+    @property
+    def done(self) -> bool:
+        return self.status in ("done", "failed", "cancelled")
+
+    @property
+    def cancel_requested(self) -> bool:
+        return self._cancel.is_set()
+
+    def update(self, **changes) -> None:
+        for key, value in changes.items():
+            setattr(self, key, value)
+        self.version += 1
+
+    def info(self) -> LoadJobInfo:
+        end = self.finished or time.time()
+        return LoadJobInfo(
+            job_id=self.job_id,
+            model_id=self.model_id,
+            device=self.device,
+            status=self.status,
+            phase=self.phase,
+            bytes_done=self.bytes_done,
+            bytes_total=self.bytes_total,
+            error=self.error,
+            result=self.result,
+            elapsed_ms=round((end - self.created) * 1000, 1),
+        )
+
+
+# (sharded index, consolidated file) per weight format, in order of preference
+_WEIGHT_FILES = (
+    ("model.safetensors.index.json", "model.safetensors"),
+    ("pytorch_model.bin.index.json", "pytorch_model.bin"),
+)
+
+
+def _weight_files(repo_id: str, sizes: dict[str, int]) -> list[str]:
+    """The weight files ``from_pretrained`` will read, without duplicate copies.
+
+    Repos may ship both a consolidated file and its shards; the shards listed
+    in the index are what transformers loads, so only those are fetched.
+    """
+    from huggingface_hub import hf_hub_download
+
+    for index, single in _WEIGHT_FILES:
+        if index in sizes:
+            with open(hf_hub_download(repo_id, index)) as fh:
+                weight_map = json.load(fh).get("weight_map", {})
+            return sorted(set(weight_map.values()))
+        if single in sizes:
+            return [single]
+    # Non-standard names: every top-level file of the preferred format
+    for suffix in (".safetensors", ".bin"):
+        weights = [name for name in sizes if name.endswith(suffix) and "/" not in name]
+        if weights:
+            return weights
+    return []
+
+
+def _hub_files(repo_id: str) -> list[tuple[str, int]]:
+    """(filename, size) of the files a load needs; safetensors preferred over .bin."""
+    from huggingface_hub import HfApi
+
+    siblings = HfApi().model_info(repo_id, files_metadata=True).siblings or []
+    sizes = {s.rfilename: s.size or 0 for s in siblings}
+    aux = [(name, size) for name, size in sizes.items() if name.endswith(_AUX_SUFFIXES)]
+    aux = [f for f in aux if "/" not in f[0]]
+    return aux + [(name, sizes.get(name, 0)) for name in _weight_files(repo_id, sizes)]
+
+
+def prefetch_weights(job: LoadJob) -> None:
+    """Download the hub files for ``job`` one by one, reporting byte progress.
+
+    Files already in the HF cache return immediately. Failures (offline,
+    unknown or gated repo) are logged and left to ``from_pretrained``, which
+    reports them properly.
+    """
+    from huggingface_hub import hf_hub_download
+    from transformer_lens.loading_from_pretrained import get_official_model_name
+
+    try:
+        repo_id = get_official_model_name(job.model_id)
+        files = _hub_files(repo_id)
+    except Exception as exc:
+        logger.info("Skipping prefetch for %s: %s", job.model_id, exc)
+        return
+
+    job.update(bytes_total=sum(size for _, size in files), bytes_done=0)
+    for filename, size in files:
+        if job.cancel_requested:
+            raise LoadCancelledError(job.model_id)
+        try:
+            hf_hub_download(repo_id, filename)
+        except Exception as exc:
+            logger.info("Prefetch of %s/%s failed: %s", repo_id, filename, exc)
+            return
+        job.update(bytes_done=job.bytes_done + size)
+
+
+class LoadJobManager:
+    """Runs model loads in worker threads; one active job per (model id, precision)."""
+
+    def __init__(self, model_manager: ModelManager) -> None:
+        self._mm = model_manager
+        self._jobs: OrderedDict[str, LoadJob] = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def model_manager(self) -> ModelManager:
+        return self._mm
+
+    def submit(
+        self,
+        model_id: str,
+        device: str = "auto",
+        on_ready: Callable[[ModelInfo], None] | None = None,
+        precision: str = "auto",
+    ) -> LoadJob:
+        """Start loading ``model_id`` (or join its running job) and return the job.
+
+        ``on_ready`` runs in the worker thread after the job is marked done.
+        """
+        with self._lock:
+            for job in self._jobs.values():
+                if job.model_id == model_id and job.precision == precision and not job.done:
+                    return job
+            job = LoadJob(model_id=model_id, device=device, precision=precision)
+            self._jobs[job.job_id] = job
+            self._prune()
+        threading.Thread(
+            target=self._run, args=(job, on_ready), name=f"load-{model_id}", daemon=True
+        ).start()
+        return job
+
+    def get(self, job_id: str) -> LoadJob | None:
+        return self._jobs.get(job_id)
+
+    def cancel(self, job_id: str) -> LoadJob | None:
+        job = self._jobs.get(job_id)
+        if job is not None and not job.done:
+            job._cancel.set()
+            job.update()
+        return job
+
+    def _prune(self) -> None:
+        finished = [jid for jid, job in self._jobs.items() if job.done]
+        for jid in finished[: max(0, len(finished) - _MAX_FINISHED_JOBS)]:
+            del self._jobs[jid]
+
+    def _run(self, job: LoadJob, on_ready: Callable[[ModelInfo], None] | None) -> None:
+        job.update(status="running")
+        try:
+            if job.model_id not in self._mm.resident_models and not self._mm.has_snapshot(
+                job.model_id, job.device, job.precision
+            ):
+                job.update(phase="download")
+                prefetch_weights(job)
+            if job.cancel_requested:
+                raise LoadCancelledError(job.model_id)
+            job.update(phase="convert")
+            info = self._mm.load_model(
+                job.model_id,
+                job.device,
+                cancelled=lambda: job.cancel_requested,
+                precision=job.precision,
+            )
+        except LoadCancelledError:
+            logger.info("Load of %s cancelled", job.model_id)
+            job.update(status="cancelled", finished=time.time())
+            return
+        except Exception as exc:
+            logger.exception("Load of %s failed", job.model_id)
+            job.update(status="failed", error=str(exc), finished=time.time())
+            return
+
+        job.update(status="done", phase="ready", result=info, finished=time.time())
+        logger.info("Load job %s (%s) done", job.job_id, job.model_id)
+        if on_ready is not None:
+            try:
+                on_ready(info)
+            except Exception:
+                logger.exception("Post-load hook for %s failed", job.model_id)
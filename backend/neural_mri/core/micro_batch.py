@@ -0,0 +1,136 @@
+"""Micro-batching of concurrent scans that share a model.
+
+Several users scanning different prompts at the same moment each paid for
+a batch-size-1 forward pass. ``MicroBatcher`` holds a request for a short
+window (``window_ms``) so that other requests with the same key (scan mode,
+model, precision) can join it; the group then runs as one scheduler job
+through a batch function that takes the list of requests and returns one
+result per request, in order. A group is flushed early once it reaches
+``max_batch``.
+
+If a batched job fails, its requests are retried one by one so that a
+single bad prompt only fails its own request.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Callable, Hashable
+from dataclasses import dataclass, field
+from typing import Any
+
+from neural_mri.core.scheduler import InferenceScheduler
+
+logger = logging.getLogger(__name__)
+
+BatchFn = Callable[[list[Any]], list[Any]]
+
+
+@dataclass
+class _Pending:
+    batch_fn: BatchFn
+    priority: str
+    items: list[tuple[Any, asyncio.Future]] = field(default_factory=list)
+    timer: asyncio.TimerHandle | None = None
+
+
+class MicroBatcher:
+    """Coalesces concurrent requests with equal keys into one batched job."""
+
+    def __init__(
+        self, scheduler: InferenceScheduler, window_ms: float = 10.0, max_batch: int = 16
+    ) -> None:
+        self._scheduler = scheduler
+        self._window = max(0.0, window_ms) / 1000
+        self._max_batch = max_batch
+        self._pending: dict[Hashable, _Pending] = {}
+        self._tasks: set[asyncio.Task] = set()
+        self._batches = 0
+        self._requests = 0
+        self._largest = 0
+
+    async def run(
+        self, key: Hashable, req: Any, batch_fn: BatchFn, priority: str = "interactive"
+    ) -> Any:
+        """Result of ``batch_fn([req, ...])`` for ``req``, batched with its peers."""
+        if self._max_batch <= 1:
+            (result,) = await self._scheduler.run(batch_fn, [req], priority=priority)
+            self._record(1)
+            return result
+
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        pending = self._pending.get(key)
+        if pending is None:
+            pending = self._pending[key] = _Pending(batch_fn, priority)
+            pending.timer = loop.call_later(self._window, self._flush, key)
+        pending.items.append((req, future))
+        if len(pending.items) >= self._max_batch:
+            self._flush(key)
+        return await future
+
+    def _flush(self, key: Hashable) -> None:
+        pending = self._pending.pop(key, None)
+        if pending is None:
+            return
+        if pending.timer is not None:
+            pending.timer.cancel()
+        task = asyncio.get_running_loop().create_task(self._execute(pending))
+        # Keep a reference until done so the task is not garbage-collected
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _execute(self, pending: _Pending) -> None:
+        reqs = [req for req, _ in pending.items]
+        futures = [future for _, future in pending.items]
+        self._record(len(reqs))
+        try:
+            results = await self._scheduler.run(pending.batch_fn, reqs, priority=pending.priority)
+        except Exception as exc:
+            if len(reqs) == 1:
+                _resolve(futures[0], exc=exc)
+                return
+            logger.info("Batch of %d failed (%s); retrying individually", len(reqs), exc)
+            await asyncio.gather(
+                *(self._execute_one(pending, req, future) for req, future in pending.items)
+            )
+            return
+        for future, result in zip(futures, results):
+            _resolve(future, result=result)
+
+    async def _execute_one(self, pending: _Pending, req: Any, future: asyncio.Future) -> None:
+        try:
+            (result,) = await self._scheduler.run(
+                pending.batch_fn, [req], priority=pending.priority
+            )
+        except Exception as exc:
+            _resolve(future, exc=exc)
+        else:
+            _resolve(future, result=result)
+
+    def _record(self, size: int) -> None:
+        self._batches += 1
+        self._requests += size
+        self._largest = max(self._largest, size)
+
+    def stats(self) -> dict:
+        """Batches run, requests served and the mean/largest batch size."""
+        return {
+            "window_ms": round(self._window * 1000, 3),
+            "max_batch": self._max_batch,
+            "batches": self._batches,
+            "requests": self._requests,
+            "mean_batch": round(self._requests / self._batches, 2) if self._batches else 0.0,
+            "largest_batch": self._largest,
+        }
+
+
+def _resolve(future: asyncio.Future, result: Any = None, exc: BaseException | None = None) -> None:
+    # The awaiting request may have been cancelled (client went away)
+    if future.done():
+        return
+    if exc is not None:
+        future.set_exception(exc)
+    else:
+        future.set_result(result)
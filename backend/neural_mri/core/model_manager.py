@@ -2,11 +2,23 @@ from __future__ import annotations
 
 import gc
 import logging
+import threading
+from collections import OrderedDict
+from collections.abc import Callable, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import TYPE_CHECKING, Any
 
 import torch
-from transformer_lens import HookedTransformer
 
-from neural_mri.schemas.model import LayerConfig, ModelInfo
+from neural_mri.core.precision import autocast_fidelity, cast_to_bf16
+from neural_mri.core.weight_stats import weight_fingerprint
+from neural_mri.schemas.model import FidelityReport, LayerConfig, ModelInfo
+
+if TYPE_CHECKING:
+    from transformer_lens import HookedTransformer
+
+    from neural_mri.core.model_snapshot import ModelSnapshotStore
 
 logger = logging.getLogger(__name__)
 
@@ -24,12 +36,49 @@ def _parse_param_str(s: str) -> int:
     return int(s)
 
 
+class LoadCancelledError(Exception):
+    """A model load was cancelled before the model entered the pool."""
+
+
+# Model a request is bound to (see ModelManager.bind); None = the active model
+_bound_model_id: ContextVar[str | None] = ContextVar("bound_model_id", default=None)
+
+
+def _model_bytes(model) -> int:
+    return sum(p.numel() * p.element_size() for p in model.parameters())
+
+
 class ModelManager:
-    """Manages model loading, swapping, and memory lifecycle."""
+    """Pool of resident models, evicted least-recently-used under a memory budget.
+
+    The *active* model is the one last loaded (what the UI is looking at).
+    Requests may target any resident model with ``bind(model_id)``: inside the
+    block ``get_model()`` / ``model_id`` resolve to that model, including in
+    the inference scheduler worker (which runs each job in the caller's context).
+
+    Work on a resident model during a load (the bf16 copy) goes through
+    ``run_job(fn, *args)``, which returns ``fn(*args)``. It should run as an
+    inference scheduler job so that it never overlaps a scan of that model.
+    """
 
-    def __init__(self) -> None:
-        self._model: HookedTransformer | None = None
-        self._model_id: str | None = None
+    def __init__(
+        self,
+        budget_gb: float = 8.0,
+        max_models: int = 3,
+        snapshots: ModelSnapshotStore | None = None,
+        run_job: Callable[..., Any] | None = None,
+    ) -> None:
+        self._models: OrderedDict[str, HookedTransformer] = OrderedDict()  # LRU -> MRU
+        self._sizes: dict[str, int] = {}
+        self._fidelity: dict[str, list[FidelityReport]] = {}
+        self._model_id: str | None = None  # active model
+        self._budget_bytes = int(budget_gb * 1024**3)  # <= 0: no byte limit
+        self._max_models = max(1, max_models)
+        self._lock = threading.RLock()
+        self._load_lock = threading.Lock()
+        self._eviction_listeners: list[Callable[[str], None]] = []
+        self._snapshots = snapshots  # None: always load through from_pretrained
+        self._run_job = run_job or (lambda fn, *args: fn(*args))
 
     @staticmethod
     def _resolve_device(device: str) -> str:
@@ -53,28 +102,184 @@ class ModelManager:
             except Exception:
                 pass
 
-    def load_model(self, model_id: str, device: str = "auto") -> ModelInfo:
-        """Load a model via TransformerLens HookedTransformer."""
-        if self._model is not None:
-            self.unload_model()
+    def add_eviction_listener(self, listener: Callable[[str], None]) -> None:
+        """Call ``listener(model_id)`` whenever a model leaves the pool."""
+        self._eviction_listeners.append(listener)
+
+    @contextmanager
+    def bind(self, model_id: str | None) -> Iterator[ModelManager]:
+        """Resolve ``get_model()`` / ``model_id`` to ``model_id`` inside the block."""
+        if model_id is None:
+            yield self
+            return
+        token = _bound_model_id.set(model_id)
+        try:
+            yield self
+        finally:
+            _bound_model_id.reset(token)
+
+    def _target_id(self) -> str | None:
+        return _bound_model_id.get() or self._model_id
+
+    def _used_bytes(self) -> int:
+        return sum(self._sizes.values())
+
+    def _make_room(self, incoming: str, incoming_bytes: int = 0, keep: str | None = None) -> None:
+        """Evict LRU models until ``incoming`` and ``incoming_bytes`` more fit.
+
+        Neither ``incoming`` nor ``keep`` is evicted, so the pool may stay
+        over its limits (one model always fits).
+        """
+        with self._lock:
+            incoming_slots = 0 if incoming in self._models else 1
+            while True:
+                over_count = len(self._models) + incoming_slots > self._max_models
+                over_bytes = (
+                    self._budget_bytes > 0
+                    and self._used_bytes() + incoming_bytes > self._budget_bytes
+                )
+                victims = [mid for mid in self._models if mid not in (incoming, keep)]
+                if not (over_count or over_bytes) or not victims:
+                    return
+                logger.info("Evicting least-recently-used model %s", victims[0])
+                self._evict(victims[0])
+
+    def _evict(self, model_id: str) -> None:
+        """Drop ``model_id`` from the pool; the caller settles which model is active."""
+        with self._lock:
+            model = self._models.pop(model_id, None)
+            self._sizes.pop(model_id, None)
+            self._fidelity.pop(model_id, None)
+        if model is None:
+            return
+        del model
+        for listener in self._eviction_listeners:
+            listener(model_id)
+        self._free_device_cache()
+        logger.info("Model %s unloaded.", model_id)
+
+    def load_model(
+        self,
+        model_id: str,
+        device: str = "auto",
+        cancelled: Callable[[], bool] | None = None,
+        precision: str = "auto",
+    ) -> ModelInfo:
+        """Make ``model_id`` resident (loading it via TransformerLens if needed) and active.
+
+        ``precision`` is "auto" (float16 for large models on GPU, bfloat16 on
+        CPU), "fp32", or "bf16" (read directly in bfloat16). A resident model
+        in a different explicit precision is reloaded, except that a resident
+        float32 model asked for in bf16 is replaced by a bf16 copy of it (a
+        new model object, so its fingerprint and cached stats start fresh),
+        with a fidelity report.
+
+        Models are evicted to make room only once the new one has loaded
+        (inactive ones may go early, against the registry size estimate), so
+        a load that fails or is cancelled leaves the active model resident
+        and active. If ``cancelled()`` turns true while loading, the loaded
+        model is discarded instead of entering the pool and
+        ``LoadCancelledError`` is raised.
+        """
+        with self._lock:
+            if model_id in self._models and precision in ("auto", self._precision(model_id)):
+                self._models.move_to_end(model_id)
+                self._model_id = model_id
+                logger.info("Model %s already resident; activated.", model_id)
+                return self.get_model_info(model_id)
+
+        with self._load_lock:
+            resident = None
+            if model_id in self._models:
+                if precision in ("auto", self._precision(model_id)):
+                    # Loaded by a concurrent request while we waited
+                    return self.load_model(model_id, device, cancelled, precision)
+                if precision == "bf16" and self._precision(model_id) == "fp32":
+                    resident = self._models[model_id]
+            if cancelled is not None and cancelled():
+                raise LoadCancelledError(model_id)
+            if resident is not None:
+                # The float32 weights are already here: copy them to bf16 (no
+                # hub read) and measure what the cast costs against them. The
+                # resident model keeps serving until the swap below.
+                model, report = self._run_job(cast_to_bf16, resident)
+                fidelity = [report]
+                del resident
+            else:
+                model, fidelity = self._load(model_id, device, precision, cancelled), []
+        if cancelled is not None and cancelled():
+            del model
+            self._free_device_cache()
+            raise LoadCancelledError(model_id)
+        # Memoized per model: computed here, in the loading thread, rather than
+        # on the first scan-cache lookup on the event loop
+        weight_fingerprint(model)
+        with self._lock:
+            # Swap out the copy in the previous precision, if any
+            self._evict(model_id)
+            self._models[model_id] = model
+            self._sizes[model_id] = _model_bytes(model)
+            self._fidelity[model_id] = fidelity
+            self._model_id = model_id
+            # Re-check with the measured size (estimates are registry-based)
+            self._make_room(model_id)
+            logger.info(
+                "Model pool: %s (%.2f / %.2f GB)",
+                list(self._models),
+                self._used_bytes() / 1024**3,
+                self._budget_bytes / 1024**3,
+            )
+        return self.get_model_info(model_id)
 
+    def _precision(self, model_id: str) -> str:
+        dtype = self._models[model_id].cfg.dtype
+        return {torch.bfloat16: "bf16", torch.float16: "fp16"}.get(dtype, "fp32")
+
+    @staticmethod
+    def _load_dtype(model_id: str, resolved_device: str, precision: str) -> torch.dtype:
+        """Dtype ``_load`` reads ``model_id`` in (and its snapshot is keyed by).
+
+        Large models get half precision under "auto" to save memory
+        (bfloat16 on CPU, where float16 matmuls are slow).
+        """
+        from neural_mri.core.model_registry import get_model_info as get_registry_info
+
+        if precision == "bf16":
+            return torch.bfloat16
+
+        registry_meta = get_registry_info(model_id)
+        if (
+            precision == "auto"
+            and registry_meta
+            and _parse_param_str(registry_meta["params"]) >= _LARGE_MODEL_THRESHOLD
+        ):
+            return torch.bfloat16 if resolved_device == "cpu" else torch.float16
+        return torch.float32
+
+    def _load(
+        self,
+        model_id: str,
+        device: str,
+        precision: str = "auto",
+        cancelled: Callable[[], bool] | None = None,
+    ) -> HookedTransformer:
+        """Load a model via TransformerLens HookedTransformer, evicting to make room."""
         resolved_device = self._resolve_device(device)
         logger.info("Loading model %s on %s...", model_id, resolved_device)
 
-        # Determine dtype: use float16 for large models to save memory
+        from transformer_lens import HookedTransformer
+
         from neural_mri.core.model_registry import get_model_info as get_registry_info
 
         registry_meta = get_registry_info(model_id)
-        use_fp16 = False
-        if registry_meta:
-            param_count = _parse_param_str(registry_meta["params"])
-            if param_count >= _LARGE_MODEL_THRESHOLD:
-                use_fp16 = True
-                logger.info("Large model (%s) — using float16", registry_meta["params"])
-
+        param_count = _parse_param_str(registry_meta["params"]) if registry_meta else 0
+        dtype = self._load_dtype(model_id, resolved_device, precision)
+        use_fp16 = dtype != torch.float32
+        if use_fp16 and precision == "auto":
+            logger.info("Large model (%s) — using half precision", registry_meta["params"])
         load_kwargs: dict = {"device": resolved_device}
         if use_fp16:
-            load_kwargs["dtype"] = torch.float16
+            load_kwargs["dtype"] = dtype
 
         if not registry_meta:
             logger.info(
@@ -82,8 +287,19 @@ class ModelManager:
                 model_id,
             )
 
+        # Registry-based estimate; unknown models are re-checked once measured.
+        # Only inactive models go here: the active one serves until the swap.
+        self._make_room(model_id, param_count * (2 if use_fp16 else 4), keep=self._model_id)
+
+        if self._snapshots is not None:
+            model = self._snapshots.load(model_id, dtype, resolved_device)
+            if model is not None:
+                return model
+        if cancelled is not None and cancelled():
+            raise LoadCancelledError(model_id)
+
         try:
-            self._model = HookedTransformer.from_pretrained(model_id, **load_kwargs)
+            model = HookedTransformer.from_pretrained(model_id, **load_kwargs)
         except ValueError as exc:
             # TransformerLens raises ValueError for unsupported architectures
             raise RuntimeError(
@@ -108,30 +324,54 @@ class ModelManager:
                 )
                 self._free_device_cache()
                 load_kwargs["device"] = "cpu"
-                self._model = HookedTransformer.from_pretrained(model_id, **load_kwargs)
+                model = HookedTransformer.from_pretrained(model_id, **load_kwargs)
             else:
                 raise
 
-        self._model_id = model_id
+        if self._snapshots is not None:
+            self._snapshots.save(model_id, model)
         logger.info("Model %s loaded successfully.", model_id)
-        return self.get_model_info()
-
-    def unload_model(self) -> None:
-        """Unload the current model and free memory."""
-        if self._model is not None:
-            model_id = self._model_id
-            del self._model
-            self._model = None
+        return model
+
+    def fingerprint(self, model_id: str) -> str | None:
+        """Weight fingerprint of resident ``model_id`` (None if it is not resident)."""
+        model = self._models.get(model_id)
+        return weight_fingerprint(model) if model is not None else None
+
+    def has_snapshot(self, model_id: str, device: str = "auto", precision: str = "auto") -> bool:
+        """Whether a load of ``model_id`` in ``precision`` is restored without a hub download."""
+        if self._snapshots is None:
+            return False
+        dtype = self._load_dtype(model_id, self._resolve_device(device), precision)
+        return self._snapshots.has(model_id, dtype)
+
+    def unload_model(self, model_id: str | None = None) -> None:
+        """Unload ``model_id`` (default: the active model) and free memory."""
+        target = model_id or self._model_id
+        if target is None:
+            return
+        with self._lock:
+            resident = target in self._models
+            if self._model_id == target:
+                # Explicitly unloaded: the most recently used remaining model takes over
+                self._model_id = next((m for m in reversed(self._models) if m != target), None)
+        if resident:
+            self._evict(target)
+
+    def unload_all(self) -> None:
+        with self._lock:
             self._model_id = None
-            self._free_device_cache()
-            logger.info("Model %s unloaded.", model_id)
+        for model_id in list(self._models):
+            self._evict(model_id)
 
-    def get_model_info(self) -> ModelInfo:
-        """Extract model architecture info from the loaded model config."""
-        if self._model is None:
+    def get_model_info(self, model_id: str | None = None) -> ModelInfo:
+        """Extract model architecture info from a resident model's config."""
+        model_id = model_id or self._target_id()
+        model = self._models.get(model_id) if model_id else None
+        if model is None:
             raise RuntimeError("No model loaded")
 
-        cfg = self._model.cfg
+        cfg = model.cfg
         layers = []
         for i in range(cfg.n_layers):
             layers.append(
@@ -147,9 +387,9 @@ class ModelManager:
             )
 
         return ModelInfo(
-            model_id=self._model_id,
+            model_id=model_id,
             model_name=cfg.model_name,
-            n_params=sum(p.numel() for p in self._model.parameters()),
+            n_params=sum(p.numel() for p in model.parameters()),
             n_layers=cfg.n_layers,
             d_model=cfg.d_model,
             d_vocab=cfg.d_vocab,
@@ -160,18 +400,69 @@ class ModelManager:
             device=str(cfg.device),
             layers=layers,
             dtype=str(cfg.dtype),
+            fidelity=list(self._fidelity.get(model_id, [])),
         )
 
     def get_model(self) -> HookedTransformer:
-        """Return the currently loaded model instance."""
-        if self._model is None:
-            raise RuntimeError("No model loaded")
-        return self._model
+        """Return the bound (or active) model instance and mark it recently used."""
+        model_id = self._target_id()
+        with self._lock:
+            model = self._models.get(model_id) if model_id else None
+            if model is None:
+                raise RuntimeError(
+                    f"Model {model_id} is not loaded" if model_id else "No model loaded"
+                )
+            self._models.move_to_end(model_id)
+            return model
+
+    def autocast_fidelity(self) -> FidelityReport:
+        """bf16-autocast fidelity of the bound (or active) model, measured once."""
+        model_id = self._target_id()
+        model = self.get_model()
+        with self._lock:
+            for report in self._fidelity.get(model_id, []):
+                if report.mode == "bf16-autocast":
+                    return report
+        report = autocast_fidelity(model)  # probe runs outside the lock
+        with self._lock:
+            reports = self._fidelity.get(model_id)
+            if reports is None or self._models.get(model_id) is not model:
+                return report  # evicted or reloaded meanwhile: nothing to record on
+            for existing in reports:
+                if existing.mode == "bf16-autocast":
+                    return existing  # measured concurrently
+            reports.append(report)
+        logger.info(
+            "bf16 autocast fidelity for %s: top-1 agreement %.3f, rel delta %.4f",
+            model_id,
+            report.top1_agreement,
+            report.rel_activation_delta,
+        )
+        return report
+
+    def pool_status(self) -> dict:
+        with self._lock:
+            return {
+                "active": self._model_id,
+                "budget_bytes": self._budget_bytes,
+                "used_bytes": self._used_bytes(),
+                "max_models": self._max_models,
+                "models": [
+                    {"model_id": mid, "bytes": self._sizes.get(mid, 0)}
+                    for mid in reversed(self._models)
+                ],
+            }
+
+    @property
+    def resident_models(self) -> list[str]:
+        """Resident model ids, most recently used first."""
+        return list(reversed(self._models))
 
     @property
     def is_loaded(self) -> bool:
-        return self._model is not None
+        model_id = self._target_id()
+        return model_id is not None and model_id in self._models
 
     @property
     def model_id(self) -> str | None:
-        return self._model_id
+        return self._target_id()
@@ -0,0 +1,226 @@
+"""Local snapshots of processed TransformerLens models for fast cold starts.
+
+``HookedTransformer.from_pretrained`` re-reads the HF checkpoint and redoes
+the TransformerLens conversion (LN folding, weight centering, QKV
+splitting) on every load. After the first load the processed state dict is
+written here as a single safetensors file, with the config in its metadata.
+Later loads build the module skeleton on the meta device (no allocation, no
+random init) and assign the snapshot tensors directly: on CPU they are views
+of the memory-mapped file (no copy), elsewhere safetensors reads them
+straight onto the device. Snapshots are written on a background thread so
+that a fresh load is ready without waiting for the write.
+
+torch, safetensors and transformer_lens are imported on first use so that
+importing this module and creating the store do not slow down server
+startup.
+"""
+
+from __future__ import annotations
+
+import dataclasses
+import importlib.metadata
+import json
+import logging
+import mmap
+import os
+import re
+import struct
+import time
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import TYPE_CHECKING
+
+if TYPE_CHECKING:
+    import torch
+    from transformer_lens import HookedTransformer, HookedTransformerConfig
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+
+def _tl_version() -> str:
+    try:
+        return importlib.metadata.version("transformer_lens")
+    except importlib.metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _dtype_name(dtype: torch.dtype) -> str:
+    return str(dtype).removeprefix("torch.")
+
+
+# safetensors header dtype -> torch dtype name
+_ST_DTYPES = {
+    "F64": "float64",
+    "F32": "float32",
+    "F16": "float16",
+    "BF16": "bfloat16",
+    "I64": "int64",
+    "I32": "int32",
+    "I16": "int16",
+    "I8": "int8",
+    "U8": "uint8",
+    "BOOL": "bool",
+}
+
+
+def _mmap_tensors(path: Path) -> tuple[dict[str, str], dict[str, torch.Tensor]]:
+    """(metadata, tensors) of a safetensors file; tensors are views of a private mmap.
+
+    The mapping is copy-on-write, so the tensors are writable without touching
+    the file, and pages are only read from disk when first used.
+    """
+    import torch
+
+    with open(path, "rb") as fh:
+        buf = mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_COPY)
+    (header_len,) = struct.unpack("<Q", buf[:8])
+    header = json.loads(buf[8 : 8 + header_len])
+    metadata = header.pop("__metadata__", None) or {}
+    base = 8 + header_len
+    tensors = {}
+    for name, spec in header.items():
+        begin, end = spec["data_offsets"]
+        dtype = getattr(torch, _ST_DTYPES[spec["dtype"]])
+        count = (end - begin) // dtype.itemsize
+        flat = (
+            torch.frombuffer(buf, dtype=dtype, count=count, offset=base + begin)
+            if count
+            else torch.empty(0, dtype=dtype)
+        )
+        tensors[name] = flat.reshape(spec["shape"])
+    return metadata, tensors
+
+
+def _config_to_json(cfg: HookedTransformerConfig) -> str:
+    import torch
+
+    values = {}
+    for field in dataclasses.fields(cfg):
+        if not field.init:
+            continue
+        value = getattr(cfg, field.name)
+        if isinstance(value, torch.dtype):
+            value = {"__dtype__": _dtype_name(value)}
+        values[field.name] = value
+    # Raises TypeError for anything else that is not JSON-serializable
+    return json.dumps(values)
+
+
+def _config_from_json(text: str, device: str) -> HookedTransformerConfig:
+    import torch
+    from transformer_lens import HookedTransformerConfig
+
+    values = json.loads(text)
+    for key, value in values.items():
+        if isinstance(value, dict) and "__dtype__" in value:
+            values[key] = getattr(torch, value["__dtype__"])
+    values["device"] = device
+    return HookedTransformerConfig(**values)
+
+
+class ModelSnapshotStore:
+    """Processed-model snapshots on disk, keyed by model id and dtype."""
+
+    def __init__(self, cache_dir: str | Path) -> None:
+        self._dir = Path(cache_dir).expanduser()
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="model-snapshot")
+
+    @staticmethod
+    def _safe_id(model_id: str) -> str:
+        return re.sub(r"[^A-Za-z0-9._-]", "_", model_id)
+
+    def _path(self, model_id: str, dtype: torch.dtype) -> Path:
+        return self._dir / f"{self._safe_id(model_id)}-{_dtype_name(dtype)}.safetensors"
+
+    def has(self, model_id: str, dtype: torch.dtype) -> bool:
+        """Whether a snapshot of ``model_id`` in ``dtype`` exists."""
+        return self._path(model_id, dtype).is_file()
+
+    def load(self, model_id: str, dtype: torch.dtype, device: str) -> HookedTransformer | None:
+        """Build ``model_id`` from its snapshot, or None if there is no usable one."""
+        path = self._path(model_id, dtype)
+        if not path.is_file():
+            return None
+        import torch
+        from safetensors import safe_open
+        from transformer_lens import HookedTransformer
+
+        start = time.time()
+        try:
+            if torch.device(device).type == "cpu":
+                meta, state = _mmap_tensors(path)
+            else:
+                with safe_open(str(path), framework="pt", device=device) as f:
+                    meta = f.metadata() or {}
+                    state = {name: f.get_tensor(name) for name in f.keys()}
+            if (
+                meta.get("format_version") != str(FORMAT_VERSION)
+                or meta.get("transformer_lens") != _tl_version()
+            ):
+                logger.info("Snapshot %s is stale; reloading from the hub", path)
+                return None
+            cfg = _config_from_json(meta["config"], device)
+
+            with torch.device("meta"):
+                model = HookedTransformer(cfg, move_to_device=False)
+            model.load_state_dict(state, strict=True, assign=True)
+            # Non-persistent buffers are not in the state dict and would stay on meta
+            if any(t.is_meta for t in (*model.parameters(), *model.buffers())):
+                raise RuntimeError("snapshot does not cover every tensor")
+        except Exception as exc:
+            logger.warning("Ignoring unusable model snapshot %s: %s", path, exc)
+            return None
+
+        logger.info(
+            "Model %s restored from snapshot in %.1fms", model_id, (time.time() - start) * 1000
+        )
+        return model
+
+    def save(self, model_id: str, model: HookedTransformer) -> None:
+        """Queue a write of ``model``'s processed weights and config.
+
+        The tensors are captured now and written on the background thread;
+        failures are only logged.
+        """
+        path = self._path(model_id, model.cfg.dtype)
+        if path.is_file():
+            return
+        try:
+            metadata = {
+                "format_version": str(FORMAT_VERSION),
+                "transformer_lens": _tl_version(),
+                "model_id": model_id,
+                "config": _config_to_json(model.cfg),
+            }
+        except TypeError as exc:
+            logger.warning("Could not snapshot %s: %s", model_id, exc)
+            return
+        state = {name: t.detach().contiguous() for name, t in model.state_dict().items()}
+        self._writer.submit(self._write, model_id, path, state, metadata)
+
+    def flush(self) -> None:
+        """Wait for queued snapshot writes (tests, shutdown)."""
+        self._writer.submit(lambda: None).result()
+
+    def _write(self, model_id: str, path: Path, state: dict, metadata: dict) -> None:
+        if path.is_file():
+            return
+        from safetensors.torch import save_file
+
+        start = time.time()
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            save_file(state, str(tmp), metadata=metadata)
+            os.replace(tmp, path)
+        except (OSError, TypeError, ValueError, RuntimeError) as exc:
+            logger.warning("Could not write model snapshot %s: %s", path, exc)
+            return
+        logger.info(
+            "Model snapshot for %s written to %s in %.1fms",
+            model_id,
+            path,
+            (time.time() - start) * 1000,
+        )
@@ -5,7 +5,16 @@ import time
 
 import torch
 
+from neural_mri.core.attribution import (
+    METHODS,
+    AttributionPatcher,
+    aligned_delta,
+    attribution_scores,
+)
+from neural_mri.core.hook_plan import HookPlan, component_hook_points, plan_for_mode
+from neural_mri.core.layer_resume import LayerResumer, resume_plan
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.tokenization import tokenization
 from neural_mri.schemas.causal_trace import (
     CausalTraceCell,
     CausalTraceRequest,
@@ -28,7 +37,9 @@ class PerturbationEngine:
     """Applies perturbations to model components and compares results.
 
     All perturbations are stateless — each request sets up fresh hooks
-    via run_with_hooks() and never modifies model weights.
+    via run_with_hooks() and never modifies model weights. The unperturbed
+    run caches the residual stream entering the perturbed block, and the
+    perturbed run resumes from there instead of recomputing earlier layers.
     """
 
     def __init__(self, model_manager: ModelManager) -> None:
@@ -112,20 +123,21 @@ class PerturbationEngine:
         """Zero-out a component's output and compare predictions."""
         start = time.time()
         model = self._mm.get_model()
-        tokens = model.to_tokens(req.prompt)
+        tokens = tokenization(model).tokens(req.prompt)
         target_idx = tokens.shape[1] - 1
         hook_name = self._resolve_hook(req.component)
 
         with torch.no_grad():
-            original_logits = model(tokens)
+            original_logits, cache = model.run_with_cache(
+                tokens, names_filter=resume_plan([hook_name])
+            )
 
         def zero_hook(value, hook):
             return torch.zeros_like(value)
 
         with torch.no_grad():
-            perturbed_logits = model.run_with_hooks(
-                tokens,
-                fwd_hooks=[(hook_name, zero_hook)],
+            perturbed_logits = LayerResumer(model, tokens, cache).run_with_hooks(
+                [(hook_name, zero_hook)]
             )
 
         elapsed_ms = (time.time() - start) * 1000
@@ -143,21 +155,22 @@ class PerturbationEngine:
         """Amplify a component's output by a factor and compare predictions."""
         start = time.time()
         model = self._mm.get_model()
-        tokens = model.to_tokens(req.prompt)
+        tokens = tokenization(model).tokens(req.prompt)
         target_idx = tokens.shape[1] - 1
         hook_name = self._resolve_hook(req.component)
         factor = req.factor
 
         with torch.no_grad():
-            original_logits = model(tokens)
+            original_logits, cache = model.run_with_cache(
+                tokens, names_filter=resume_plan([hook_name])
+            )
 
         def amplify_hook(value, hook):
             return value * factor
 
         with torch.no_grad():
-            perturbed_logits = model.run_with_hooks(
-                tokens,
-                fwd_hooks=[(hook_name, amplify_hook)],
+            perturbed_logits = LayerResumer(model, tokens, cache).run_with_hooks(
+                [(hook_name, amplify_hook)]
             )
 
         elapsed_ms = (time.time() - start) * 1000
@@ -175,12 +188,14 @@ class PerturbationEngine:
         """Mean ablation: replace a component's output with its mean activation."""
         start = time.time()
         model = self._mm.get_model()
-        tokens = model.to_tokens(req.prompt)
+        tokens = tokenization(model).tokens(req.prompt)
         target_idx = tokens.shape[1] - 1
         hook_name = self._resolve_hook(req.component)
 
         with torch.no_grad():
-            original_logits, cache = model.run_with_cache(tokens)
+            original_logits, cache = model.run_with_cache(
+                tokens, names_filter=HookPlan.of(hook_name) | resume_plan([hook_name])
+            )
 
         # Compute mean activation across token positions
         mean_activation = cache[hook_name].mean(dim=1, keepdim=True)  # [1, 1, ...]
@@ -189,9 +204,8 @@ class PerturbationEngine:
             return mean_activation.expand_as(value)
 
         with torch.no_grad():
-            perturbed_logits = model.run_with_hooks(
-                tokens,
-                fwd_hooks=[(hook_name, ablate_hook)],
+            perturbed_logits = LayerResumer(model, tokens, cache).run_with_hooks(
+                [(hook_name, ablate_hook)]
             )
 
         elapsed_ms = (time.time() - start) * 1000
@@ -211,19 +225,23 @@ class PerturbationEngine:
         model = self._mm.get_model()
         hook_name = self._resolve_hook(req.component)
 
-        clean_tokens = model.to_tokens(req.clean_prompt)
-        corrupt_tokens = model.to_tokens(req.corrupt_prompt)
+        clean_tokens = tokenization(model).tokens(req.clean_prompt)
+        corrupt_tokens = tokenization(model).tokens(req.corrupt_prompt)
         target_idx = (
             req.target_token_idx if req.target_token_idx >= 0 else clean_tokens.shape[1] - 1
         )
 
         with torch.no_grad():
-            # Clean run
-            clean_logits, clean_cache = model.run_with_cache(clean_tokens)
+            # Clean run (only the patched component is needed)
+            clean_logits, clean_cache = model.run_with_cache(
+                clean_tokens, names_filter=HookPlan.of(hook_name)
+            )
             clean_activation = clean_cache[hook_name].clone()
 
-            # Corrupt baseline
-            corrupt_logits = model(corrupt_tokens)
+            # Corrupt baseline (keeps the checkpoint the patched run resumes from)
+            corrupt_logits, corrupt_cache = model.run_with_cache(
+                corrupt_tokens, names_filter=resume_plan([hook_name])
+            )
 
         # Patch: inject clean activation into corrupt run
         def patch_hook(value, hook):
@@ -237,9 +255,8 @@ class PerturbationEngine:
             return patched
 
         with torch.no_grad():
-            patched_logits = model.run_with_hooks(
-                corrupt_tokens,
-                fwd_hooks=[(hook_name, patch_hook)],
+            patched_logits = LayerResumer(model, corrupt_tokens, corrupt_cache).run_with_hooks(
+                [(hook_name, patch_hook)]
             )
 
         # Get predictions
@@ -284,28 +301,38 @@ class PerturbationEngine:
         Runs clean and corrupt forward passes once, then iterates over all
         components (embed + blocks.N.attn + blocks.N.mlp) patching clean
         activations into the corrupt run to compute recovery scores.
+        With ``method="attribution"`` the sweep is replaced by a single
+        gradient-based estimate (see ``_causal_trace_attribution``).
         """
+        if req.method not in METHODS:
+            raise ValueError(f"Unknown causal trace method: {req.method}")
+        if req.method == "attribution":
+            return self._causal_trace_attribution(req)
+
         start = time.time()
         model = self._mm.get_model()
         n_layers = model.cfg.n_layers
 
-        clean_tokens = model.to_tokens(req.clean_prompt)
-        corrupt_tokens = model.to_tokens(req.corrupt_prompt)
+        clean_tokens = tokenization(model).tokens(req.clean_prompt)
+        corrupt_tokens = tokenization(model).tokens(req.corrupt_prompt)
         target_idx = (
             req.target_token_idx if req.target_token_idx >= 0 else clean_tokens.shape[1] - 1
         )
 
         # Build component list
-        components = ["embed"]
-        for layer_i in range(n_layers):
-            components.append(f"blocks.{layer_i}.attn")
-            components.append(f"blocks.{layer_i}.mlp")
+        points = component_hook_points(n_layers)
+        components = [comp_id for comp_id, _ in points]
 
         with torch.no_grad():
-            # Single clean forward pass with full cache
-            clean_logits, clean_cache = model.run_with_cache(clean_tokens)
-            # Single corrupt baseline
-            corrupt_logits = model(corrupt_tokens)
+            # Single clean forward pass caching every component output
+            clean_logits, clean_cache = model.run_with_cache(
+                clean_tokens, names_filter=plan_for_mode("causal_trace", n_layers)
+            )
+            # Single corrupt baseline caching each block's incoming residual
+            corrupt_logits, corrupt_cache = model.run_with_cache(
+                corrupt_tokens, names_filter=resume_plan([hook_name for _, hook_name in points])
+            )
+        resumer = LayerResumer(model, corrupt_tokens, corrupt_cache)
 
         # Reference values for recovery computation
         clean_top_idx = torch.argmax(torch.softmax(clean_logits[0, target_idx], dim=-1)).item()
@@ -337,9 +364,8 @@ class PerturbationEngine:
                 return hook_fn
 
             with torch.no_grad():
-                patched_logits = model.run_with_hooks(
-                    corrupt_tokens,
-                    fwd_hooks=[(hook_name, make_patch_hook(clean_activation))],
+                patched_logits = resumer.run_with_hooks(
+                    [(hook_name, make_patch_hook(clean_activation))]
                 )
 
             patched_l = patched_logits[0, target_idx, clean_top_idx].item()
@@ -384,3 +410,110 @@ class PerturbationEngine:
             n_layers=n_layers,
             metadata={"compute_time_ms": round(elapsed_ms, 1)},
         )
+
+    def _causal_trace_attribution(self, req: CausalTraceRequest) -> CausalTraceResult:
+        """Attribution-patching causal trace: one clean forward, one corrupt
+        forward + backward.
+
+        The patched logit of the clean top-1 token is estimated as
+        ``corrupt_logit + (clean_act - corrupt_act) · grad`` for every
+        component at once; optionally per attention head (via ``hook_z``) and
+        per token position.
+        """
+        start = time.time()
+        model = self._mm.get_model()
+        n_layers = model.cfg.n_layers
+
+        clean_tokens = tokenization(model).tokens(req.clean_prompt)
+        corrupt_tokens = tokenization(model).tokens(req.corrupt_prompt)
+        target_idx = (
+            req.target_token_idx if req.target_token_idx >= 0 else clean_tokens.shape[1] - 1
+        )
+
+        points = component_hook_points(n_layers)
+        hook_names = [hook_name for _, hook_name in points]
+        z_hooks = [f"blocks.{i}.attn.hook_z" for i in range(n_layers)] if req.head_level else []
+
+        with torch.no_grad():
+            clean_logits, clean_cache = model.run_with_cache(
+                clean_tokens, names_filter=HookPlan.of(*hook_names, *z_hooks)
+            )
+        clean_top_idx = torch.argmax(clean_logits[0, target_idx]).item()
+
+        def metric(logits: torch.Tensor) -> torch.Tensor:
+            return logits[0, target_idx, clean_top_idx].float()
+
+        corrupt_logits, corrupt_acts, grads = AttributionPatcher(model).run(
+            corrupt_tokens, hook_names + z_hooks, metric
+        )
+
+        clean_l = clean_logits[0, target_idx, clean_top_idx].item()
+        corrupt_l = corrupt_logits[0, target_idx, clean_top_idx].item()
+        denom = clean_l - corrupt_l
+
+        def to_recovery(est: float) -> float:
+            recovery = est / denom if abs(denom) > 1e-6 else 0.0
+            return round(max(0.0, min(1.0, recovery)), 4)
+
+        tokenizer = model.tokenizer
+        corrupt_top_idx = torch.argmax(corrupt_logits[0, target_idx]).item()
+
+        cells: list[CausalTraceCell] = []
+        for comp, hook_name in points:
+            if hook_name in corrupt_acts:
+                delta = aligned_delta(clean_cache[hook_name], corrupt_acts[hook_name])
+                per_pos = attribution_scores(delta, grads[hook_name])  # [seq]
+            else:
+                per_pos = torch.zeros(corrupt_tokens.shape[1])
+
+            if comp == "embed":
+                comp_type, layer_idx = "embed", -1
+            else:
+                comp_type = "attn" if comp.endswith(".attn") else "mlp"
+                layer_idx = int(comp.split(".")[1])
+
+            cells.append(
+                CausalTraceCell(
+                    component=comp,
+                    layer_idx=layer_idx,
+                    component_type=comp_type,
+                    recovery_score=to_recovery(per_pos.sum().item()),
+                    position_scores=(
+                        [to_recovery(v) for v in per_pos.tolist()] if req.position_level else None
+                    ),
+                )
+            )
+
+        head_scores: list[list[float]] | None = None
+        if req.head_level:
+            head_scores = []
+            for z_hook in z_hooks:
+                delta = aligned_delta(clean_cache[z_hook], corrupt_acts[z_hook])
+                per_head = attribution_scores(delta, grads[z_hook], per_head=True).sum(dim=0)
+                head_scores.append([to_recovery(v) for v in per_head.tolist()])
+
+        elapsed_ms = (time.time() - start) * 1000
+        logger.info(
+            "Causal trace (attribution): %d components, %.1fms",
+            len(cells),
+            elapsed_ms,
+        )
+
+        return CausalTraceResult(
+            model_id=self._mm.model_id,
+            clean_prompt=req.clean_prompt,
+            corrupt_prompt=req.corrupt_prompt,
+            target_token_idx=target_idx,
+            clean_prediction=tokenizer.decode([clean_top_idx]),
+            corrupt_prediction=tokenizer.decode([corrupt_top_idx]),
+            cells=cells,
+            n_layers=n_layers,
+            method="attribution",
+            tokens=(
+                [str(t) for t in tokenization(model).encode(req.corrupt_prompt).str_tokens]
+                if req.position_level
+                else None
+            ),
+            head_scores=head_scores,
+            metadata={"compute_time_ms": round(elapsed_ms, 1)},
+        )
@@ -0,0 +1,128 @@
+"""Reduced-precision execution (bf16) and its fidelity against float32.
+
+fp16 matmuls are slow on CPU, while bf16 has native kernels on recent x86
+and ARM cores. A model can run in bf16 in two ways:
+
+- at load time (``precision="bf16"``): the weights are read in bf16, or
+  a resident float32 model is replaced by a bf16 copy of it.
+- per request (``precision="bf16"`` on a scan): the float32 model runs
+  under ``torch.autocast``, so matmuls execute in bf16.
+
+Whenever float32 weights are at hand (the bf16 copy, autocast) a
+``FidelityReport`` is recorded: a probe prompt is run in both precisions
+and the residual streams and top-1 predictions are compared.
+"""
+
+from __future__ import annotations
+
+import copy
+import itertools
+from collections.abc import Callable
+from contextlib import nullcontext
+from typing import Any, TypeVar
+
+import torch
+
+from neural_mri.schemas.model import FidelityReport
+
+T = TypeVar("T")
+
+LOAD_PRECISIONS = ("auto", "fp32", "bf16")
+REQUEST_PRECISIONS = ("bf16",)
+
+PROBE_PROMPT = "The capital of France is Paris, and the capital of Germany is"
+
+
+def precision_context(model, precision: str | None):
+    """Autocast context for ``precision`` on the model's device (no-op for None)."""
+    if precision is None or model.cfg.dtype == torch.bfloat16:
+        return nullcontext()
+    device_type = torch.device(model.cfg.device).type
+    return torch.autocast(device_type=device_type, dtype=torch.bfloat16)
+
+
+def call_in_precision(mm, precision: str | None, fn: Callable[..., T], *args) -> T:
+    """Call ``fn(*args)`` on ``mm``'s bound model under ``precision``.
+
+    Autocast state is per thread, so this must run inside the worker thread
+    (i.e. as an ``InferenceScheduler`` job). The first reduced-precision call
+    per float32 model also records its fidelity report; a model already in
+    bf16 runs as is.
+    """
+    if precision is None:
+        return fn(*args)
+    model = mm.get_model()
+    if model.cfg.dtype == torch.bfloat16:
+        return fn(*args)
+    mm.autocast_fidelity()
+    with precision_context(model, precision):
+        return fn(*args)
+
+
+def precision_cache_key(key: str, precision: str | None) -> str:
+    """Scan-cache key; reduced-precision results never serve fp32 requests."""
+    return key if precision is None else f"{key}::{precision}"
+
+
+def _probe(model) -> tuple[torch.Tensor, list[torch.Tensor]]:
+    names = {f"blocks.{i}.hook_resid_post" for i in range(model.cfg.n_layers)}
+    tokens = model.to_tokens(PROBE_PROMPT)
+    with torch.no_grad():
+        logits, cache = model.run_with_cache(tokens, names_filter=lambda n: n in names)
+    return logits.float(), [cache[n].float() for n in sorted(names)]
+
+
+def compare_probes(
+    mode: str,
+    reference: tuple[torch.Tensor, list[torch.Tensor]],
+    reduced: tuple[torch.Tensor, list[torch.Tensor]],
+) -> FidelityReport:
+    ref_logits, ref_acts = reference
+    red_logits, red_acts = reduced
+    max_delta = max((a - b).abs().max().item() for a, b in zip(ref_acts, red_acts))
+    max_ref = max(a.abs().max().item() for a in ref_acts)
+    agreement = (ref_logits.argmax(-1) == red_logits.argmax(-1)).float().mean().item()
+    return FidelityReport(
+        mode=mode,
+        probe_prompt=PROBE_PROMPT,
+        max_abs_activation_delta=round(max_delta, 6),
+        rel_activation_delta=round(max_delta / max_ref, 6) if max_ref else 0.0,
+        top1_agreement=round(agreement, 4),
+    )
+
+
+def bf16_copy(model):
+    """A bf16 copy of a float32 model, which is left untouched.
+
+    Floating-point tensors are converted one at a time straight into the
+    copy, so the peak is the float32 model plus its bf16 copy. The
+    tokenizer is shared.
+    """
+    memo: dict[int, Any] = {}
+    tokenizer = getattr(model, "tokenizer", None)
+    if tokenizer is not None:
+        memo[id(tokenizer)] = tokenizer
+    for tensor in itertools.chain(model.parameters(), model.buffers()):
+        if tensor.is_floating_point() and id(tensor) not in memo:
+            reduced = tensor.detach().to(torch.bfloat16)
+            if isinstance(tensor, torch.nn.Parameter):
+                reduced = torch.nn.Parameter(reduced, requires_grad=tensor.requires_grad)
+            memo[id(tensor)] = reduced
+    reduced_model = copy.deepcopy(model, memo)
+    reduced_model.to(torch.bfloat16)  # tensors are bf16 already; updates cfg.dtype
+    return reduced_model
+
+
+def cast_to_bf16(model) -> tuple[Any, FidelityReport]:
+    """A bf16 copy of a float32 model and the measured fidelity of the cast."""
+    reference = _probe(model)
+    reduced = bf16_copy(model)
+    return reduced, compare_probes("bf16", reference, _probe(reduced))
+
+
+def autocast_fidelity(model) -> FidelityReport:
+    """Fidelity of per-request bf16 autocast for a float32 model."""
+    reference = _probe(model)
+    with precision_context(model, "bf16"):
+        reduced = _probe(model)
+    return compare_probes("bf16-autocast", reference, reduced)
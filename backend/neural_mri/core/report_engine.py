@@ -15,11 +15,10 @@ from neural_mri.schemas.report import (
 )
 from neural_mri.schemas.scan import (
     ActivationData,
-    ActivationScanRequest,
     AnomalyData,
-    AnomalyScanRequest,
     CircuitData,
-    CircuitScanRequest,
+    FusedScanData,
+    FusedScanRequest,
     SAEData,
     StructuralData,
     WeightData,
@@ -44,12 +43,24 @@ class ReportEngine:
         modes = req.include_modes or ALL_MODES
         loc = req.locale or "en"
 
-        # Gather scan data — reuse cached or run fresh
+        # Gather scan data — reuse cached or run fresh. Prompt-based modes
+        # without cached data share a single fused forward pass.
+        live_modes = [
+            mode
+            for mode, cached in (
+                ("fMRI", req.cached_fmri),
+                ("DTI", req.cached_dti),
+                ("FLAIR", req.cached_flair),
+            )
+            if mode in modes and not cached
+        ]
+        fused = self._run_fused(prompt, live_modes)
+
         t1 = self._get_t1(req.cached_t1) if "T1" in modes else None
         t2 = self._get_t2(req.cached_t2) if "T2" in modes else None
-        fmri = self._get_fmri(req.cached_fmri, prompt) if "fMRI" in modes else None
-        dti = self._get_dti(req.cached_dti, prompt) if "DTI" in modes else None
-        flair = self._get_flair(req.cached_flair, prompt) if "FLAIR" in modes else None
+        fmri = self._get_fmri(req.cached_fmri, fused) if "fMRI" in modes else None
+        dti = self._get_dti(req.cached_dti, fused) if "DTI" in modes else None
+        flair = self._get_flair(req.cached_flair, fused) if "FLAIR" in modes else None
 
         technique = [m for m in modes if m in ALL_MODES]
 
@@ -112,20 +123,28 @@ class ReportEngine:
             return WeightData(**cached)
         return self._engine.scan_weights()
 
-    def _get_fmri(self, cached: dict | None, prompt: str) -> ActivationData:
+    def _run_fused(self, prompt: str, modes: list[str]) -> FusedScanData | None:
+        if not modes:
+            return None
+        return self._engine.scan_fused(FusedScanRequest(prompt=prompt, modes=modes))
+
+    @staticmethod
+    def _get_fmri(cached: dict | None, fused: FusedScanData | None) -> ActivationData | None:
         if cached:
             return ActivationData(**cached)
-        return self._engine.scan_activation(ActivationScanRequest(prompt=prompt))
+        return fused.activation if fused else None
 
-    def _get_dti(self, cached: dict | None, prompt: str) -> CircuitData:
+    @staticmethod
+    def _get_dti(cached: dict | None, fused: FusedScanData | None) -> CircuitData | None:
         if cached:
             return CircuitData(**cached)
-        return self._engine.scan_circuits(CircuitScanRequest(prompt=prompt))
+        return fused.circuits if fused else None
 
-    def _get_flair(self, cached: dict | None, prompt: str) -> AnomalyData:
+    @staticmethod
+    def _get_flair(cached: dict | None, fused: FusedScanData | None) -> AnomalyData | None:
         if cached:
             return AnomalyData(**cached)
-        return self._engine.scan_anomaly(AnomalyScanRequest(prompt=prompt))
+        return fused.anomaly if fused else None
 
     # ------------------------------------------------------------------ #
     # T1 Analysis
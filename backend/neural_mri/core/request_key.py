@@ -0,0 +1,112 @@
+"""Canonical scan-request keys and derivation of narrower results.
+
+Every parameter that changes a scan's result must be part of its cache
+key, and nothing else may be: ``request_key`` hashes a request's
+parameters (minus ``model_id``, which the cache keys separately) as sorted
+JSON, so field order, explicit defaults and ``None`` options all map to
+the same key.
+
+Some parameters only select part of a result. A request for the T2 stats
+of a few layers, or an fMRI scan restricted to some layers, can be
+answered from the cached all-layer result of the otherwise identical
+request. ``DERIVATIONS`` lists, per cache mode, how to broaden such a
+request and how to narrow the broad result back down; the scan routes
+compute and cache only the broad result.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from collections.abc import Callable
+from dataclasses import dataclass
+
+import orjson
+from pydantic import BaseModel
+
+# Parameters that choose the model, not the result (keyed separately)
+_UNKEYED = frozenset({"model_id"})
+
+
+def canonical_params(params: dict) -> dict:
+    """Drop unset options and normalize layer selections."""
+    out = {}
+    for name, value in params.items():
+        if name == "layers" and value is not None:
+            value = sorted(set(value)) or None  # [] selects every layer, as None does
+        elif name == "target_token_idx" and value < 0:
+            value = -1  # every negative index traces the last token
+        if value is None or name in _UNKEYED:
+            continue
+        out[name] = value
+    return out
+
+
+def request_key(req: BaseModel, **extra) -> str:
+    """Stable hash of every result-affecting parameter of ``req``.
+
+    ``extra`` adds parameters that are not fields of ``req`` (e.g. the
+    precision a fused scan runs its DTI pass in).
+    """
+    params = canonical_params({**req.model_dump(), **extra})
+    return hashlib.sha256(orjson.dumps(params, option=orjson.OPT_SORT_KEYS)).hexdigest()
+
+
+def weight_layer_selected(name: str, layer_ids: list[str] | None) -> bool:
+    """T2 filter: ``name`` ("blocks.0.attn.W_Q") contains a requested id."""
+    return not layer_ids or any(lid in name for lid in layer_ids)
+
+
+def activation_layer_selected(layer_id: str, layer_ids: list[str] | None) -> bool:
+    """fMRI filter: ``layer_id`` is a requested id or lies under one ("blocks.0")."""
+    return not layer_ids or any(
+        layer_id == lid or layer_id.startswith(f"{lid}.") for lid in layer_ids
+    )
+
+
+def _narrow_weights(req, result: dict) -> dict:
+    layers = [
+        entry
+        for entry in result["layers"]
+        if weight_layer_selected(f"{entry['layer_id']}.{entry['component']}", req.layers)
+    ]
+    metadata = {**result.get("metadata", {}), "num_tensors_scanned": len(layers)}
+    return {**result, "layers": layers, "metadata": metadata}
+
+
+def _narrow_activation(req, result: dict) -> dict:
+    layers = [
+        entry
+        for entry in result["layers"]
+        if activation_layer_selected(entry["layer_id"], req.layers)
+    ]
+    return {**result, "layers": layers}
+
+
+def _all_layers(req):
+    return req.model_copy(update={"layers": None})
+
+
+@dataclass(frozen=True)
+class Derivation:
+    """How to answer a request from the cached result of a broader one."""
+
+    broaden: Callable  # request -> the broadest request with the same cacheable result
+    narrow: Callable  # (request, broad result dict) -> result dict for request
+
+
+DERIVATIONS: dict[str, Derivation] = {
+    "weights": Derivation(broaden=_all_layers, narrow=_narrow_weights),
+    "activation": Derivation(broaden=_all_layers, narrow=_narrow_activation),
+}
+
+
+def broad_request(mode: str, req):
+    """The request whose result is cached for ``req`` (``req`` itself if not derivable)."""
+    derivation = DERIVATIONS.get(mode)
+    return req if derivation is None else derivation.broaden(req)
+
+
+def derive(mode: str, req, broad_result: dict) -> dict:
+    """``req``'s result from the result of ``broad_request(mode, req)``."""
+    derivation = DERIVATIONS.get(mode)
+    return broad_result if derivation is None else derivation.narrow(req, broad_result)
@@ -2,12 +2,15 @@ from __future__ import annotations
 
 import gc
 import logging
+from typing import TYPE_CHECKING
 
 import torch
-from sae_lens import SAE
 
 from neural_mri.core.sae_registry import get_sae_info
 
+if TYPE_CHECKING:
+    from sae_lens import SAE
+
 logger = logging.getLogger(__name__)
 
 
@@ -39,6 +42,9 @@ class SAEManager:
         sae_id = info["sae_id_template"].format(layer=layer_idx)
 
         logger.info("Loading SAE: release=%s, sae_id=%s, device=%s", release, sae_id, device)
+        # Imported on first use: sae_lens is slow to import and most sessions never load an SAE
+        from sae_lens import SAE
+
         sae = SAE.from_pretrained(
             release=release,
             sae_id=sae_id,
@@ -23,6 +23,14 @@ def get_sae_info(model_id: str) -> dict | None:
     return SAE_REGISTRY.get(model_id)
 
 
+def default_sae_layer(model_id: str) -> int | None:
+    """Return the middle SAE layer for a model, or None if unsupported."""
+    info = SAE_REGISTRY.get(model_id)
+    if info is None:
+        return None
+    return info["layers"][len(info["layers"]) // 2]
+
+
 def list_sae_support() -> dict[str, bool]:
     """Return {model_id: has_sae} for all registered models."""
     from neural_mri.core.model_registry import MODEL_REGISTRY
@@ -1,49 +1,413 @@
+"""Scan result cache bounded by an approximate byte budget.
+
+Entries are sized by their serialized (orjson) length, so a gpt2-medium
+DTI result with tens of MB of attention patterns is charged accordingly.
+Three rules keep the cache useful:
+
+- admission: results larger than ``admit_fraction`` of the budget are not
+  cached at all (they would flush everything else).
+- per-mode quota: no scan mode may hold more than ``mode_quota`` of the
+  budget; going over evicts within that mode first.
+- eviction: GreedyDual-Size. Each entry has priority ``H = L + cost / size``,
+  where cost is the measured compute time and size the serialized body.
+  The lowest ``H`` is evicted and ``L`` rises to it, so expensive results
+  (DTI, causal trace) outlive cheap ones (T1) of the same size while stale
+  entries still age out. Ties go to the least recently used entry.
+  Priorities live in one min-heap per mode with lazy deletion (a
+  re-prioritized or removed entry leaves a stale heap item that is skipped
+  when it surfaces), so an eviction costs O(log n) instead of a scan over
+  every entry.
+
+Results are held as their serialized JSON, so a hit can be sent as-is
+(``get_body``) without rebuilding and re-serializing the Pydantic model. A
+gzip variant is made on first request, and ``get`` decodes the bytes once
+for callers that need the dict; both are kept on the entry only if the
+grown entry still passes admission. Their bytes count against the budget
+(evicting as a put would) but not in the entry's priority, so serving an
+entry never makes it the next to go.
+
+With a ``ScanDiskStore`` attached, every result is also persisted, and
+memory misses fall back to disk (keyed by the model's weight fingerprint).
+The request path uses ``aget`` / ``aget_body``, which read the disk tier in
+a worker thread so that an SQLite read and decompression never stall the
+event loop; ``get`` / ``get_body`` are their blocking counterparts.
+
+All bookkeeping is guarded by one lock: requests use the cache from the
+event loop while eviction listeners call ``invalidate_model`` from
+load-job threads. Disk I/O and compression run outside it.
+"""
+
 from __future__ import annotations
 
+import asyncio
+import gzip
 import hashlib
+import heapq
 import logging
-from collections import OrderedDict
+import threading
+import zlib
+from collections.abc import Callable
+from dataclasses import dataclass
+from itertools import count
+from typing import TYPE_CHECKING
+
+import orjson
+
+if TYPE_CHECKING:
+    from neural_mri.core.scan_store import ScanDiskStore
 
 logger = logging.getLogger(__name__)
 
+# Fallback compute cost (ms) for results without metadata.compute_time_ms
+MODE_COST_MS: dict[str, float] = {
+    "structural": 1.0,
+    "weights": 50.0,
+}
+_DEFAULT_COST_MS = 1.0
+
+
+def cache_key(model_id: str, mode: str, prompt: str) -> str:
+    """Key of a scan result: (model_id, scan_mode, prompt_hash)."""
+    prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:12] if prompt else ""
+    return f"{model_id}::{mode}::{prompt_hash}"
+
+
+# Speed over ratio: large float-heavy payloads are compressed on the request path
+_GZIP_LEVEL = 4
+_GZIP_MIN_BYTES = 1024  # smaller bodies are sent uncompressed
+
+# Decoded dicts of float lists take a few times their JSON size in Python objects
+_DECODED_SIZE_FACTOR = 3
+
+
+def serialize(result: dict) -> bytes:
+    """The JSON body a cached result is stored and served as."""
+    return orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+
+
+def _compute_cost(mode: str, result: dict) -> float:
+    metadata = result.get("metadata") if isinstance(result, dict) else None
+    if isinstance(metadata, dict) and metadata.get("compute_time_ms"):
+        return float(metadata["compute_time_ms"])
+    return MODE_COST_MS.get(mode, _DEFAULT_COST_MS)
+
+
+@dataclass(frozen=True)
+class CachedBody:
+    """Serialized JSON of a cached result, ready to send."""
+
+    content: bytes
+    etag: str  # weak: the identity and gzip bodies share it
+    gzipped: bool
+
+
+@dataclass
+class _Entry:
+    mode: str
+    body: bytes
+    size: int  # body plus the gzip / decoded copies kept with it
+    cost: float
+    priority: float = 0.0
+    etag: str = ""
+    gzipped: bytes | None = None
+    decoded: dict | None = None  # shared by ``get`` callers, who must not mutate it
+    tick: int = 0  # last access; also breaks priority ties, oldest first
+
 
 class ScanCache:
-    """LRU cache keyed by (model_id, scan_mode, prompt_hash)."""
+    """Byte-budgeted cache keyed by (model_id, scan_mode, prompt_hash)."""
+
+    def __init__(
+        self,
+        max_entries: int | None = None,
+        budget_bytes: int = 256 * 1024 * 1024,
+        mode_quota: float = 0.5,
+        admit_fraction: float = 0.25,
+        disk: ScanDiskStore | None = None,
+        fingerprint: Callable[[str], str | None] | None = None,
+    ) -> None:
+        # ``fingerprint(model_id)`` identifies the weights for the disk tier (None: skip disk)
+        self._disk = disk if fingerprint is not None else None
+        self._fingerprint = fingerprint
+        self._max = max_entries  # optional entry-count bound on top of the byte budget
+        self._budget = budget_bytes
+        self._mode_quota = mode_quota
+        self._admit_fraction = admit_fraction
+        self._store: dict[str, _Entry] = {}
+        # Per mode: (priority, tick, key) min-heap; items for outdated ticks are stale
+        self._heaps: dict[str, list[tuple[float, int, str]]] = {}
+        self._ticks = count(1)
+        self._lock = threading.Lock()
+        self._inflation = 0.0  # GreedyDual-Size "L"
+        self._bytes = 0
+        self._mode_bytes: dict[str, int] = {}
+        self._hits = 0
+        self._misses = 0
+        self._rejected = 0
+        self._evictions = 0
+
+    def __len__(self) -> int:
+        return len(self._store)
 
-    def __init__(self, max_entries: int = 5) -> None:
-        self._max = max_entries
-        self._store: OrderedDict[str, dict] = OrderedDict()
+    @property
+    def bytes_used(self) -> int:
+        return self._bytes
+
+    @property
+    def budget_bytes(self) -> int:
+        return self._budget
+
+    @property
+    def max_entries(self) -> int | None:
+        return self._max
 
     @staticmethod
     def _key(model_id: str, mode: str, prompt: str) -> str:
-        prompt_hash = hashlib.md5(prompt.encode()).hexdigest()[:12] if prompt else ""
-        return f"{model_id}::{mode}::{prompt_hash}"
+        return cache_key(model_id, mode, prompt)
+
+    def _priority(self, entry: _Entry) -> float:
+        return self._inflation + entry.cost / max(len(entry.body), 1)
+
+    def _touch(self, key: str, entry: _Entry) -> None:
+        """Re-prioritize ``entry`` as just used (its old heap item goes stale)."""
+        entry.priority = self._priority(entry)
+        entry.tick = next(self._ticks)
+        heap = self._heaps.setdefault(entry.mode, [])
+        heapq.heappush(heap, (entry.priority, entry.tick, key))
+        if len(heap) > 2 * len(self._store) + 64:
+            # Mostly stale: rebuild from the live entries of this mode
+            heap[:] = [
+                (e.priority, e.tick, k) for k, e in self._store.items() if e.mode == entry.mode
+            ]
+            heapq.heapify(heap)
+
+    def _live_top(self, mode: str) -> tuple[float, int, str] | None:
+        """Lowest live heap item of ``mode``, dropping stale ones on the way."""
+        heap = self._heaps.get(mode)
+        while heap:
+            priority, tick, key = heap[0]
+            entry = self._store.get(key)
+            if entry is not None and entry.tick == tick:
+                return heap[0]
+            heapq.heappop(heap)
+        return None
 
     def get(self, model_id: str, mode: str, prompt: str = "") -> dict | None:
+        """The cached result as a dict (shared between callers: do not mutate)."""
+        entry = self._lookup(model_id, mode, prompt)
+        return None if entry is None else self._decoded(self._key(model_id, mode, prompt), entry)
+
+    async def aget(self, model_id: str, mode: str, prompt: str = "") -> dict | None:
+        """``get`` with the disk fallback off the event loop."""
+        entry = await self._alookup(model_id, mode, prompt)
+        return None if entry is None else self._decoded(self._key(model_id, mode, prompt), entry)
+
+    def get_body(
+        self, model_id: str, mode: str, prompt: str = "", gzipped: bool = False
+    ) -> CachedBody | None:
+        """The cached result as response bytes, gzip-compressed if ``gzipped``."""
+        entry = self._lookup(model_id, mode, prompt)
+        if entry is None:
+            return None
+        compressed = None
+        if self._needs_gzip(entry, gzipped):
+            compressed = gzip.compress(entry.body, _GZIP_LEVEL)
+        return self._body(self._key(model_id, mode, prompt), entry, gzipped, compressed)
+
+    async def aget_body(
+        self, model_id: str, mode: str, prompt: str = "", gzipped: bool = False
+    ) -> CachedBody | None:
+        """``get_body`` with the disk fallback and compression off the event loop."""
+        entry = await self._alookup(model_id, mode, prompt)
+        if entry is None:
+            return None
+        compressed = None
+        if self._needs_gzip(entry, gzipped):
+            compressed = await asyncio.to_thread(gzip.compress, entry.body, _GZIP_LEVEL)
+        return self._body(self._key(model_id, mode, prompt), entry, gzipped, compressed)
+
+    def etag(self, model_id: str, mode: str, prompt: str = "") -> str | None:
+        """ETag of the cached body (None if not cached); not counted as a hit."""
+        with self._lock:
+            entry = self._store.get(self._key(model_id, mode, prompt))
+            return None if entry is None else entry.etag
+
+    @staticmethod
+    def _needs_gzip(entry: _Entry, gzipped: bool) -> bool:
+        return gzipped and len(entry.body) >= _GZIP_MIN_BYTES and entry.gzipped is None
+
+    def _body(self, key: str, entry: _Entry, gzipped: bool, compressed: bytes | None) -> CachedBody:
+        if not gzipped or len(entry.body) < _GZIP_MIN_BYTES:
+            return CachedBody(entry.body, entry.etag, False)
+        if compressed is not None:
+            with self._lock:
+                if entry.gzipped is None and self._grow(key, entry, len(compressed)):
+                    entry.gzipped = compressed
+        return CachedBody(entry.gzipped or compressed, entry.etag, True)
+
+    def _decoded(self, key: str, entry: _Entry) -> dict:
+        decoded = entry.decoded
+        if decoded is None:
+            decoded = orjson.loads(entry.body)
+            with self._lock:
+                if entry.decoded is not None:
+                    return entry.decoded
+                if self._grow(key, entry, len(entry.body) * _DECODED_SIZE_FACTOR):
+                    entry.decoded = decoded
+        return decoded
+
+    def _grow(self, key: str, entry: _Entry, extra: int) -> bool:
+        """Charge ``extra`` bytes to resident ``entry`` if it still passes admission.
+
+        Evicts as a put would; the entry keeps its priority. Caller holds
+        the lock.
+        """
+        if self._store.get(key) is not entry:
+            return False
+        if entry.size + extra > self._admit_fraction * self._budget:
+            return False
+        entry.size += extra
+        self._bytes += extra
+        self._mode_bytes[entry.mode] += extra
+        self._enforce_budget(entry.mode)
+        return True
+
+    def _lookup(self, model_id: str, mode: str, prompt: str) -> _Entry | None:
+        entry = self._memory_get(model_id, mode, prompt)
+        return entry if entry is not None else self._disk_get(model_id, mode, prompt)
+
+    async def _alookup(self, model_id: str, mode: str, prompt: str) -> _Entry | None:
+        entry = self._memory_get(model_id, mode, prompt)
+        if entry is not None or self._disk is None:
+            return entry
+        return await asyncio.to_thread(self._disk_get, model_id, mode, prompt)
+
+    def _memory_get(self, model_id: str, mode: str, prompt: str) -> _Entry | None:
         key = self._key(model_id, mode, prompt)
-        if key in self._store:
-            self._store.move_to_end(key)
-            logger.info("Cache HIT: %s", key)
-            return self._store[key]
-        return None
+        with self._lock:
+            entry = self._store.get(key)
+            if entry is None:
+                self._misses += 1
+                return None
+            self._hits += 1
+            self._touch(key, entry)
+        logger.info("Cache HIT: %s", key)
+        return entry
+
+    @staticmethod
+    def _new_entry(key: str, mode: str, body: bytes, cost: float) -> _Entry:
+        # Weak validator of this exact body; changes whenever the result is recomputed
+        digest = hashlib.blake2b(
+            key.encode() + zlib.crc32(body).to_bytes(4, "big"), digest_size=12
+        ).hexdigest()
+        return _Entry(mode, body, len(body), cost, etag=f'W/"{digest}-{len(body):x}"')
+
+    def put(
+        self, model_id: str, mode: str, prompt: str, result: dict, cost_ms: float | None = None
+    ) -> None:
+        """Cache ``result``; ``cost_ms`` defaults to its metadata.compute_time_ms."""
+        if self._disk is not None:
+            fingerprint = self._fingerprint(model_id)
+            if fingerprint is not None:
+                self._disk.put(model_id, fingerprint, mode, prompt, result)
+        cost = cost_ms if cost_ms is not None else _compute_cost(mode, result)
+        body = serialize(result)
+        with self._lock:
+            self._insert(self._key(model_id, mode, prompt), mode, body, cost)
 
-    def put(self, model_id: str, mode: str, prompt: str, result: dict) -> None:
+    def _disk_get(self, model_id: str, mode: str, prompt: str) -> _Entry | None:
+        """Blocking disk-tier lookup; a hit is promoted into memory."""
+        if self._disk is None:
+            return None
+        fingerprint = self._fingerprint(model_id)
+        if fingerprint is None:
+            return None
+        result = self._disk.get(model_id, fingerprint, mode, prompt)
+        if result is None:
+            return None
         key = self._key(model_id, mode, prompt)
-        self._store[key] = result
-        self._store.move_to_end(key)
-        while len(self._store) > self._max:
-            evicted = self._store.popitem(last=False)
-            logger.info("Cache evicted: %s", evicted[0])
-        logger.info("Cache PUT: %s (size=%d)", key, len(self._store))
+        logger.info("Cache DISK HIT: %s", key)
+        body = serialize(result)
+        with self._lock:
+            self._insert(key, mode, body, _compute_cost(mode, result))
+            # A disk hit too large for memory is served without being kept
+            return self._store.get(key) or self._new_entry(key, mode, body, 0.0)
+
+    def _insert(self, key: str, mode: str, body: bytes, cost: float) -> None:
+        size = len(body)
+        if size > self._admit_fraction * self._budget:
+            self._rejected += 1
+            logger.info("Cache REJECT: %s (%d bytes > admission limit)", key, size)
+            return
+        if key in self._store:
+            self._remove(key)
+        entry = self._new_entry(key, mode, body, cost)
+        self._store[key] = entry
+        self._touch(key, entry)
+        self._bytes += size
+        self._mode_bytes[mode] = self._mode_bytes.get(mode, 0) + size
+        self._enforce_budget(mode)
+        logger.info("Cache PUT: %s (%d bytes, size=%d)", key, size, len(self._store))
+
+    def _enforce_budget(self, mode: str) -> None:
+        """Evict until ``mode`` is within its quota and the cache within its budget."""
+        while self._mode_bytes[mode] > self._mode_quota * self._budget:
+            self._evict(mode)
+        while self._bytes > self._budget or (
+            self._max is not None and len(self._store) > self._max
+        ):
+            self._evict()
+
+    def _evict(self, mode: str | None = None) -> None:
+        """Evict the lowest-priority entry (of ``mode``, if given)."""
+        modes = [mode] if mode is not None else list(self._heaps)
+        tops = [top for top in map(self._live_top, modes) if top is not None]
+        if not tops:
+            return
+        priority, _, victim = min(tops)  # equal priorities: lowest tick, i.e. least recent
+        self._inflation = priority
+        self._remove(victim)
+        self._evictions += 1
+        logger.info("Cache evicted: %s", victim)
+
+    def _remove(self, key: str) -> None:
+        entry = self._store.pop(key)
+        self._bytes -= entry.size
+        self._mode_bytes[entry.mode] -= entry.size
 
     def invalidate_model(self, model_id: str) -> None:
         """Remove all cache entries for a specific model."""
         prefix = f"{model_id}::"
-        keys_to_remove = [k for k in self._store if k.startswith(prefix)]
-        for k in keys_to_remove:
-            del self._store[k]
+        with self._lock:
+            keys_to_remove = [k for k in self._store if k.startswith(prefix)]
+            for k in keys_to_remove:
+                self._remove(k)
         if keys_to_remove:
             logger.info("Cache invalidated %d entries for model %s", len(keys_to_remove), model_id)
 
     def clear(self) -> None:
-        self._store.clear()
+        """Drop every entry, including the disk tier."""
+        if self._disk is not None:
+            self._disk.clear()
+        with self._lock:
+            self._store.clear()
+            self._heaps.clear()
+            self._bytes = 0
+            self._mode_bytes.clear()
+            self._inflation = 0.0
+
+    def stats(self) -> dict:
+        """Occupancy, per-mode bytes and hit/miss/reject/eviction counters."""
+        with self._lock:
+            stats = {
+                "entries": len(self._store),
+                "bytes": self._bytes,
+                "budget_bytes": self._budget,
+                "mode_bytes": {mode: size for mode, size in self._mode_bytes.items() if size},
+                "hits": self._hits,
+                "misses": self._misses,
+                "rejected": self._rejected,
+                "evictions": self._evictions,
+            }
+        stats["disk"] = self._disk.stats() if self._disk is not None else None
+        return stats
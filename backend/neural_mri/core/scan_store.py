@@ -0,0 +1,193 @@
+"""Persistent on-disk second tier for scan results.
+
+The in-memory ``ScanCache`` is lost on every restart and cleared when a
+model leaves the pool. ``ScanDiskStore`` keeps results in an SQLite
+database on local disk, compressed orjson in the same row as its index
+entry. Entries are keyed by model id, a weight fingerprint, scan mode and
+the full cache prompt (which carries every request parameter), so
+reloading a model scanned yesterday serves yesterday's scans, while a
+re-trained checkpoint under the same id never does.
+
+SQLite in WAL mode lets several uvicorn workers on one host share the
+store. Writes and access-time updates run on a background thread, so
+compressing a large DTI result does not block the event loop. The total
+size is kept under a byte budget by dropping the least recently used rows;
+it is tracked as a running total (re-read from the table every
+``_RESYNC_WRITES`` writes, since other processes write to it too).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import logging
+import sqlite3
+import threading
+import time
+import zlib
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+
+import orjson
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# zlib level 1: most of the size reduction on float-heavy JSON at a fraction of the CPU
+_COMPRESS_LEVEL = 1
+
+# Writes between re-reads of the true total size (other workers share the table)
+_RESYNC_WRITES = 256
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS scans (
+    key TEXT PRIMARY KEY,
+    model_id TEXT NOT NULL,
+    fingerprint TEXT NOT NULL,
+    mode TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    created REAL NOT NULL,
+    accessed REAL NOT NULL,
+    blob BLOB NOT NULL
+)
+"""
+
+
+def _disk_key(model_id: str, fingerprint: str, mode: str, prompt: str) -> str:
+    return hashlib.sha256("\0".join((model_id, fingerprint, mode, prompt)).encode()).hexdigest()
+
+
+class ScanDiskStore:
+    """SQLite-backed scan result store shared by processes on one host."""
+
+    def __init__(self, cache_dir: str | Path, budget_bytes: int = 2 * 1024**3) -> None:
+        self._path = Path(cache_dir).expanduser() / f"scans-v{FORMAT_VERSION}.sqlite3"
+        self._budget = budget_bytes
+        self._lock = threading.Lock()
+        self._conn: sqlite3.Connection | None = None
+        self._writer = ThreadPoolExecutor(max_workers=1, thread_name_prefix="scan-store")
+        self._total: int | None = None  # running sum of blob sizes; None: re-read it
+        self._since_resync = 0
+        self._hits = 0
+        self._misses = 0
+        self._writes = 0
+
+    def _connect(self) -> sqlite3.Connection:
+        if self._conn is None:
+            self._path.parent.mkdir(parents=True, exist_ok=True)
+            conn = sqlite3.connect(self._path, timeout=10, check_same_thread=False)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            conn.execute(_SCHEMA)
+            conn.execute("CREATE INDEX IF NOT EXISTS scans_accessed ON scans (accessed)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, model_id: str, fingerprint: str, mode: str, prompt: str) -> dict | None:
+        key = _disk_key(model_id, fingerprint, mode, prompt)
+        try:
+            with self._lock:
+                row = (
+                    self._connect()
+                    .execute("SELECT blob FROM scans WHERE key = ?", (key,))
+                    .fetchone()
+                )
+            if row is None:
+                self._misses += 1
+                return None
+            result = orjson.loads(zlib.decompress(row[0]))
+        except (sqlite3.Error, OSError, zlib.error, orjson.JSONDecodeError) as exc:
+            logger.warning("Scan store read failed: %s", exc)
+            return None
+        self._hits += 1
+        self._writer.submit(self._touch, key)
+        return result
+
+    def put(self, model_id: str, fingerprint: str, mode: str, prompt: str, result: dict) -> Future:
+        """Persist ``result`` in the background; the future resolves once written."""
+        key = _disk_key(model_id, fingerprint, mode, prompt)
+        return self._writer.submit(self._write, key, model_id, fingerprint, mode, result)
+
+    def _write(self, key: str, model_id: str, fingerprint: str, mode: str, result: dict) -> None:
+        try:
+            raw = orjson.dumps(result, default=str, option=orjson.OPT_SERIALIZE_NUMPY)
+            blob = zlib.compress(raw, _COMPRESS_LEVEL)
+            now = time.time()
+            with self._lock:
+                conn = self._connect()
+                old = conn.execute("SELECT size FROM scans WHERE key = ?", (key,)).fetchone()
+                conn.execute(
+                    "INSERT OR REPLACE INTO scans VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                    (key, model_id, fingerprint, mode, len(blob), now, now, blob),
+                )
+                conn.commit()
+                if self._total is not None:
+                    self._total += len(blob) - (old[0] if old else 0)
+                self._prune(conn)
+            self._writes += 1
+        except (sqlite3.Error, OSError, TypeError) as exc:
+            logger.warning("Scan store write failed: %s", exc)
+
+    def _touch(self, key: str) -> None:
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("UPDATE scans SET accessed = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Scan store update failed: %s", exc)
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        self._since_resync += 1
+        if self._total is None or self._since_resync >= _RESYNC_WRITES:
+            self._total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM scans").fetchone()[0]
+            self._since_resync = 0
+        total = self._total
+        if total <= self._budget:
+            return
+        freed = 0
+        doomed = []
+        for key, size in conn.execute("SELECT key, size FROM scans ORDER BY accessed"):
+            if total - freed <= self._budget:
+                break
+            doomed.append((key,))
+            freed += size
+        conn.executemany("DELETE FROM scans WHERE key = ?", doomed)
+        conn.commit()
+        self._total = total - freed
+        logger.info("Scan store pruned %d entries (%d bytes)", len(doomed), freed)
+
+    def flush(self) -> None:
+        """Wait for queued writes (tests, shutdown)."""
+        self._writer.submit(lambda: None).result()
+
+    def clear(self) -> None:
+        self.flush()
+        try:
+            with self._lock:
+                conn = self._connect()
+                conn.execute("DELETE FROM scans")
+                conn.commit()
+                self._total = 0
+        except sqlite3.Error as exc:
+            logger.warning("Scan store clear failed: %s", exc)
+
+    def stats(self) -> dict:
+        try:
+            with self._lock:
+                entries, size = (
+                    self._connect()
+                    .execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM scans")
+                    .fetchone()
+                )
+        except sqlite3.Error:
+            entries, size = 0, 0
+        return {
+            "entries": entries,
+            "bytes": size,
+            "budget_bytes": self._budget,
+            "hits": self._hits,
+            "misses": self._misses,
+            "writes": self._writes,
+        }
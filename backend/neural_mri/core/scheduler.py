@@ -0,0 +1,153 @@
+"""Central inference scheduler: one worker owns all model execution.
+
+Routes used to run engine calls concurrently on the default thread pool,
+so a long causal trace and an interactive scan competed for the same
+cores, and concurrent ``run_with_hooks`` calls could see each other's hooks
+on the shared model. All model work now goes through ``InferenceScheduler``:
+jobs queue by priority class and run one at a time on a dedicated worker
+thread (whose intra-op thread count is configurable). Jobs are not
+preempted; priority decides which queued job runs next.
+
+Each job runs in a copy of the submitter's ``contextvars`` context, so
+``ModelManager.bind`` applies inside the worker.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import contextvars
+import heapq
+import itertools
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# Lower runs first
+PRIORITIES: dict[str, int] = {
+    "interactive": 0,  # scans and perturbations a user is waiting on
+    "streaming": 1,  # WebSocket scan streams
+    "batch": 2,  # battery, report, causal trace
+    "background": 3,  # precompute (weight stats, warm-up)
+}
+
+_CLASS_NAMES = {level: name for name, level in PRIORITIES.items()}
+
+# Recent wait times kept per class for percentiles
+_WAIT_WINDOW = 256
+
+
+def _percentile(values: list[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class InferenceScheduler:
+    """Priority queue of model jobs executed by a single worker thread."""
+
+    def __init__(self, intra_op_threads: int = 0) -> None:
+        self._intra_op_threads = intra_op_threads  # 0 = torch default
+        self._queue: list[tuple[int, int, float, Callable[[], None]]] = []
+        self._seq = itertools.count()
+        self._cond = threading.Condition()
+        self._worker: threading.Thread | None = None
+        self._running: str | None = None  # priority class of the running job
+        self._waits: dict[str, deque[float]] = {
+            name: deque(maxlen=_WAIT_WINDOW) for name in PRIORITIES
+        }
+        self._completed: dict[str, int] = dict.fromkeys(PRIORITIES, 0)
+        self._busy_s = 0.0
+
+    def _ensure_worker(self) -> None:
+        if self._worker is None or not self._worker.is_alive():
+            self._worker = threading.Thread(
+                target=self._work, name="inference-scheduler", daemon=True
+            )
+            self._worker.start()
+
+    def submit(self, fn: Callable[..., T], *args: Any, priority: str = "interactive") -> Future[T]:
+        """Queue ``fn(*args)``; the returned future resolves with its result."""
+        if priority not in PRIORITIES:
+            raise ValueError(f"Unknown priority class: {priority}")
+        future: Future[T] = Future()
+        ctx = contextvars.copy_context()
+        enqueued = time.perf_counter()
+
+        def job() -> None:
+            if not future.set_running_or_notify_cancel():
+                return
+            start = time.perf_counter()
+            self._waits[priority].append(start - enqueued)
+            try:
+                result = ctx.run(fn, *args)
+            except BaseException as exc:
+                self._finished(priority, start)
+                future.set_exception(exc)
+            else:
+                self._finished(priority, start)
+                future.set_result(result)
+
+        with self._cond:
+            heapq.heappush(self._queue, (PRIORITIES[priority], next(self._seq), enqueued, job))
+            self._ensure_worker()
+            self._cond.notify()
+        return future
+
+    async def run(self, fn: Callable[..., T], *args: Any, priority: str = "interactive") -> T:
+        """Awaitable ``submit``: the event loop stays free while the job waits and runs."""
+        return await asyncio.wrap_future(self.submit(fn, *args, priority=priority))
+
+    def _finished(self, priority: str, start: float) -> None:
+        # Recorded before the future resolves, so stats are current for the awaiter
+        with self._cond:
+            self._busy_s += time.perf_counter() - start
+            self._completed[priority] += 1
+
+    def _work(self) -> None:
+        if self._intra_op_threads > 0:
+            import torch
+
+            torch.set_num_threads(self._intra_op_threads)
+        while True:
+            with self._cond:
+                while not self._queue:
+                    self._cond.wait()
+                level, _, _, job = heapq.heappop(self._queue)
+                self._running = _CLASS_NAMES[level]
+            try:
+                job()
+            finally:
+                with self._cond:
+                    self._running = None
+
+    def stats(self) -> dict:
+        """Queue depth, wait-time percentiles and completions per priority class."""
+        with self._cond:
+            depth = dict.fromkeys(PRIORITIES, 0)
+            for level, _, _, _ in self._queue:
+                depth[_CLASS_NAMES[level]] += 1
+            classes = {}
+            for name in PRIORITIES:
+                waits = list(self._waits[name])
+                classes[name] = {
+                    "queued": depth[name],
+                    "completed": self._completed[name],
+                    "wait_p50_ms": round(_percentile(waits, 0.5) * 1000, 2),
+                    "wait_p99_ms": round(_percentile(waits, 0.99) * 1000, 2),
+                }
+            return {
+                "queue_depth": len(self._queue),
+                "running": self._running,
+                "busy_s": round(self._busy_s, 3),
+                "intra_op_threads": self._intra_op_threads,
+                "classes": classes,
+            }
@@ -0,0 +1,56 @@
+"""Single-flight deduplication of identical in-flight computations.
+
+Routes check the ``ScanCache`` and compute on a miss, so N clients asking
+for the same scan at once (everyone following the host in a collab
+session) used to start N identical forward passes. ``SingleFlight`` keys
+each computation like the scan cache; while one is running, identical
+requests await the same result instead of starting their own.
+
+The shared computation runs as its own task: a client that disconnects
+does not cancel it for the others (and its result still reaches the
+cache).
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from collections.abc import Awaitable, Callable
+from typing import TypeVar
+
+from neural_mri.core.scan_cache import cache_key
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """At most one running computation per scan key; latecomers share it."""
+
+    def __init__(self) -> None:
+        self._flights: dict[str, asyncio.Task] = {}
+        self._started = 0
+        self._coalesced = 0
+
+    async def run(self, model_id: str, mode: str, prompt: str, fn: Callable[[], Awaitable[T]]) -> T:
+        """Result of ``fn()``, shared with identical concurrent calls."""
+        key = cache_key(model_id, mode, prompt)
+        task = self._flights.get(key)
+        if task is None:
+            task = asyncio.ensure_future(fn())
+            self._flights[key] = task
+            self._started += 1
+            task.add_done_callback(lambda _: self._flights.pop(key, None))
+        else:
+            self._coalesced += 1
+            logger.info("Coalesced in-flight request: %s", key)
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """Computations started, requests coalesced onto them, and flights running now."""
+        return {
+            "started": self._started,
+            "coalesced": self._coalesced,
+            "in_flight": len(self._flights),
+        }
@@ -0,0 +1,54 @@
+"""Memoized token-id -> display string table per loaded model.
+
+Logit-lens style views decode thousands of top-k ids per scan, and the same
+ids recur across layers, positions and scans. Each model gets one table that
+keeps the most recently used ``max_size`` decoded ids (large-vocabulary
+models would otherwise keep growing it as new prompts arrive).
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+
+_TABLES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_TABLES_LOCK = threading.Lock()
+
+
+class TokenTable:
+    """Lazily filled, LRU-bounded id -> string table backed by ``tokenizer.decode``."""
+
+    def __init__(self, tokenizer, max_size: int = 32768) -> None:
+        self._tokenizer = tokenizer
+        self._max = max_size
+        self._strings: OrderedDict[int, str] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._strings)
+
+    def decode(self, ids: list[int]) -> list[str]:
+        """Decode each id on its own (single-token strings), in order."""
+        strings = self._strings
+        decoded = {}
+        for tok_id in set(ids):
+            text = strings.get(tok_id)
+            if text is None:
+                text = self._tokenizer.decode([tok_id])
+                strings[tok_id] = text
+            else:
+                strings.move_to_end(tok_id)
+            decoded[tok_id] = text
+        while len(strings) > self._max:
+            strings.popitem(last=False)
+        return [decoded[tok_id] for tok_id in ids]
+
+
+def token_table(model) -> TokenTable:
+    """Return the table for ``model``, creating it on first use."""
+    with _TABLES_LOCK:
+        table = _TABLES.get(model)
+        if table is None:
+            table = TokenTable(model.tokenizer)
+            _TABLES[model] = table
+        return table
@@ -0,0 +1,115 @@
+"""Per-model tokenization with a prompt LRU and a single-token table.
+
+Scans called both ``model.to_tokens(prompt)`` and
+``model.to_str_tokens(prompt)``, which tokenizes the prompt a second time,
+and the battery re-tokenized the same expected tokens and pronouns for
+every test. For short prompts on small models this rivals the forward
+pass. Each model gets one ``TokenizationService``:
+
+- ``encode(prompt)`` tokenizes once; string tokens are decoded from those
+  ids (``to_str_tokens`` on a tensor does not re-tokenize). Results are
+  kept in an LRU keyed by prompt.
+- ``token_id(text)`` returns the first token id of ``text`` and memoizes
+  it; common pronouns are precomputed.
+
+Cached token tensors are shared between callers and must not be modified
+in place.
+"""
+
+from __future__ import annotations
+
+import threading
+import weakref
+from collections import OrderedDict
+from dataclasses import dataclass
+
+import torch
+
+# Prompts kept per model
+_MAX_PROMPTS = 1024
+
+# Single tokens the battery's bias tests read on every run
+PRONOUNS = (" he", " she", " they")
+
+_SERVICES: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+_SERVICES_LOCK = threading.Lock()
+
+
+@dataclass(frozen=True)
+class Tokenized:
+    tokens: torch.Tensor  # [1, seq_len] on the model's device
+    str_tokens: list[str]
+    # (start, end) character span of each token in the prompt; BOS is (0, 0).
+    # None when the decoded tokens do not spell out the prompt exactly.
+    offsets: list[tuple[int, int]] | None
+
+
+def _offsets(prompt: str, str_tokens: list[str], skip: int) -> list[tuple[int, int]] | None:
+    spans = [(0, 0)] * skip
+    pos = 0
+    for text in str_tokens[skip:]:
+        if not prompt.startswith(text, pos):
+            return None
+        spans.append((pos, pos + len(text)))
+        pos += len(text)
+    return spans if pos == len(prompt) else None
+
+
+class TokenizationService:
+    """Memoized tokenization for one model."""
+
+    def __init__(self, model, max_prompts: int = _MAX_PROMPTS) -> None:
+        self._model = weakref.proxy(model)
+        self._max = max_prompts
+        self._prompts: OrderedDict[tuple[str, bool], Tokenized] = OrderedDict()
+        self._single: dict[str, int | None] = {}
+        self._lock = threading.Lock()
+        for text in PRONOUNS:
+            self.token_id(text)
+
+    def __len__(self) -> int:
+        return len(self._prompts)
+
+    def encode(self, prompt: str, prepend_bos: bool = True) -> Tokenized:
+        """Token ids, string tokens and offsets of ``prompt`` (one tokenizer call)."""
+        key = (prompt, prepend_bos)
+        with self._lock:
+            hit = self._prompts.get(key)
+            if hit is not None:
+                self._prompts.move_to_end(key)
+                return hit
+
+        tokens = self._model.to_tokens(prompt, prepend_bos=prepend_bos)
+        str_tokens = list(self._model.to_str_tokens(tokens[0]))
+        bos = getattr(self._model.tokenizer, "bos_token", None)
+        skip = 1 if prepend_bos and str_tokens and str_tokens[0] == bos else 0
+        result = Tokenized(tokens, str_tokens, _offsets(prompt, str_tokens, skip))
+
+        with self._lock:
+            self._prompts[key] = result
+            while len(self._prompts) > self._max:
+                self._prompts.popitem(last=False)
+        return result
+
+    def tokens(self, prompt: str) -> torch.Tensor:
+        """``model.to_tokens(prompt)``, cached."""
+        return self.encode(prompt).tokens
+
+    def token_id(self, text: str) -> int | None:
+        """First token id of ``text`` without BOS (None if it tokenizes to nothing)."""
+        if text in self._single:
+            return self._single[text]
+        ids = self._model.to_tokens(text, prepend_bos=False)[0]
+        tok_id = int(ids[0]) if len(ids) > 0 else None
+        self._single[text] = tok_id
+        return tok_id
+
+
+def tokenization(model) -> TokenizationService:
+    """Return the tokenization service for ``model``, creating it on first use."""
+    with _SERVICES_LOCK:
+        service = _SERVICES.get(model)
+        if service is None:
+            service = TokenizationService(model)
+            _SERVICES[model] = service
+        return service
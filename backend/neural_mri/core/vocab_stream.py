@@ -0,0 +1,103 @@
+"""Vocab-chunked logit lens statistics with bounded memory.
+
+For large vocabularies (Gemma's 256k) the full ``[n_layers, seq, d_vocab]``
+float32 logit/probability tensors of a logit lens run to gigabytes. Here the
+unembedding is applied one vocab tile at a time and every statistic is
+accumulated online (running max + rescaled sums, as in streaming softmax):
+
+    lse(x)         = m + log(sum exp(x - m))
+    H(q)           = lse(x) - E_q[x]
+    KL(p || q)     = E_p[y - x] - lse(y) + lse(x)
+
+where ``x`` are lens logits, ``y`` the model's final logits, ``q``/``p``
+their softmaxes. Top-k is merged tile by tile. No tensor larger than one
+tile is ever materialized.
+"""
+
+from __future__ import annotations
+
+from dataclasses import dataclass
+
+import torch
+
+
+@dataclass(frozen=True)
+class LensStats:
+    kl: torch.Tensor  # [n_layers, seq] KL(final || lens)
+    entropy: torch.Tensor  # [n_layers, seq] entropy of the lens distribution
+    topk_log_probs: torch.Tensor  # [n_layers, seq, k], descending
+    topk_indices: torch.Tensor  # [n_layers, seq, k]
+
+
+def _rescale(m_old: torch.Tensor, m_new: torch.Tensor) -> torch.Tensor:
+    # exp(m_old - m_new), defined as 0 before the first tile (m_old = -inf)
+    return torch.where(torch.isinf(m_old), torch.zeros_like(m_new), (m_old - m_new).exp())
+
+
+def logit_lens_stats(
+    hidden: torch.Tensor,
+    W_U: torch.Tensor,
+    b_U: torch.Tensor | None,
+    final_logits: torch.Tensor,
+    k: int,
+    chunk_size: int,
+) -> LensStats:
+    """KL, entropy and top-k of ``hidden @ W_U + b_U`` streamed over vocab tiles.
+
+    ``hidden`` is the normalized residual ``[n_layers, seq, d_model]`` and
+    ``final_logits`` the model output ``[seq, d_vocab]``; all accumulation
+    is in float32.
+    """
+    n_layers, seq_len, _ = hidden.shape
+    d_vocab = W_U.shape[-1]
+    chunk_size = max(chunk_size, k)
+    hidden = hidden.float()
+    device = hidden.device
+
+    neg_inf = torch.full((n_layers, seq_len), float("-inf"), device=device)
+    m_x, s_x, t_x = neg_inf, torch.zeros_like(neg_inf), torch.zeros_like(neg_inf)
+    m_y = torch.full((seq_len,), float("-inf"), device=device)
+    s_y = torch.zeros_like(m_y)
+    u_xy = torch.zeros_like(neg_inf)  # running sum of exp(y - m_y) * (y - x)
+    top_vals = torch.empty(n_layers, seq_len, 0, device=device)
+    top_idx = torch.empty(n_layers, seq_len, 0, dtype=torch.long, device=device)
+
+    for lo in range(0, d_vocab, chunk_size):
+        hi = min(lo + chunk_size, d_vocab)
+        x = hidden @ W_U[:, lo:hi].float()  # [n_layers, seq, C]
+        if b_U is not None:
+            x = x + b_U[lo:hi].float()
+        y = final_logits[:, lo:hi].float()  # [seq, C]
+
+        # Lens distribution: running max, normalizer and E[x] numerator
+        m_new = torch.maximum(m_x, x.amax(dim=-1))
+        scale = _rescale(m_x, m_new)
+        e_x = (x - m_new.unsqueeze(-1)).exp()
+        s_x = s_x * scale + e_x.sum(dim=-1)
+        t_x = t_x * scale + (e_x * x).sum(dim=-1)
+        m_x = m_new
+
+        # Final distribution: normalizer and E_p[y - x] numerator
+        m_new = torch.maximum(m_y, y.amax(dim=-1))
+        scale = _rescale(m_y, m_new)
+        e_y = (y - m_new.unsqueeze(-1)).exp()  # [seq, C]
+        s_y = s_y * scale + e_y.sum(dim=-1)
+        u_xy = u_xy * scale + (e_y * (y - x)).sum(dim=-1)
+        m_y = m_new
+
+        # Merge this tile's top-k into the running top-k
+        vals, idx = torch.topk(x, min(k, hi - lo), dim=-1)
+        top_vals = torch.cat([top_vals, vals], dim=-1)
+        top_idx = torch.cat([top_idx, idx + lo], dim=-1)
+        if top_vals.shape[-1] > k:
+            top_vals, order = torch.topk(top_vals, k, dim=-1)
+            top_idx = torch.gather(top_idx, -1, order)
+
+    lse_x = m_x + s_x.log()
+    lse_y = m_y + s_y.log()
+    return LensStats(
+        kl=u_xy / s_y - lse_y + lse_x,
+        entropy=lse_x - t_x / s_x,
+        topk_log_probs=top_vals - lse_x.unsqueeze(-1),
+        topk_indices=top_idx,
+    )
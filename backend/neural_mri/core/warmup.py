@@ -0,0 +1,146 @@
+"""Post-load warm-up and the optional compiled forward path.
+
+The first forward passes after a load pay for allocator growth and lazy
+kernel initialization, which the first user of a fresh replica would feel.
+``schedule_warm_up`` runs a few representative sequence lengths through
+every hook plan the scans use, right after load, as one background job per
+(length, plan) so that interactive requests can overtake it between steps.
+
+``compile_forward`` opts a model into a ``torch.compile``-d forward for
+the hook-free path (``forward(model, tokens)``), which only the battery's
+bias comparison runs; every scan endpoint is a hooked run. The model module
+itself is not modified: hooked runs (``run_with_cache`` / ``run_with_hooks``)
+stay eager, since their hooks are fresh closures on every call and would
+force a recompile each time. If compilation fails (e.g. no compiler
+toolchain), the model silently falls back to eager.
+
+torch is imported on first use, so importing this module at server
+startup costs nothing.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+import weakref
+from collections.abc import Callable
+from functools import partial
+from typing import TYPE_CHECKING
+
+from neural_mri.core.hook_plan import plan_for_mode, plan_for_modes
+
+if TYPE_CHECKING:
+    import torch
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SEQ_LENS = (8, 32, 128)
+
+# Hook configurations the scan endpoints run with
+_WARM_MODES = ("fMRI", "DTI", "FLAIR", "battery", "causal_trace")
+
+_COMPILED_MODELS: weakref.WeakSet = weakref.WeakSet()
+_COMPILE_LOCK = threading.Lock()
+_compiled_fn = None
+
+# Models warmed (or with warm-up queued); a reload is a new model object
+_WARMED_MODELS: weakref.WeakSet = weakref.WeakSet()
+_WARMED_LOCK = threading.Lock()
+
+
+def _plain_forward(model, tokens: torch.Tensor) -> torch.Tensor:
+    return model(tokens)
+
+
+def compile_forward(model) -> None:
+    """Route ``forward(model, ...)`` through ``torch.compile`` for this model."""
+    global _compiled_fn
+    import torch
+
+    with _COMPILE_LOCK:
+        if _compiled_fn is None:
+            # dynamic shapes: one graph for every prompt length
+            _compiled_fn = torch.compile(_plain_forward, dynamic=True)
+        _COMPILED_MODELS.add(model)
+
+
+def is_compiled(model) -> bool:
+    return model in _COMPILED_MODELS
+
+
+def forward(model, tokens: torch.Tensor) -> torch.Tensor:
+    """Hook-free forward pass, compiled if the model opted in."""
+    if model in _COMPILED_MODELS:
+        try:
+            return _compiled_fn(model, tokens)
+        except Exception as exc:
+            logger.warning("Compiled forward failed, using eager mode: %s", exc)
+            _COMPILED_MODELS.discard(model)
+    return model(tokens)
+
+
+def _warm_step(model, tokens: torch.Tensor, plan) -> None:
+    import torch
+
+    with torch.no_grad():
+        if plan is None:
+            forward(model, tokens)
+        else:
+            model.run_with_cache(tokens, names_filter=plan)
+
+
+def warm_up_steps(
+    model, seq_lens=DEFAULT_SEQ_LENS, compile: bool = False
+) -> list[tuple[int, Callable[[], None]]]:
+    """``(seq_len, step)`` for the hook-free forward and every scan hook plan per length.
+
+    With ``compile`` the compiled forward is enabled first, so its
+    compilation happens in the first hook-free step.
+    """
+    import torch
+
+    if compile:
+        compile_forward(model)
+    cfg = model.cfg
+    plans = [None] + [plan_for_mode(mode, cfg.n_layers) for mode in _WARM_MODES]
+    plans.append(plan_for_modes(("fMRI", "DTI", "FLAIR"), cfg.n_layers))  # fused scan
+
+    device = next(model.parameters()).device
+    steps = []
+    for seq_len in seq_lens:
+        seq_len = min(seq_len, cfg.n_ctx)
+        tokens = torch.randint(0, cfg.d_vocab, (1, seq_len), device=device)
+        steps += [(seq_len, partial(_warm_step, model, tokens, plan)) for plan in plans]
+    return steps
+
+
+def warm_up(model, seq_lens=DEFAULT_SEQ_LENS, compile: bool = False) -> dict[str, float]:
+    """Run every warm-up step inline; returns the wall time (ms) per sequence length."""
+    timings: dict[str, float] = {}
+    for seq_len, step in warm_up_steps(model, seq_lens, compile):
+        start = time.perf_counter()
+        step()
+        elapsed = (time.perf_counter() - start) * 1000
+        timings[str(seq_len)] = round(timings.get(str(seq_len), 0.0) + elapsed, 1)
+    with _WARMED_LOCK:
+        _WARMED_MODELS.add(model)
+    logger.info("Warm-up of %s done (ms per length): %s", model.cfg.model_name, timings)
+    return timings
+
+
+def schedule_warm_up(scheduler, model, seq_lens=DEFAULT_SEQ_LENS, compile: bool = False) -> int:
+    """Queue the warm-up of ``model`` as background jobs, one per (length, plan).
+
+    A model that is already warm (or queued) is skipped, so re-activating a
+    resident model does not warm it again. Returns the number of jobs queued.
+    """
+    with _WARMED_LOCK:
+        if model in _WARMED_MODELS:
+            return 0
+        _WARMED_MODELS.add(model)
+    steps = warm_up_steps(model, seq_lens, compile)
+    for _, step in steps:
+        scheduler.submit(step, priority="background")
+    logger.info("Queued %d warm-up steps for %s", len(steps), model.cfg.model_name)
+    return len(steps)
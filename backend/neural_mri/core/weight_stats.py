@@ -0,0 +1,144 @@
+"""Precomputed T2 weight statistics, persisted per model.
+
+Weights never change while a model is loaded, so the per-tensor statistics
+behind the T2 scan are computed once (in a background task right after the
+model loads) and written to disk keyed by model id and a weight fingerprint.
+Reloads and server restarts then serve T2 without touching the weights.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import time
+import weakref
+from pathlib import Path
+
+import torch
+
+from neural_mri.utils.tensor_summary import tensor_stats
+
+logger = logging.getLogger(__name__)
+
+FORMAT_VERSION = 1
+
+# Values sampled per tensor for the fingerprint
+_FINGERPRINT_SAMPLES = 64
+
+_FINGERPRINTS: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+
+def weight_fingerprint(model) -> str:
+    """Cheap content fingerprint: names, shapes, dtypes and strided value samples.
+
+    Memoized per model object; weights do not change while a model is loaded.
+    """
+    fingerprint = _FINGERPRINTS.get(model)
+    if fingerprint is None:
+        fingerprint = _FINGERPRINTS[model] = _compute_fingerprint(model)
+    return fingerprint
+
+
+def _compute_fingerprint(model) -> str:
+    h = hashlib.sha256()
+    for name, tensor in model.state_dict().items():
+        flat = tensor.detach().reshape(-1)
+        step = max(1, flat.numel() // _FINGERPRINT_SAMPLES)
+        sample = flat[::step][:_FINGERPRINT_SAMPLES].float().cpu()
+        h.update(f"{name}:{tuple(tensor.shape)}:{tensor.dtype};".encode())
+        h.update(sample.numpy().tobytes())
+    return h.hexdigest()[:16]
+
+
+def compute_weight_stats(model) -> list[dict]:
+    """Statistics for every weight matrix (ndim >= 2) in ``model.state_dict()``."""
+    entries: list[dict] = []
+    with torch.no_grad():
+        for name, tensor in model.state_dict().items():
+            # Skip 1D tensors (biases, layer norms) — focus on weight matrices
+            if tensor.ndim < 2:
+                continue
+            # Map parameter name to layer_id (e.g. "blocks.0.attn.W_Q" -> "blocks.0.attn")
+            layer_id, _, component = name.rpartition(".")
+            entries.append({"layer_id": layer_id, "component": component, **tensor_stats(tensor)})
+    return entries
+
+
+class WeightStatsStore:
+    """In-memory + on-disk store of per-model weight statistics.
+
+    ``cache_dir=None`` keeps statistics in memory only.
+    """
+
+    def __init__(self, cache_dir: str | Path | None = None) -> None:
+        self._dir = Path(cache_dir).expanduser() if cache_dir else None
+        self._lock = threading.Lock()
+        self._loaded: weakref.WeakKeyDictionary = weakref.WeakKeyDictionary()
+
+    def _path(self, model_id: str, fingerprint: str) -> Path | None:
+        if self._dir is None:
+            return None
+        safe_id = re.sub(r"[^A-Za-z0-9._-]", "_", model_id)
+        return self._dir / f"{safe_id}-{fingerprint}.json"
+
+    def _read(self, path: Path | None) -> list[dict] | None:
+        if path is None or not path.is_file():
+            return None
+        try:
+            payload = json.loads(path.read_text())
+        except (OSError, ValueError) as exc:
+            logger.warning("Ignoring unreadable weight stats %s: %s", path, exc)
+            return None
+        if payload.get("version") != FORMAT_VERSION:
+            return None
+        return payload["layers"]
+
+    def _write(self, path: Path | None, model_id: str, entries: list[dict]) -> None:
+        if path is None:
+            return
+        try:
+            path.parent.mkdir(parents=True, exist_ok=True)
+            tmp = path.with_suffix(".tmp")
+            payload = {"version": FORMAT_VERSION, "model_id": model_id, "layers": entries}
+            tmp.write_text(json.dumps(payload))
+            os.replace(tmp, path)
+        except OSError as exc:
+            logger.warning("Could not persist weight stats to %s: %s", path, exc)
+
+    def get(self, model_id: str, model) -> list[dict]:
+        """Statistics for ``model``: memory, then disk, then computed and persisted."""
+        entries = self._loaded.get(model)
+        if entries is not None:
+            return entries
+        with self._lock:
+            entries = self._loaded.get(model)
+            if entries is not None:
+                return entries
+
+            start = time.time()
+            path = self._path(model_id, weight_fingerprint(model))
+            entries = self._read(path)
+            if entries is not None:
+                logger.info("Weight stats for %s loaded from %s", model_id, path)
+            else:
+                entries = compute_weight_stats(model)
+                self._write(path, model_id, entries)
+                logger.info(
+                    "Weight stats for %s: %d tensors computed in %.1fms",
+                    model_id,
+                    len(entries),
+                    (time.time() - start) * 1000,
+                )
+            self._loaded[model] = entries
+            return entries
+
+    def warm(self, model_id: str, model) -> None:
+        """Background entry point: populate the store, never raise."""
+        try:
+            self.get(model_id, model)
+        except Exception:
+            logger.exception("Precomputing weight stats for %s failed", model_id)
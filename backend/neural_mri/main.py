@@ -1,9 +1,10 @@
 from __future__ import annotations
 
 import logging
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import ORJSONResponse
 
@@ -19,10 +20,19 @@ from neural_mri.api.routes_settings import router as settings_router
 from neural_mri.api.ws_collab import router as ws_collab_router
 from neural_mri.api.ws_stream import router as ws_router
 from neural_mri.config import Settings
+from neural_mri.core.activation_store import ActivationStore
+from neural_mri.core.load_jobs import LoadJobManager
+from neural_mri.core.micro_batch import MicroBatcher
 from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.model_snapshot import ModelSnapshotStore
 from neural_mri.core.sae_manager import SAEManager
 from neural_mri.core.scan_cache import ScanCache
+from neural_mri.core.scan_store import ScanDiskStore
+from neural_mri.core.scheduler import InferenceScheduler
 from neural_mri.core.session_manager import SessionManager
+from neural_mri.core.single_flight import SingleFlight
+from neural_mri.core.warmup import schedule_warm_up
+from neural_mri.core.weight_stats import WeightStatsStore
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s [%(name)s] %(levelname)s: %(message)s")
 logger = logging.getLogger(__name__)
@@ -31,27 +41,99 @@ settings = Settings()
 
 # Propagate HF token to huggingface_hub so gated models can be downloaded
 if settings.hf_token:
-    import os
-
     os.environ.setdefault("HF_TOKEN", settings.hf_token)
     logger.info("HuggingFace token configured for gated model access.")
 
-model_manager = ModelManager()
+cache_root = settings.model_cache_dir or "~/.cache/neural_mri"
+# All model execution goes through one prioritized worker
+scheduler = InferenceScheduler(intra_op_threads=settings.inference_threads)
+model_manager = ModelManager(
+    budget_gb=settings.model_pool_budget_gb,
+    max_models=settings.model_pool_max_models,
+    snapshots=(
+        ModelSnapshotStore(os.path.join(cache_root, "snapshots"))
+        if settings.model_snapshots
+        else None
+    ),
+    # Load jobs run in their own threads and block on the worker
+    run_job=lambda fn, *args: scheduler.submit(fn, *args).result(),
+)
+load_jobs = LoadJobManager(model_manager)
+# Concurrent fMRI/FLAIR scans of one model share a forward pass
+batcher = MicroBatcher(
+    scheduler, window_ms=settings.micro_batch_window_ms, max_batch=settings.micro_batch_max
+)
+# Identical concurrent scans await one shared computation
+single_flight = SingleFlight()
 sae_manager = SAEManager()
-scan_cache = ScanCache(max_entries=settings.max_cache_entries)
+scan_cache = ScanCache(
+    budget_bytes=settings.scan_cache_budget_mb * 1024 * 1024,
+    mode_quota=settings.scan_cache_mode_quota,
+    admit_fraction=settings.scan_cache_admit_fraction,
+    # Second tier shared by workers on this host; survives restarts and evictions
+    disk=(
+        ScanDiskStore(
+            os.path.join(cache_root, "scans"),
+            budget_bytes=settings.scan_disk_cache_mb * 1024 * 1024,
+        )
+        if settings.scan_disk_cache
+        else None
+    ),
+    fingerprint=model_manager.fingerprint,
+)
+# Raw activations of recent prompts, reused when another scan mode follows
+activation_store = (
+    ActivationStore(
+        settings.activation_store_mb * 1024 * 1024,
+        half=settings.activation_store_fp16,
+        ttl_s=settings.activation_store_ttl_s,
+    )
+    if settings.activation_store_mb > 0
+    else None
+)
 session_manager = SessionManager()
+# Drop an evicted model's SAE and cached scans along with it
+model_manager.add_eviction_listener(sae_manager.unload_if_model)
+model_manager.add_eviction_listener(scan_cache.invalidate_model)
+if activation_store is not None:
+    model_manager.add_eviction_listener(activation_store.invalidate_model)
+weight_stats = WeightStatsStore(
+    settings.weight_stats_dir or os.path.join(cache_root, "weight_stats")
+)
+
+
+def _after_startup_load(info) -> None:
+    # Precompute T2 weight stats and warm up once nothing more urgent is queued
+    with model_manager.bind(info.model_id):
+        model = model_manager.get_model()
+    scheduler.submit(weight_stats.warm, info.model_id, model, priority="background")
+    if settings.warmup_seq_lens or settings.compile_forward:
+        schedule_warm_up(scheduler, model, settings.warmup_seq_lens, settings.compile_forward)
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     # Startup: pre-load default model
+    app.state.startup_job = None
     if settings.default_model:
         logger.info("Loading default model: %s", settings.default_model)
-        model_manager.load_model(settings.default_model, device=settings.device)
+        if settings.fast_start:
+            # Accept connections right away; /api/ready turns 200 once the model is in
+            app.state.startup_job = load_jobs.submit(
+                settings.default_model,
+                settings.device,
+                on_ready=_after_startup_load,
+                precision=settings.precision,
+            )
+        else:
+            info = model_manager.load_model(
+                settings.default_model, device=settings.device, precision=settings.precision
+            )
+            _after_startup_load(info)
     yield
     # Shutdown: free GPU memory
     sae_manager.unload()
-    model_manager.unload_model()
+    model_manager.unload_all()
     logger.info("Neural MRI Scanner shut down.")
 
 
@@ -83,6 +165,38 @@ app.include_router(ws_router, tags=["websocket"])
 app.include_router(ws_collab_router, tags=["websocket"])
 
 
+@app.get("/api/scheduler")
+async def scheduler_stats() -> dict:
+    """Inference queue depth and wait times per priority class, plus request coalescing."""
+    return {
+        **scheduler.stats(),
+        "micro_batch": batcher.stats(),
+        "single_flight": single_flight.stats(),
+        "activation_store": activation_store.stats() if activation_store is not None else None,
+    }
+
+
+@app.get("/api/ready")
+async def ready(request: Request):
+    """Readiness probe: 200 once a model is resident, 503 before that.
+
+    A failed or cancelled startup load stays 503 (with the job's error)
+    until a model is loaded some other way.
+    """
+    job = getattr(request.app.state, "startup_job", None)
+    startup = job.info().model_dump() if job is not None else None
+    if not model_manager.resident_models:
+        reason = "no model loaded"
+        if job is not None and not job.done:
+            reason = "startup load running"
+        elif job is not None and job.status in ("failed", "cancelled"):
+            reason = f"startup load {job.status}"
+        return ORJSONResponse(
+            status_code=503, content={"ready": False, "reason": reason, "startup": startup}
+        )
+    return {"ready": True, "model_id": model_manager.model_id, "startup": startup}
+
+
 @app.get("/")
 async def root():
     return {
@@ -102,3 +102,5 @@ class BatteryRunRequest(BaseModel):
     locale: str = "en"
     include_sae: bool = False
     sae_layer: int | None = None
+    model_id: str | None = None  # None = the active model
+    precision: str | None = None  # None = as loaded | "bf16" (autocast)
@@ -7,6 +7,10 @@ class CausalTraceRequest(BaseModel):
     clean_prompt: str
     corrupt_prompt: str
     target_token_idx: int = -1  # default: last token
+    method: str = "exact"  # "exact" (patch each component) | "attribution" (gradient estimate)
+    head_level: bool = False  # attribution only: per-head recovery map
+    position_level: bool = False  # attribution only: per-token recovery per component
+    model_id: str | None = None  # None = the active model
 
 
 class CausalTraceCell(BaseModel):
@@ -14,6 +18,7 @@ class CausalTraceCell(BaseModel):
     layer_idx: int  # -1 for embed
     component_type: str  # "attn" | "mlp" | "embed"
     recovery_score: float  # 0-1
+    position_scores: list[float] | None = None  # per corrupt-prompt token, attribution only
 
 
 class CausalTraceResult(BaseModel):
@@ -25,4 +30,7 @@ class CausalTraceResult(BaseModel):
     corrupt_prediction: str
     cells: list[CausalTraceCell]
     n_layers: int
+    method: str = "exact"
+    tokens: list[str] | None = None  # corrupt prompt tokens, set with position_level
+    head_scores: list[list[float]] | None = None  # [n_layers][n_heads], set with head_level
     metadata: dict
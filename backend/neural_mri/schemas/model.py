@@ -6,6 +6,7 @@ from pydantic import BaseModel
 class ModelLoadRequest(BaseModel):
     model_id: str = "gpt2"
     device: str = "auto"
+    precision: str = "auto"  # "auto" | "fp32" | "bf16"
 
 
 class LayerConfig(BaseModel):
@@ -18,6 +19,14 @@ class LayerConfig(BaseModel):
     d_mlp: int
 
 
+class FidelityReport(BaseModel):
+    mode: str  # "bf16" (bf16 copy of resident fp32 weights) | "bf16-autocast" (per request)
+    probe_prompt: str
+    max_abs_activation_delta: float  # max |fp32 - reduced| over all residual streams
+    rel_activation_delta: float  # the above / max |fp32 residual|
+    top1_agreement: float  # fraction of probe positions with the same argmax token
+
+
 class ModelInfo(BaseModel):
     model_id: str
     model_name: str
@@ -32,3 +41,17 @@ class ModelInfo(BaseModel):
     device: str
     layers: list[LayerConfig]
     dtype: str
+    fidelity: list[FidelityReport] = []
+
+
+class LoadJobInfo(BaseModel):
+    job_id: str
+    model_id: str
+    device: str
+    status: str  # "queued" | "running" | "done" | "failed" | "cancelled"
+    phase: str  # "queued" | "download" | "convert" | "ready"
+    bytes_done: int = 0
+    bytes_total: int = 0  # 0 = unknown (e.g. restored from a local snapshot)
+    error: str | None = None
+    result: ModelInfo | None = None
+    elapsed_ms: float = 0.0
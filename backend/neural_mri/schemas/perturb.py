@@ -8,17 +8,20 @@ from pydantic import BaseModel
 class ZeroOutRequest(BaseModel):
     component: str  # e.g. "blocks.3.attn", "blocks.5.mlp"
     prompt: str
+    model_id: str | None = None  # None = the active model
 
 
 class AmplifyRequest(BaseModel):
     component: str
     factor: float = 2.0
     prompt: str
+    model_id: str | None = None  # None = the active model
 
 
 class AblateRequest(BaseModel):
     component: str  # mean ablation target
     prompt: str
+    model_id: str | None = None  # None = the active model
 
 
 class PatchRequest(BaseModel):
@@ -26,6 +29,7 @@ class PatchRequest(BaseModel):
     corrupt_prompt: str
     component: str
     target_token_idx: int = -1
+    model_id: str | None = None  # None = the active model
 
 
 # --- Response Models ---
@@ -41,3 +41,4 @@ class ReportRequest(BaseModel):
     cached_battery: dict | None = None
     cached_sae: dict | None = None
     locale: str = "en"
+    model_id: str | None = None  # None = the active model
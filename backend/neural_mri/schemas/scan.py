@@ -1,12 +1,14 @@
 from __future__ import annotations
 
-from pydantic import BaseModel
+from typing import Any
+
+from pydantic import BaseModel, PrivateAttr
 
 # --- T1: Structural Scan ---
 
 
 class StructuralScanRequest(BaseModel):
-    pass
+    model_id: str | None = None  # None = the active model
 
 
 class LayerStructure(BaseModel):
@@ -37,6 +39,7 @@ class StructuralData(BaseModel):
 
 class WeightScanRequest(BaseModel):
     layers: list[str] | None = None  # None = all layers
+    model_id: str | None = None  # None = the active model
 
 
 class LayerWeightStats(BaseModel):
@@ -66,6 +69,8 @@ class ActivationScanRequest(BaseModel):
     prompt: str
     layers: list[str] | None = None  # None = all layers
     aggregation: str = "l2"  # "l2" | "mean"
+    model_id: str | None = None  # None = the active model
+    precision: str | None = None  # None = as loaded | "bf16" (autocast)
 
 
 class LayerActivation(BaseModel):
@@ -88,6 +93,10 @@ class ActivationData(BaseModel):
 class CircuitScanRequest(BaseModel):
     prompt: str
     target_token_idx: int = -1  # which output token to trace (-1 = last)
+    # "exact" (zero-ablation, L2 change of the target logits) |
+    # "attribution" (gradient estimate of the top-1 log-prob change; a different metric)
+    method: str = "exact"
+    model_id: str | None = None  # None = the active model
 
 
 class PathwayConnection(BaseModel):
@@ -117,14 +126,22 @@ class CircuitData(BaseModel):
     connections: list[PathwayConnection]
     components: list[ComponentImportance]
     attention_heads: list[AttentionHead]
+    method: str = "exact"
+    importance_metric: str = "logit_l2"  # "logit_l2" (exact) | "top1_logprob" (attribution)
+    head_importances: list[list[float]] | None = None  # [n_layers][n_heads], attribution only
     metadata: dict
 
+    # Stacked CPU tensors backing list fields, keyed by tensor-codec path (not serialized)
+    _tensors: dict[str, Any] = PrivateAttr(default_factory=dict)
+
 
 # --- FLAIR: Anomaly Scan ---
 
 
 class AnomalyScanRequest(BaseModel):
     prompt: str
+    model_id: str | None = None  # None = the active model
+    precision: str | None = None  # None = as loaded | "bf16" (autocast)
 
 
 class TokenPredictionLens(BaseModel):
@@ -155,6 +172,7 @@ class SAEScanRequest(BaseModel):
     prompt: str
     layer_idx: int
     top_k: int = 20
+    model_id: str | None = None  # None = the active model
 
 
 class SAEFeatureInfo(BaseModel):
@@ -184,3 +202,28 @@ class SAEData(BaseModel):
     heatmap_feature_indices: list[int]  # union of active features across all tokens
     heatmap_values: list[list[float]]  # [n_tokens][n_features]
     metadata: dict
+
+
+# --- Fused: single-pass multi-modality scan ---
+
+
+class FusedScanRequest(BaseModel):
+    prompt: str
+    modes: list[str] = ["fMRI", "DTI", "FLAIR"]  # any of "fMRI" | "DTI" | "FLAIR" | "SAE"
+    target_token_idx: int = -1  # DTI target token (-1 = last)
+    sae_layer_idx: int | None = None  # None = middle SAE layer
+    sae_top_k: int = 20
+    model_id: str | None = None  # None = the active model
+    precision: str | None = None  # None = as loaded | "bf16" (autocast)
+
+
+class FusedScanData(BaseModel):
+    model_id: str
+    scan_mode: str = "fused"
+    prompt: str
+    modes: list[str]
+    activation: ActivationData | None = None
+    circuits: CircuitData | None = None
+    anomaly: AnomalyData | None = None
+    sae: SAEData | None = None
+    metadata: dict
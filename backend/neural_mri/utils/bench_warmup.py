@@ -0,0 +1,121 @@
+"""First-request and steady-state scan latency, with and without warm-up.
+
+Each configuration runs in a fresh interpreter, because allocator and
+kernel warm-up are per process. A "request" is what an fMRI scan does (a
+cached forward with the fMRI hook plan). The hook-free forward, the only
+path ``compile_forward`` changes (the battery's bias comparison), is
+timed separately::
+
+    python -m neural_mri.utils.bench_warmup --model gpt2
+    python -m neural_mri.utils.bench_warmup --model gpt2 --configs cold warm compiled --json
+
+Configurations: ``cold`` (load, then serve), ``warm`` (load, ``warm_up``,
+then serve) and ``compiled`` (as ``warm`` with the compiled forward).
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import statistics
+import subprocess
+import sys
+import time
+
+CONFIGS = ("cold", "warm", "compiled")
+
+PROMPT = "The Eiffel Tower is located in the city of"
+
+
+def _run_config(model_id: str, config: str, device: str, repeats: int) -> dict:
+    import torch
+    from transformer_lens import HookedTransformer
+
+    from neural_mri.core.hook_plan import plan_for_mode
+    from neural_mri.core.warmup import forward, warm_up
+
+    model = HookedTransformer.from_pretrained(model_id, device=device)
+    model.eval()
+    plan = plan_for_mode("fMRI", model.cfg.n_layers)
+
+    warmup_ms = 0.0
+    if config != "cold":
+        start = time.perf_counter()
+        warm_up(model, compile=config == "compiled")
+        warmup_ms = (time.perf_counter() - start) * 1000
+
+    tokens = model.to_tokens(PROMPT)
+
+    def request() -> float:
+        start = time.perf_counter()
+        with torch.no_grad():
+            model.run_with_cache(tokens, names_filter=plan)
+        return (time.perf_counter() - start) * 1000
+
+    def hook_free() -> float:
+        start = time.perf_counter()
+        with torch.no_grad():
+            forward(model, tokens)
+        return (time.perf_counter() - start) * 1000
+
+    first = request()
+    steady = [request() for _ in range(repeats)]
+    plain = [hook_free() for _ in range(repeats)]
+    return {
+        "config": config,
+        "warmup_ms": round(warmup_ms, 1),
+        "first_request_ms": round(first, 2),
+        "steady_p50_ms": round(statistics.median(steady), 2),
+        "steady_min_ms": round(min(steady), 2),
+        "hook_free_p50_ms": round(statistics.median(plain), 2),
+    }
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--model", default="gpt2")
+    parser.add_argument("--device", default="cpu")
+    parser.add_argument("--configs", nargs="+", choices=CONFIGS, default=list(CONFIGS))
+    parser.add_argument("--repeats", type=int, default=20)
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    parser.add_argument("--single", choices=CONFIGS, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.single:
+        print(json.dumps(_run_config(args.model, args.single, args.device, args.repeats)))
+        return
+
+    results = []
+    for config in args.configs:
+        cmd = [
+            sys.executable,
+            "-m",
+            "neural_mri.utils.bench_warmup",
+            "--model",
+            args.model,
+            "--device",
+            args.device,
+            "--repeats",
+            str(args.repeats),
+            "--single",
+            config,
+        ]
+        proc = subprocess.run(cmd, capture_output=True, text=True, check=True)
+        results.append(json.loads(proc.stdout.strip().splitlines()[-1]))
+
+    if args.json:
+        print(json.dumps({"model": args.model, "device": args.device, "results": results}))
+        return
+    print(f"{args.model} on {args.device} ({args.repeats} steady-state requests)")
+    print(
+        f"{'config':<10}{'warm-up':>12}{'first':>12}{'p50':>10}{'min':>10}{'hook-free':>12}  (ms)"
+    )
+    for r in results:
+        print(
+            f"{r['config']:<10}{r['warmup_ms']:>12}{r['first_request_ms']:>12}"
+            f"{r['steady_p50_ms']:>10}{r['steady_min_ms']:>10}{r['hook_free_p50_ms']:>12}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+"""Import-time profile of the backend, per module and per top-level package.
+
+Runs ``python -X importtime -c "import <module>"`` in a fresh interpreter
+and aggregates the report, so startup regressions (a heavy library pulled
+in eagerly again) show up as numbers that can be tracked over time::
+
+    python -m neural_mri.utils.import_profile                 # neural_mri.main
+    python -m neural_mri.utils.import_profile --top 30 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import subprocess
+import sys
+from collections import defaultdict
+
+
+def profile_imports(module: str = "neural_mri.main") -> list[dict]:
+    """Self and cumulative import time (ms) of every module ``module`` imports."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        capture_output=True,
+        text=True,
+    )
+    if proc.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{proc.stderr[-2000:]}")
+
+    rows = []
+    for line in proc.stderr.splitlines():
+        # "import time:       self [us] |  cumulative | imported package"
+        if not line.startswith("import time:") or "[us]" in line:
+            continue
+        self_us, cumulative_us, name = line.removeprefix("import time:").split("|", 2)
+        rows.append(
+            {
+                "module": name.strip(),
+                "self_ms": int(self_us) / 1000,
+                "cumulative_ms": int(cumulative_us) / 1000,
+            }
+        )
+    return rows
+
+
+def by_package(rows: list[dict]) -> dict[str, float]:
+    """Total self time (ms) per top-level package, slowest first."""
+    totals: dict[str, float] = defaultdict(float)
+    for row in rows:
+        totals[row["module"].split(".")[0]] += row["self_ms"]
+    return dict(sorted(totals.items(), key=lambda kv: kv[1], reverse=True))
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("module", nargs="?", default="neural_mri.main")
+    parser.add_argument("--top", type=int, default=20, help="modules/packages to list")
+    parser.add_argument("--json", action="store_true", help="machine-readable output")
+    args = parser.parse_args()
+
+    rows = profile_imports(args.module)
+    packages = by_package(rows)
+    total_ms = sum(row["self_ms"] for row in rows)
+    slowest = sorted(rows, key=lambda r: r["self_ms"], reverse=True)[: args.top]
+
+    if args.json:
+        report = {
+            "module": args.module,
+            "total_ms": round(total_ms, 1),
+            "packages": {name: round(ms, 1) for name, ms in list(packages.items())[: args.top]},
+            "modules": slowest,
+        }
+        print(json.dumps(report, indent=2))
+        return
+
+    print(f"import {args.module}: {total_ms:.1f} ms total, {len(rows)} modules")
+    print("\nby package (self time):")
+    for name, ms in list(packages.items())[: args.top]:
+        print(f"  {ms:9.1f} ms  {name}")
+    print("\nslowest modules (self time):")
+    for row in slowest:
+        print(f"  {row['self_ms']:9.1f} ms  {row['module']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,151 @@
+"""Compact binary encoding for scan results with large numeric matrices.
+
+Attention patterns, SAE heatmaps and anomaly maps dominate scan payloads as
+nested JSON float lists. This codec moves selected fields into packed
+little-endian buffers and leaves everything else in a JSON header::
+
+    b"NMRT" | u16 version | u16 reserved | u32 header_len | header | buffers
+
+``header`` is UTF-8 JSON ``{"meta": <result with tensor fields set to
+null>, "tensors": [{"path", "dtype", "shape", "offset", "nbytes", ...}]}``,
+space-padded so the buffer section starts 8-byte aligned; ``offset`` is
+relative to the buffer section. ``dtype`` is ``"f16"`` (IEEE half) or
+``"u8"`` (affine-quantized: ``value = q * scale + zero``).
+
+Field paths are dotted keys where ``name[]`` maps over a list, e.g.
+``"attention_heads[].pattern"`` stacks every head's pattern into one
+``[n_heads_total, seq, seq]`` tensor in list order.
+"""
+
+from __future__ import annotations
+
+import struct
+from collections.abc import Iterable, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+import numpy as np
+import orjson
+
+from neural_mri.utils.serialization import dumps
+
+MEDIA_TYPE = "application/x-nmri-tensor"
+MAGIC = b"NMRT"
+VERSION = 1
+_PREFIX = struct.Struct("<4sHHI")
+_ALIGN = 8
+
+
+@dataclass(frozen=True)
+class TensorField:
+    path: str
+    dtype: str = "f16"  # "f16" | "u8"
+
+
+def _detach(obj: Any, parts: list[str]) -> tuple[Any, Any]:
+    """Copy ``obj`` along ``parts`` with the leaf set to None; return (copy, leaf).
+
+    Only the containers on the path are copied, so cached result dicts are
+    never mutated.
+    """
+    if obj is None:
+        return None, None
+    head, rest = parts[0], parts[1:]
+    obj = dict(obj)
+    if head.endswith("[]"):
+        key = head[:-2]
+        pairs = [_detach(item, rest) for item in obj.get(key) or []]
+        obj[key] = [item for item, _ in pairs]
+        return obj, [leaf for _, leaf in pairs]
+    if not rest:
+        leaf = obj.get(head)
+        obj[head] = None
+        return obj, leaf
+    obj[head], leaf = _detach(obj.get(head), rest)
+    return obj, leaf
+
+
+def _pack(values: Any, dtype: str) -> tuple[np.ndarray, dict]:
+    arr = np.asarray(values, dtype=np.float32)
+    if dtype == "f16":
+        return arr.astype("<f2"), {}
+    if dtype == "u8":
+        lo = float(arr.min()) if arr.size else 0.0
+        hi = float(arr.max()) if arr.size else 0.0
+        scale = (hi - lo) / 255 if hi > lo else 1.0
+        packed = np.rint((arr - lo) / scale).astype(np.uint8)
+        return packed, {"scale": scale, "zero": lo}
+    raise ValueError(f"Unknown tensor dtype: {dtype}")
+
+
+def _pad(n: int) -> int:
+    return -n % _ALIGN
+
+
+def encode(
+    data: dict,
+    fields: Iterable[TensorField],
+    tensors: Mapping[str, Any] | None = None,
+) -> bytes:
+    """Encode a result dict, moving ``fields`` into binary buffers.
+
+    ``tensors`` optionally maps a field path to an array-like (CPU tensor or
+    ndarray) already holding the stacked values, which is used instead of
+    converting the nested lists. Fields whose value is missing are skipped.
+    """
+    tensors = tensors or {}
+    meta = data
+    entries: list[dict] = []
+    buffers: list[memoryview] = []
+    offset = 0
+    for field in fields:
+        meta, leaf = _detach(meta, field.path.split("."))
+        values = tensors.get(field.path, leaf)
+        if values is None:
+            continue
+        packed, extra = _pack(values, field.dtype)
+        entries.append(
+            {
+                "path": field.path,
+                "dtype": field.dtype,
+                "shape": list(packed.shape),
+                "offset": offset,
+                "nbytes": packed.nbytes,
+                **extra,
+            }
+        )
+        buffers.append(memoryview(np.ascontiguousarray(packed)).cast("B"))
+        pad = _pad(packed.nbytes)
+        if pad:
+            buffers.append(memoryview(bytes(pad)))
+        offset += packed.nbytes + pad
+
+    header = dumps({"meta": meta, "tensors": entries})
+    header += b" " * _pad(_PREFIX.size + len(header))
+    prefix = _PREFIX.pack(MAGIC, VERSION, 0, len(header))
+    return b"".join([prefix, header, *buffers])
+
+
+def decode(buf: bytes) -> tuple[dict, dict[str, np.ndarray]]:
+    """Inverse of ``encode``: (meta, {path: float32 array})."""
+    magic, version, _, header_len = _PREFIX.unpack_from(buf)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError("Not an NMRT v1 tensor payload")
+    start = _PREFIX.size
+    header = orjson.loads(buf[start : start + header_len])
+    data_start = start + header_len
+
+    arrays: dict[str, np.ndarray] = {}
+    for entry in header["tensors"]:
+        np_dtype = "<f2" if entry["dtype"] == "f16" else np.uint8
+        arr = np.frombuffer(
+            buf,
+            dtype=np_dtype,
+            count=int(np.prod(entry["shape"])),
+            offset=data_start + entry["offset"],
+        ).reshape(entry["shape"])
+        arr = arr.astype(np.float32)
+        if entry["dtype"] == "u8":
+            arr = arr * entry["scale"] + entry["zero"]
+        arrays[entry["path"]] = arr
+    return header["meta"], arrays
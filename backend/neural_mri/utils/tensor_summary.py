@@ -1,21 +1,53 @@
 from __future__ import annotations
 
+import math
+
 import torch
 
+# Elements per float32 working chunk (16 MB); bounds memory for huge W_E / W_U matrices
+_CHUNK_ELEMS = 1 << 22
+
+
+def tensor_stats(tensor: torch.Tensor, bins: int = 20, chunk_elems: int = _CHUNK_ELEMS) -> dict:
+    """Compute summary statistics for a weight tensor.
+
+    Streams over flat chunks in two passes (moments/extrema, then histogram
+    and outliers, which need the range and mean/std), so at most one chunk
+    is ever upcast to float32.
+    """
+    flat = tensor.detach().reshape(-1)
+    n = flat.numel()
+
+    total = 0.0
+    total_sq = 0.0
+    lo = math.inf
+    hi = -math.inf
+    for offset in range(0, n, chunk_elems):
+        chunk = flat[offset : offset + chunk_elems].float()
+        total += chunk.sum(dtype=torch.float64).item()
+        total_sq += (chunk * chunk).sum(dtype=torch.float64).item()
+        lo = min(lo, chunk.min().item())
+        hi = max(hi, chunk.max().item())
+
+    mean = total / n
+    # Unbiased, matching torch.std
+    std = math.sqrt(max(total_sq - n * mean * mean, 0.0) / (n - 1)) if n > 1 else math.nan
 
-def tensor_stats(tensor: torch.Tensor, bins: int = 20) -> dict:
-    """Compute summary statistics for a weight tensor."""
-    t = tensor.float().detach()
-    std = t.std().item()
-    mean = t.mean().item()
+    threshold = abs(mean) + 3 * std
+    histogram = torch.zeros(bins, dtype=torch.float64)
+    num_outliers = 0
+    for offset in range(0, n, chunk_elems):
+        chunk = flat[offset : offset + chunk_elems].float()
+        histogram += torch.histc(chunk.cpu(), bins=bins, min=lo, max=hi).double()
+        num_outliers += int((chunk.abs() > threshold).sum().item())
 
     return {
         "mean": mean,
         "std": std,
-        "min_val": t.min().item(),
-        "max_val": t.max().item(),
-        "l2_norm": t.norm().item(),
-        "shape": list(t.shape),
-        "num_outliers": int((t.abs() > abs(mean) + 3 * std).sum().item()),
-        "histogram": torch.histc(t.cpu(), bins=bins).tolist(),
+        "min_val": lo,
+        "max_val": hi,
+        "l2_norm": math.sqrt(total_sq),
+        "shape": list(tensor.shape),
+        "num_outliers": num_outliers,
+        "histogram": histogram.tolist(),
     }
@@ -82,7 +82,10 @@ def mock_model(mock_cfg):
     logits = torch.randn(1, SEQ_LEN, cfg.d_vocab)
     model.run_with_cache = MagicMock(return_value=(logits, cache))
     model.return_value = logits
-    model.run_with_hooks = MagicMock(return_value=logits)
+    # Batched ablation replicates the prompt along dim 0; mirror the batch size
+    model.run_with_hooks = MagicMock(
+        side_effect=lambda x, **kw: torch.randn(x.shape[0], SEQ_LEN, cfg.d_vocab)
+    )
 
     sd = {}
     for i in range(cfg.n_layers):
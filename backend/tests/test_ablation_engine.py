@@ -0,0 +1,62 @@
+"""Tests for AblationEngine — batched zero-ablation."""
+
+import torch
+
+from neural_mri.core.ablation_engine import AblationEngine
+from neural_mri.core.hook_plan import component_hook_points
+
+
+def test_zero_hook_only_touches_assigned_rows():
+    hook = AblationEngine._make_zero_hook([1, 3])
+    value = torch.ones(4, 3, 8)
+    out = hook(value, None)
+    assert out[1].abs().sum() == 0
+    assert out[3].abs().sum() == 0
+    assert torch.all(out[0] == 1)
+    assert torch.all(out[2] == 1)
+
+
+def test_one_importance_per_component(mock_model):
+    engine = AblationEngine(mock_model, budget_mb=256)
+    tokens = mock_model.to_tokens("test")
+    logits = torch.randn(1, tokens.shape[1], mock_model.cfg.d_vocab)
+    hooks = [name for _, name in component_hook_points(mock_model.cfg.n_layers)]
+
+    importances = engine.zero_ablation_importance(tokens, logits, hooks, target_idx=-1)
+    assert len(importances) == len(hooks)
+    assert all(v >= 0 for v in importances)
+    # Everything fits in one batch under a generous budget
+    assert mock_model.run_with_hooks.call_count == 1
+    batch = mock_model.run_with_hooks.call_args.args[0]
+    assert batch.shape[0] == len(hooks)
+
+
+def test_chunking_by_budget(mock_model, monkeypatch):
+    engine = AblationEngine(mock_model, budget_mb=1)
+    monkeypatch.setattr(engine, "chunk_size", lambda seq_len: 2)
+    tokens = mock_model.to_tokens("test")
+    logits = torch.randn(1, tokens.shape[1], mock_model.cfg.d_vocab)
+    hooks = [name for _, name in component_hook_points(mock_model.cfg.n_layers)]
+
+    importances = engine.zero_ablation_importance(tokens, logits, hooks, target_idx=0)
+    assert len(importances) == 5
+    assert mock_model.run_with_hooks.call_count == 3  # ceil(5 / 2)
+
+
+def test_chunk_size_at_least_one(mock_model):
+    engine = AblationEngine(mock_model, budget_mb=0)
+    assert engine.chunk_size(10_000) == 1
+
+
+def test_chunks_resume_from_cached_layer(mock_model, monkeypatch):
+    engine = AblationEngine(mock_model, budget_mb=1)
+    monkeypatch.setattr(engine, "chunk_size", lambda seq_len: 2)
+    tokens = mock_model.to_tokens("test")
+    logits, cache = mock_model.run_with_cache(tokens)
+    hooks = [name for _, name in component_hook_points(mock_model.cfg.n_layers)]
+
+    importances = engine.zero_ablation_importance(tokens, logits, hooks, 0, resume_cache=cache)
+    assert len(importances) == 5
+    starts = [c.kwargs.get("start_at_layer") for c in mock_model.run_with_hooks.call_args_list]
+    # [embed, 0.attn] from tokens, [0.mlp, 1.attn] from layer 0, [1.mlp] from layer 1
+    assert starts == [None, 0, 1]
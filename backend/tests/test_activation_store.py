@@ -0,0 +1,109 @@
+"""Tests for the cross-mode activation store."""
+
+import time
+import types
+
+import torch
+
+from neural_mri.core.activation_store import ActivationStore, shared_plan
+from neural_mri.core.analysis_engine import AnalysisEngine
+from neural_mri.core.hook_plan import HookPlan
+from neural_mri.schemas.scan import (
+    ActivationScanRequest,
+    AnomalyScanRequest,
+    CircuitScanRequest,
+)
+
+_MODEL = types.SimpleNamespace(cfg=types.SimpleNamespace(device="cpu", dtype="float32"))
+
+
+def _entry(seq_len=4):
+    logits = torch.randn(1, seq_len, 10)
+    cache = {"a": torch.randn(1, seq_len, 8), "b": torch.randn(1, seq_len, 8)}
+    return logits, cache
+
+
+def _key(ids=(1, 2, 3, 4), model_id="gpt2"):
+    return ActivationStore.key(model_id, _MODEL, torch.tensor([ids]))
+
+
+def test_get_requires_covering_plan():
+    store = ActivationStore(budget_bytes=1 << 20)
+    logits, cache = _entry()
+    store.put(_key(), HookPlan.of("a"), logits, cache)
+
+    hit = store.get(_key(), HookPlan.of("a"))
+    assert hit is not None
+    assert torch.equal(hit[0], logits)
+    assert set(hit[1]) == {"a"}  # only the plan's hooks are kept
+    assert store.get(_key(), HookPlan.of("a", "b")) is None
+    assert store.get(_key(ids=(1, 2, 3)), HookPlan.of("a")) is None
+    assert store.stats()["hits"] == 1
+
+
+def test_put_copies_batch_views():
+    store = ActivationStore(budget_bytes=1 << 20)
+    batch_logits, batch_cache = _entry()
+    store.put(_key(), HookPlan.of("a"), batch_logits[:, :2], {"a": batch_cache["a"][:, :2]})
+    batch_logits.zero_()
+    logits, _ = store.get(_key(), HookPlan.of("a"))
+    assert logits.shape == (1, 2, 10)
+    assert logits.abs().sum() > 0
+
+
+def test_entries_expire():
+    store = ActivationStore(budget_bytes=1 << 20, ttl_s=0.01)
+    store.put(_key(), HookPlan.of("a"), *_entry())
+    time.sleep(0.02)
+    assert store.get(_key(), HookPlan.of("a")) is None
+    assert store.stats()["entries"] == 0
+
+
+def test_budget_evicts_least_recently_used():
+    logits, cache = _entry()
+    size = (logits.numel() + cache["a"].numel()) * 4
+    store = ActivationStore(budget_bytes=2 * size)
+    plan = HookPlan.of("a")
+    store.put(_key((1,)), plan, logits, cache)
+    store.put(_key((2,)), plan, logits, cache)
+    assert store.get(_key((1,)), plan) is not None  # (2,) is now least recent
+    store.put(_key((3,)), plan, logits, cache)
+    assert store.get(_key((2,)), plan) is None
+    assert store.get(_key((1,)), plan) is not None
+    assert store.stats()["bytes"] <= 2 * size
+
+
+def test_invalidate_model():
+    store = ActivationStore(budget_bytes=1 << 20)
+    store.put(_key(model_id="gpt2"), HookPlan.of("a"), *_entry())
+    store.put(_key(model_id="pythia"), HookPlan.of("a"), *_entry())
+    store.invalidate_model("gpt2")
+    assert store.get(_key(model_id="gpt2"), HookPlan.of("a")) is None
+    assert store.get(_key(model_id="pythia"), HookPlan.of("a")) is not None
+
+
+def test_half_storage_restores_dtype():
+    store = ActivationStore(budget_bytes=1 << 20, half=True)
+    logits, cache = _entry()
+    store.put(_key(), HookPlan.of("a", "b"), logits, cache)
+    assert store.stats()["bytes"] == (logits.numel() + 2 * cache["a"].numel()) * 2
+    hit_logits, hit_cache = store.get(_key(), HookPlan.of("a"))
+    assert hit_logits.dtype == torch.float32
+    assert hit_cache["a"].dtype == torch.float32
+    torch.testing.assert_close(hit_cache["a"], cache["a"], atol=1e-2, rtol=1e-2)
+
+
+def test_second_mode_reuses_forward_pass(mock_model_manager, mock_model):
+    store = ActivationStore(budget_bytes=1 << 24)
+    engine = AnalysisEngine(mock_model_manager, activations=store)
+
+    engine.scan_activation(ActivationScanRequest(prompt="test"))
+    names_filter = mock_model.run_with_cache.call_args.kwargs["names_filter"]
+    assert names_filter.covers(shared_plan(mock_model.cfg.n_layers))
+    engine.scan_anomaly(AnomalyScanRequest(prompt="test"))
+    engine.scan_circuits(CircuitScanRequest(prompt="test"))
+    assert mock_model.run_with_cache.call_count == 1
+
+    engine.scan_activation(ActivationScanRequest(prompt="another prompt"))
+    assert mock_model.run_with_cache.call_count == 2
+    assert store.stats()["hits"] == 2
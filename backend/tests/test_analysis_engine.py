@@ -1,5 +1,7 @@
 """Tests for AnalysisEngine — mock model scans."""
 
+import pytest
+
 from neural_mri.core.analysis_engine import AnalysisEngine
 
 
@@ -50,3 +52,184 @@ def test_scan_anomaly_layer_count(mock_model_manager):
 
     data = engine.scan_anomaly(AnomalyScanRequest(prompt="test"))
     assert len(data.layers) == 2  # n_layers=2
+
+
+def test_scan_activation_passes_hook_plan(mock_model_manager, mock_model):
+    engine = AnalysisEngine(mock_model_manager)
+    from neural_mri.schemas.scan import ActivationScanRequest
+
+    engine.scan_activation(ActivationScanRequest(prompt="test"))
+    names_filter = mock_model.run_with_cache.call_args.kwargs["names_filter"]
+    assert names_filter("blocks.0.attn.hook_z")
+    assert not names_filter("blocks.0.attn.hook_pattern")
+
+
+def test_scan_fused_single_forward(mock_model_manager, mock_model):
+    engine = AnalysisEngine(mock_model_manager)
+    from neural_mri.schemas.scan import FusedScanRequest
+
+    data = engine.scan_fused(FusedScanRequest(prompt="test", modes=["FLAIR", "fMRI", "DTI"]))
+    assert mock_model.run_with_cache.call_count == 1
+    assert data.modes == ["fMRI", "DTI", "FLAIR"]
+    assert data.activation is not None
+    assert data.circuits is not None
+    assert len(data.anomaly.layers) == 2
+    assert data.sae is None
+
+
+def test_scan_fused_rejects_unknown_mode(mock_model_manager):
+    engine = AnalysisEngine(mock_model_manager)
+    from neural_mri.schemas.scan import FusedScanRequest
+
+    with pytest.raises(ValueError):
+        engine.scan_fused(FusedScanRequest(prompt="test", modes=["T1"]))
+
+
+def test_scan_circuits_attribution_method(mock_model_manager):
+    engine = AnalysisEngine(mock_model_manager)
+    from neural_mri.schemas.scan import CircuitScanRequest
+
+    data = engine.scan_circuits(CircuitScanRequest(prompt="test", method="attribution"))
+    assert data.method == "attribution"
+    assert data.importance_metric == "top1_logprob"
+    assert len(data.components) == 5
+    assert len(data.head_importances) == 2
+    assert len(data.head_importances[0]) == 2
+
+
+def test_scan_anomaly_top_predictions_shape(mock_model_manager):
+    engine = AnalysisEngine(mock_model_manager)
+    from neural_mri.schemas.scan import AnomalyScanRequest
+
+    data = engine.scan_anomaly(AnomalyScanRequest(prompt="test"))
+    for layer in data.layers:
+        assert len(layer.top_predictions) == len(data.tokens)
+        assert all(len(preds) == 5 for preds in layer.top_predictions)
+        probs = [p.prob for p in layer.top_predictions[0]]
+        assert probs == sorted(probs, reverse=True)
+
+
+def test_build_sae_heatmap_matches_top_features(mock_model_manager, mock_sae):
+    import time
+
+    import torch
+
+    from neural_mri.schemas.scan import SAEScanRequest
+
+    engine = AnalysisEngine(mock_model_manager)
+    hook_name = "blocks.1.hook_resid_pre"
+    req = SAEScanRequest(prompt="test", layer_idx=1, top_k=3)
+    data = engine._build_sae(
+        req,
+        {hook_name: torch.randn(1, 4, 8)},
+        ["<bos>", "The", " capital", " of"],
+        mock_sae,
+        {"neuronpedia_url_template": "np/{layer}/{feature_idx}"},
+        hook_name,
+        time.time(),
+    )
+
+    active = {
+        f.feature_idx: (t.token_idx, f)
+        for t in data.token_features
+        for f in t.top_features
+        if f.activation > 0
+    }
+    assert set(active) <= set(data.heatmap_feature_indices)
+    assert data.heatmap_feature_indices == sorted(data.heatmap_feature_indices)
+    for feat_idx, (t_idx, feat) in active.items():
+        col = data.heatmap_feature_indices.index(feat_idx)
+        assert data.heatmap_values[t_idx][col] == feat.activation_normalized
+        assert feat.neuronpedia_url == f"np/1/{feat_idx}"
+
+
+def test_slice_cache_trims_padding():
+    import torch
+
+    from neural_mri.core.analysis_engine import _slice_cache
+
+    cache = {
+        "blocks.0.hook_resid_post": torch.randn(2, 5, 8),
+        "blocks.0.attn.hook_pattern": torch.randn(2, 4, 5, 5),
+    }
+    sliced = _slice_cache(cache, 1, 3)
+    resid = cache["blocks.0.hook_resid_post"]
+    assert torch.equal(sliced["blocks.0.hook_resid_post"], resid[1:2, :3])
+    assert sliced["blocks.0.attn.hook_pattern"].shape == (1, 4, 3, 3)
+
+
+def test_scan_activation_mean_aggregation_and_layers(mock_model_manager):
+    from neural_mri.schemas.scan import ActivationScanRequest
+
+    engine = AnalysisEngine(mock_model_manager)
+    full = engine.scan_activation(ActivationScanRequest(prompt="test", aggregation="mean"))
+    subset = engine.scan_activation(
+        ActivationScanRequest(prompt="test", aggregation="mean", layers=["blocks.1.mlp"])
+    )
+    assert len(full.layers) == 2 + 2 * 2  # embed + (attn, mlp) * n_layers + unembed
+    assert [layer.layer_id for layer in subset.layers] == ["blocks.1.mlp"]
+    # Normalized over every layer, so a selected layer reads the same
+    assert subset.layers[0] == full.layers[-2]
+    with pytest.raises(ValueError):
+        engine.scan_activation(ActivationScanRequest(prompt="test", aggregation="max"))
+
+
+def _tiny_engine():
+    """AnalysisEngine over a real 2-layer HookedTransformer with a character tokenizer."""
+    import types
+    from unittest.mock import MagicMock
+
+    import torch
+    from transformer_lens import HookedTransformer, HookedTransformerConfig
+
+    cfg = HookedTransformerConfig(
+        n_layers=2,
+        d_model=16,
+        n_ctx=32,
+        d_head=4,
+        n_heads=4,
+        d_mlp=32,
+        d_vocab=50,
+        act_fn="gelu",
+        normalization_type="LN",
+        device="cpu",
+    )
+    torch.manual_seed(0)
+    model = HookedTransformer(cfg)
+    model.eval()
+    # No tokenizer: ids 2.. encode characters, 1 is BOS, 0 pads
+    model.tokenizer = types.SimpleNamespace(
+        bos_token="<bos>", pad_token_id=0, decode=lambda ids: f"<{ids[0]}>"
+    )
+    model.to_tokens = lambda text, prepend_bos=True: torch.tensor(
+        [([1] if prepend_bos else []) + [2 + ord(c) % 48 for c in text]]
+    )
+    model.to_str_tokens = lambda tokens: ["<bos>" if i == 1 else f"<{i}>" for i in tokens.tolist()]
+    mm = MagicMock()
+    mm.get_model.return_value = model
+    mm.model_id = "tiny"
+    return AnalysisEngine(mm)
+
+
+def test_batched_scans_match_batch_size_one():
+    from neural_mri.schemas.scan import ActivationScanRequest, AnomalyScanRequest
+
+    engine = _tiny_engine()
+    prompts = ["a short one", "hi", "a somewhat longer prompt"]  # right-padded to the longest
+
+    single = [engine.scan_activation(ActivationScanRequest(prompt=p)) for p in prompts]
+    batched = engine.scan_activation_batch([ActivationScanRequest(prompt=p) for p in prompts])
+    for one, many in zip(single, batched):
+        assert many.tokens == one.tokens
+        for a, b in zip(one.layers, many.layers):
+            assert b.layer_id == a.layer_id
+            assert b.activations == pytest.approx(a.activations, abs=1e-3)
+
+    single = [engine.scan_anomaly(AnomalyScanRequest(prompt=p)) for p in prompts]
+    batched = engine.scan_anomaly_batch([AnomalyScanRequest(prompt=p) for p in prompts])
+    for one, many in zip(single, batched):
+        assert many.tokens == one.tokens
+        for a, b in zip(one.layers, many.layers):
+            assert b.anomaly_scores == pytest.approx(a.anomaly_scores, abs=1e-3)
+            assert b.kl_scores == pytest.approx(a.kl_scores, abs=1e-3)
+            assert b.entropy_scores == pytest.approx(a.entropy_scores, abs=1e-3)
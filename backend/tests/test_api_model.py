@@ -1,10 +1,15 @@
 """API tests for /api/model endpoints."""
 
+import asyncio
+import threading
 from unittest.mock import MagicMock
 
 import pytest
 from httpx import ASGITransport, AsyncClient
 
+from neural_mri.core.load_jobs import LoadJob, LoadJobManager
+from neural_mri.core.model_manager import LoadCancelledError
+from neural_mri.core.weight_stats import WeightStatsStore
 from neural_mri.main import app
 
 
@@ -56,6 +61,77 @@ async def test_model_info_not_loaded(_override_no_model):
     assert resp.status_code == 404 or resp.status_code == 400
 
 
+@pytest.fixture
+def _override_jobs(mock_model_manager):
+    from neural_mri.api.routes_model import get_load_jobs, get_weight_stats
+
+    mock_model_manager.resident_models = ["gpt2"]
+    mock_model_manager.load_model.return_value = mock_model_manager.get_model_info.return_value
+    jobs = LoadJobManager(mock_model_manager)
+    app.dependency_overrides[get_load_jobs] = lambda: jobs
+    app.dependency_overrides[get_weight_stats] = lambda: WeightStatsStore()
+    yield mock_model_manager
+    app.dependency_overrides.clear()
+
+
+async def _wait_for_job(client, job_id: str) -> dict:
+    for _ in range(200):
+        data = (await client.get(f"/api/model/jobs/{job_id}")).json()
+        if data["status"] not in ("queued", "running"):
+            return data
+        await asyncio.sleep(0.01)
+    raise AssertionError("load job did not finish")
+
+
+async def test_model_load_runs_as_job(_override_jobs):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/model/load", json={"model_id": "gpt2"})
+        assert resp.status_code == 202
+        job = await _wait_for_job(client, resp.json()["job_id"])
+    assert job["status"] == "done"
+    assert job["phase"] == "ready"
+    assert job["result"]["model_id"] == "gpt2"
+
+
+async def test_model_load_job_cancel(_override_jobs):
+    release = threading.Event()
+
+    def slow_load(model_id, device, cancelled, precision):
+        release.wait(5)
+        if cancelled():
+            raise LoadCancelledError(model_id)
+        return _override_jobs.get_model_info.return_value
+
+    _override_jobs.load_model.side_effect = slow_load
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        job_id = (await client.post("/api/model/load", json={"model_id": "gpt2"})).json()["job_id"]
+        resp = await client.delete(f"/api/model/jobs/{job_id}")
+        assert resp.status_code == 200
+        release.set()
+        job = await _wait_for_job(client, job_id)
+    assert job["status"] == "cancelled"
+    assert job["result"] is None
+
+
+async def test_model_load_job_unknown_404(_override_jobs):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.get("/api/model/jobs/nope")
+    assert resp.status_code == 404
+
+
+async def test_ready_after_failed_startup_load_is_503():
+    app.state.startup_job = LoadJob(model_id="gpt2", device="cpu", status="failed", error="boom")
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            resp = await client.get("/api/ready")
+    finally:
+        app.state.startup_job = None
+    assert resp.status_code == 503
+    data = resp.json()
+    assert data["reason"] == "startup load failed"
+    assert data["startup"]["error"] == "boom"
+
+
 async def test_root_endpoint():
     async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
         resp = await client.get("/")
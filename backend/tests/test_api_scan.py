@@ -16,11 +16,14 @@ def _get_deps():
 
 @pytest.fixture
 def _override_deps(mock_model_manager):
+    from neural_mri.api.routes_scan import get_weight_stats
     from neural_mri.core.scan_cache import ScanCache
+    from neural_mri.core.weight_stats import WeightStatsStore
 
     get_mm, get_cache = _get_deps()
     app.dependency_overrides[get_mm] = lambda: mock_model_manager
     app.dependency_overrides[get_cache] = lambda: ScanCache(max_entries=5)
+    app.dependency_overrides[get_weight_stats] = lambda: WeightStatsStore()
     yield
     app.dependency_overrides.clear()
 
@@ -65,3 +68,127 @@ async def test_scan_activation_200(_override_deps):
     data = resp.json()
     assert "tokens" in data
     assert "layers" in data
+
+
+async def test_scan_all_200(_override_deps):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/scan/all", json={"prompt": "test"})
+    assert resp.status_code == 200
+    data = resp.json()
+    assert data["modes"] == ["fMRI", "DTI", "FLAIR"]
+    assert data["activation"]["layers"]
+    assert data["circuits"]["components"]
+    assert data["anomaly"]["layers"]
+
+
+async def test_scan_all_unknown_mode_400(_override_deps):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/scan/all", json={"prompt": "test", "modes": ["PET"]})
+    assert resp.status_code == 400
+
+
+async def test_scan_circuits_binary(_override_deps):
+    from neural_mri.utils.tensor_codec import MEDIA_TYPE, decode
+
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post(
+            "/api/scan/circuits",
+            json={"prompt": "test"},
+            headers={"Accept": MEDIA_TYPE},
+        )
+    assert resp.status_code == 200
+    assert resp.headers["content-type"] == MEDIA_TYPE
+    meta, arrays = decode(resp.content)
+    assert all(head["pattern"] is None for head in meta["attention_heads"])
+    patterns = arrays["attention_heads[].pattern"]
+    assert patterns.shape[0] == len(meta["attention_heads"])
+
+
+async def test_scan_anomaly_unknown_format_400(_override_deps):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post("/api/scan/anomaly?format=xml", json={"prompt": "test"})
+    assert resp.status_code == 400
+
+
+async def test_scan_activation_unknown_precision_400(_override_deps):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post(
+            "/api/scan/activation", json={"prompt": "test", "precision": "fp8"}
+        )
+    assert resp.status_code == 400
+
+
+async def test_scan_weights_subset_served_from_full_result(mock_model_manager):
+    from neural_mri.api.routes_scan import get_analysis_engine
+    from neural_mri.core.analysis_engine import AnalysisEngine
+    from neural_mri.core.scan_cache import ScanCache
+    from neural_mri.core.weight_stats import WeightStatsStore
+
+    get_mm, get_cache = _get_deps()
+    cache = ScanCache(max_entries=5)
+    engine = AnalysisEngine(mock_model_manager, weight_stats=WeightStatsStore())
+    engine.scan_weights = MagicMock(side_effect=engine.scan_weights)
+    app.dependency_overrides[get_mm] = lambda: mock_model_manager
+    app.dependency_overrides[get_cache] = lambda: cache
+    app.dependency_overrides[get_analysis_engine] = lambda: engine
+    try:
+        async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+            full = (await client.post("/api/scan/weights", json={})).json()
+            resp = await client.post("/api/scan/weights", json={"layers": ["blocks.1"]})
+    finally:
+        app.dependency_overrides.clear()
+    assert resp.status_code == 200
+    subset = resp.json()["layers"]
+    assert subset
+    assert all(e["layer_id"].startswith("blocks.1") for e in subset)
+    assert len(subset) < len(full["layers"])
+    assert engine.scan_weights.call_count == 1
+
+
+async def test_scan_activation_layers_and_aggregation(_override_deps):
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        resp = await client.post(
+            "/api/scan/activation",
+            json={"prompt": "test", "layers": ["blocks.0"], "aggregation": "mean"},
+        )
+        bad = await client.post(
+            "/api/scan/activation", json={"prompt": "test", "aggregation": "max"}
+        )
+    assert resp.status_code == 200
+    data = resp.json()
+    assert [layer["layer_id"] for layer in data["layers"]] == ["blocks.0.attn", "blocks.0.mlp"]
+    assert data["metadata"]["aggregation"] == "mean"
+    assert bad.status_code == 400
+
+
+async def test_scan_cache_hit_served_as_bytes_with_etag(_override_deps, mock_model_manager):
+    from neural_mri.core.scan_cache import ScanCache
+
+    _, get_cache = _get_deps()
+    cache = ScanCache(max_entries=5)
+    app.dependency_overrides[get_cache] = lambda: cache
+    async with AsyncClient(transport=ASGITransport(app=app), base_url="http://test") as client:
+        first = await client.post("/api/scan/anomaly", json={"prompt": "test"})
+        hit = await client.post("/api/scan/anomaly", json={"prompt": "test"})
+        etag = hit.headers["etag"]
+        revalidated = await client.post(
+            "/api/scan/anomaly", json={"prompt": "test"}, headers={"If-None-Match": etag}
+        )
+    assert first.status_code == 200
+    assert hit.status_code == 200
+    assert hit.json() == first.json()
+    assert first.headers["etag"] == etag  # the computing response already carries it
+    assert hit.headers["vary"] == "Accept-Encoding"
+    assert revalidated.status_code == 304
+    assert revalidated.content == b""
+
+
+def test_accept_encoding_q_values():
+    from neural_mri.api.cached_response import accepts_gzip
+
+    assert accepts_gzip("gzip, deflate, br")
+    assert accepts_gzip("br;q=1.0, gzip;q=0.5")
+    assert accepts_gzip("*")
+    assert not accepts_gzip("gzip;q=0")
+    assert not accepts_gzip("gzip;q=0, *")
+    assert not accepts_gzip("identity")
@@ -66,3 +66,10 @@ async def test_causal_trace_no_model():
             json={"clean_prompt": "hello", "corrupt_prompt": "xxxxx"},
         )
     assert resp.status_code == 400
+
+
+def test_causal_trace_request_method_defaults():
+    req = CausalTraceRequest(clean_prompt="a", corrupt_prompt="b")
+    assert req.method == "exact"
+    assert req.head_level is False
+    assert req.position_level is False
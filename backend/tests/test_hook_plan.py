@@ -0,0 +1,61 @@
+"""Tests for hook plans — minimal per-mode names_filter sets."""
+
+import pytest
+
+from neural_mri.core.hook_plan import (
+    HookPlan,
+    component_hook_points,
+    plan_for_mode,
+    plan_for_modes,
+)
+
+
+def test_fmri_plan_contents():
+    plan = plan_for_mode("fMRI", 2)
+    assert plan.names == {
+        "hook_embed",
+        "blocks.0.attn.hook_z",
+        "blocks.0.hook_mlp_out",
+        "blocks.1.attn.hook_z",
+        "blocks.1.hook_mlp_out",
+        "blocks.1.hook_resid_post",
+    }
+    assert "blocks.0.hook_resid_post" not in plan
+
+
+def test_plan_is_callable_names_filter():
+    plan = plan_for_mode("DTI", 2)
+    assert plan("blocks.1.attn.hook_pattern")
+    assert not plan("blocks.1.attn.hook_q")
+
+
+def test_union_of_modes():
+    plan = plan_for_modes(["fMRI", "FLAIR"], 2)
+    assert plan.covers(plan_for_mode("fMRI", 2))
+    assert plan.covers(plan_for_mode("FLAIR", 2))
+    assert len(plan) == 7  # resid_post of the last block is shared
+
+
+def test_sae_plan_requires_hook():
+    with pytest.raises(ValueError):
+        plan_for_mode("SAE", 2)
+    assert plan_for_mode("SAE", 2, sae_hook="blocks.1.hook_resid_pre").names == {
+        "blocks.1.hook_resid_pre"
+    }
+
+
+def test_unknown_mode_raises():
+    with pytest.raises(ValueError):
+        plan_for_mode("PET", 2)
+
+
+def test_component_hook_points_order():
+    points = component_hook_points(2)
+    assert points[0] == ("embed", "hook_embed")
+    assert points[1] == ("blocks.0.attn", "blocks.0.hook_attn_out")
+    assert points[-1] == ("blocks.1.mlp", "blocks.1.hook_mlp_out")
+    assert len(points) == 5
+
+
+def test_hook_plan_of():
+    assert HookPlan.of("a", "b").covers(HookPlan.of("a"))
@@ -0,0 +1,57 @@
+"""Tests for LayerResumer — resume-from-layer hooked forwards."""
+
+import types
+from unittest.mock import MagicMock
+
+import torch
+
+from neural_mri.core.layer_resume import LayerResumer, hook_layer, resume_plan
+
+
+def _model(pos_type="standard"):
+    model = MagicMock()
+    model.cfg = types.SimpleNamespace(positional_embedding_type=pos_type)
+    model.run_with_hooks = MagicMock(side_effect=lambda x, **kw: torch.zeros(x.shape[0], 3, 5))
+    return model
+
+
+def _cache():
+    return {f"blocks.{i}.hook_resid_pre": torch.randn(1, 3, 8) for i in range(3)}
+
+
+def test_hook_layer():
+    assert hook_layer("blocks.12.hook_mlp_out") == 12
+    assert hook_layer("blocks.0.attn.hook_z") == 0
+    assert hook_layer("hook_embed") is None
+
+
+def test_resume_plan_skips_non_block_hooks():
+    plan = resume_plan(["hook_embed", "blocks.1.hook_attn_out", "blocks.1.hook_mlp_out"])
+    assert plan.names == {"blocks.1.hook_resid_pre"}
+
+
+def test_resumes_from_earliest_layer():
+    model = _model()
+    tokens = torch.zeros(1, 3, dtype=torch.long)
+    resumer = LayerResumer(model, tokens, _cache())
+    hooks = [("blocks.2.hook_mlp_out", None), ("blocks.1.hook_attn_out", None)]
+
+    logits = resumer.run_with_hooks(hooks, batch=4)
+    assert logits.shape[0] == 4
+    kwargs = model.run_with_hooks.call_args.kwargs
+    assert kwargs["start_at_layer"] == 1
+    assert model.run_with_hooks.call_args.args[0].shape == (4, 3, 8)
+
+
+def test_falls_back_to_full_forward():
+    tokens = torch.zeros(1, 3, dtype=torch.long)
+    cases = [
+        (_model(), _cache(), [("hook_embed", None)]),
+        (_model(), None, [("blocks.1.hook_mlp_out", None)]),
+        (_model(), {}, [("blocks.1.hook_mlp_out", None)]),
+        (_model("shortformer"), _cache(), [("blocks.1.hook_mlp_out", None)]),
+    ]
+    for model, cache, hooks in cases:
+        LayerResumer(model, tokens, cache).run_with_hooks(hooks, batch=2)
+        assert "start_at_layer" not in model.run_with_hooks.call_args.kwargs
+        assert model.run_with_hooks.call_args.args[0].shape == (2, 3)
@@ -0,0 +1,81 @@
+"""Tests for MicroBatcher request coalescing."""
+
+import asyncio
+
+import pytest
+
+from neural_mri.core.micro_batch import MicroBatcher
+from neural_mri.core.scheduler import InferenceScheduler
+
+
+async def test_concurrent_requests_share_one_batch():
+    batches: list[list[str]] = []
+
+    def upper(reqs):
+        batches.append(list(reqs))
+        return [r.upper() for r in reqs]
+
+    batcher = MicroBatcher(InferenceScheduler(), window_ms=50, max_batch=8)
+
+    results = await asyncio.gather(*(batcher.run("k", p, upper) for p in ["a", "b", "c"]))
+    assert results == ["A", "B", "C"]
+    assert batches == [["a", "b", "c"]]
+    stats = batcher.stats()
+    assert stats["batches"] == 1
+    assert stats["largest_batch"] == 3
+
+
+async def test_max_batch_flushes_early_and_keys_do_not_mix():
+    batches: list[list[str]] = []
+
+    def echo(reqs):
+        batches.append(list(reqs))
+        return list(reqs)
+
+    batcher = MicroBatcher(InferenceScheduler(), window_ms=1000, max_batch=2)
+
+    # "x" fills up and flushes at once; "y" waits out its window
+    with pytest.raises(asyncio.TimeoutError):
+        await asyncio.wait_for(
+            asyncio.gather(
+                batcher.run("x", "x1", echo),
+                batcher.run("y", "y1", echo),
+                batcher.run("x", "x2", echo),
+            ),
+            timeout=0.5,
+        )
+    assert batches == [["x1", "x2"]]
+
+
+async def test_failed_batch_is_retried_per_request():
+    calls: list[int] = []
+
+    def picky(reqs):
+        calls.append(len(reqs))
+        if "bad" in reqs:
+            raise ValueError("bad prompt")
+        return reqs
+
+    batcher = MicroBatcher(InferenceScheduler(), window_ms=50, max_batch=8)
+
+    ok, bad = await asyncio.gather(
+        batcher.run("k", "ok", picky),
+        batcher.run("k", "bad", picky),
+        return_exceptions=True,
+    )
+    assert ok == "ok"
+    assert isinstance(bad, ValueError)
+    assert calls == [2, 1, 1]
+
+
+async def test_max_batch_one_disables_batching():
+    batches: list[list[int]] = []
+
+    def echo(reqs):
+        batches.append(list(reqs))
+        return list(reqs)
+
+    batcher = MicroBatcher(InferenceScheduler(), window_ms=50, max_batch=1)
+
+    assert await asyncio.gather(*(batcher.run("k", i, echo) for i in range(3))) == [0, 1, 2]
+    assert batches == [[0], [1], [2]]
@@ -1,8 +1,10 @@
 """Tests for ModelManager."""
 
-from unittest.mock import MagicMock
+from unittest.mock import MagicMock, patch
 
-from neural_mri.core.model_manager import ModelManager, _parse_param_str
+import pytest
+
+from neural_mri.core.model_manager import LoadCancelledError, ModelManager, _parse_param_str
 
 
 def test_initial_state_not_loaded():
@@ -42,8 +44,117 @@ def test_parse_param_str():
 
 def test_unload_clears_state():
     mm = ModelManager()
-    mm._model = MagicMock()
+    mm._models["gpt2"] = MagicMock()
     mm._model_id = "gpt2"
     mm.unload_model()
     assert mm.is_loaded is False
     assert mm.model_id is None
+
+
+def _fake_model(n_bytes: int) -> MagicMock:
+    param = MagicMock()
+    param.numel.return_value = n_bytes // 4
+    param.element_size.return_value = 4
+    model = MagicMock()
+    model.parameters.return_value = [param]
+    return model
+
+
+def _pool(**kwargs) -> ModelManager:
+    mm = ModelManager(**kwargs)
+    mm._load = lambda model_id, device, *args: _fake_model(1024**3)
+    return mm
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_pool_keeps_several_models_resident(_info):
+    mm = _pool(budget_gb=8, max_models=3)
+    mm.load_model("a")
+    mm.load_model("b")
+    assert mm.resident_models == ["b", "a"]
+    assert mm.model_id == "b"
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_pool_evicts_least_recently_used_by_count(_info):
+    mm = _pool(budget_gb=0, max_models=2)
+    evicted = []
+    mm.add_eviction_listener(evicted.append)
+    mm.load_model("a")
+    mm.load_model("b")
+    with mm.bind("a"):
+        mm.get_model()  # touch "a" so "b" becomes least recently used
+    mm.load_model("c")
+    assert evicted == ["b"]
+    assert set(mm.resident_models) == {"a", "c"}
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_pool_evicts_by_byte_budget(_info):
+    mm = _pool(budget_gb=2.5, max_models=5)
+    for model_id in ("a", "b", "c"):
+        mm.load_model(model_id)
+    assert mm.resident_models == ["c", "b"]
+    assert mm.pool_status()["used_bytes"] == 2 * 1024**3
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_reloading_resident_model_activates_without_loading(_info):
+    mm = _pool()
+    mm.load_model("a")
+    mm.load_model("b")
+    mm._load = MagicMock()
+    mm.load_model("a")
+    mm._load.assert_not_called()
+    assert mm.model_id == "a"
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_bind_resolves_to_requested_model(_info):
+    mm = _pool()
+    mm.load_model("a")
+    mm.load_model("b")
+    with mm.bind("a"):
+        assert mm.model_id == "a"
+        assert mm.get_model() is mm._models["a"]
+    with mm.bind("missing"):
+        assert mm.is_loaded is False
+    assert mm.model_id == "b"
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_unload_active_falls_back_to_most_recent(_info):
+    mm = _pool()
+    mm.load_model("a")
+    mm.load_model("b")
+    mm.unload_model()
+    assert mm.model_id == "a"
+    assert mm.resident_models == ["a"]
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_failed_load_keeps_active_model(_info):
+    mm = _pool(budget_gb=0, max_models=1)
+    mm.load_model("a")
+
+    def fail(*args):
+        raise RuntimeError("download failed")
+
+    mm._load = fail
+    with pytest.raises(RuntimeError):
+        mm.load_model("b")
+    assert mm.resident_models == ["a"]
+    assert mm.model_id == "a"
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_cancelled_load_keeps_active_model(_info):
+    mm = _pool(budget_gb=1, max_models=1)
+    evicted = []
+    mm.add_eviction_listener(evicted.append)
+    mm.load_model("a")
+    with pytest.raises(LoadCancelledError):
+        mm.load_model("b", cancelled=iter([False, True]).__next__)  # cancelled once loaded
+    assert evicted == []
+    assert mm.resident_models == ["a"]
+    assert mm.model_id == "a"
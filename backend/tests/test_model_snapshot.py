@@ -0,0 +1,60 @@
+"""Tests for processed-model snapshots (round trip on a tiny HookedTransformer)."""
+
+import torch
+from transformer_lens import HookedTransformer, HookedTransformerConfig
+
+from neural_mri.core import model_snapshot
+from neural_mri.core.model_snapshot import ModelSnapshotStore
+
+
+def _tiny_model() -> HookedTransformer:
+    cfg = HookedTransformerConfig(
+        n_layers=2,
+        d_model=16,
+        n_ctx=8,
+        d_head=4,
+        n_heads=4,
+        d_mlp=32,
+        d_vocab=20,
+        act_fn="gelu",
+        normalization_type="LN",
+        device="cpu",
+    )
+    return HookedTransformer(cfg)
+
+
+def test_snapshot_round_trip(tmp_path):
+    model = _tiny_model()
+    store = ModelSnapshotStore(tmp_path)
+    store.save("tiny/model", model)
+    store.flush()
+    assert len(list(tmp_path.glob("tiny_model-float32.safetensors"))) == 1
+
+    restored = store.load("tiny/model", torch.float32, "cpu")
+    assert restored is not None
+    tokens = torch.tensor([[1, 2, 3, 4]])
+    with torch.no_grad():
+        assert torch.allclose(model(tokens), restored(tokens))
+    assert restored.cfg.n_layers == 2
+    assert restored.cfg.dtype == torch.float32
+    # Restored weights are writable views of the snapshot, not of the file
+    restored.W_E.data.zero_()
+    again = store.load("tiny/model", torch.float32, "cpu")
+    assert torch.equal(again.W_E, model.W_E)
+
+
+def test_missing_snapshot_returns_none(tmp_path):
+    assert ModelSnapshotStore(tmp_path).load("gpt2", torch.float32, "cpu") is None
+
+
+def test_snapshot_from_other_library_version_is_ignored(tmp_path, monkeypatch):
+    store = ModelSnapshotStore(tmp_path)
+    store.save("tiny", _tiny_model())
+    store.flush()
+    monkeypatch.setattr(model_snapshot, "_tl_version", lambda: "0.0.0")
+    assert store.load("tiny", torch.float32, "cpu") is None
+
+
+def test_corrupt_snapshot_is_ignored(tmp_path):
+    (tmp_path / "tiny-float32.safetensors").write_bytes(b"not a snapshot")
+    assert ModelSnapshotStore(tmp_path).load("tiny", torch.float32, "cpu") is None
@@ -0,0 +1,87 @@
+"""Tests for bf16 precision modes and their fidelity reports."""
+
+from unittest.mock import patch
+
+import torch
+from transformer_lens import HookedTransformer, HookedTransformerConfig
+
+from neural_mri.core.model_manager import ModelManager
+from neural_mri.core.precision import (
+    autocast_fidelity,
+    cast_to_bf16,
+    compare_probes,
+    precision_cache_key,
+)
+from neural_mri.core.scan_cache import ScanCache
+from neural_mri.core.scan_store import ScanDiskStore
+
+
+def _tiny_model() -> HookedTransformer:
+    cfg = HookedTransformerConfig(
+        n_layers=2,
+        d_model=16,
+        n_ctx=32,
+        d_head=4,
+        n_heads=4,
+        d_mlp=32,
+        d_vocab=50,
+        act_fn="gelu",
+        normalization_type="LN",
+        device="cpu",
+    )
+    model = HookedTransformer(cfg)
+    # No tokenizer: probe with raw ids
+    model.to_tokens = lambda prompt: torch.arange(10).unsqueeze(0)
+    return model
+
+
+def test_identical_probes_are_exact():
+    logits = torch.randn(1, 5, 10)
+    acts = [torch.randn(1, 5, 8) for _ in range(3)]
+    report = compare_probes("bf16", (logits, acts), (logits.clone(), [a.clone() for a in acts]))
+    assert report.max_abs_activation_delta == 0.0
+    assert report.top1_agreement == 1.0
+
+
+def test_cast_to_bf16_reports_fidelity():
+    model = _tiny_model()
+    reduced, report = cast_to_bf16(model)
+    assert reduced.cfg.dtype == torch.bfloat16
+    assert reduced.W_U.dtype == torch.bfloat16
+    assert model.W_U.dtype == torch.float32  # the original is left as is
+    assert report.mode == "bf16"
+    assert 0 < report.rel_activation_delta < 0.1
+    assert 0.0 <= report.top1_agreement <= 1.0
+
+
+@patch.object(ModelManager, "get_model_info")
+def test_bf16_switch_changes_fingerprint_and_disk_key(_info, tmp_path):
+    mm = ModelManager(budget_gb=0)
+    mm._load = lambda model_id, device, *args: _tiny_model()
+    cache = ScanCache(disk=ScanDiskStore(tmp_path), fingerprint=mm.fingerprint)
+    mm.add_eviction_listener(cache.invalidate_model)
+    mm.load_model("tiny", precision="fp32")
+    fp32_model, fp32_fingerprint = mm.get_model(), mm.fingerprint("tiny")
+    cache.put("tiny", "T2", "", {"dtype": "fp32"})
+
+    jobs = []
+    mm._run_job = lambda fn, *args: jobs.append(fn) or fn(*args)
+    mm.load_model("tiny", precision="bf16")
+    assert jobs == [cast_to_bf16]
+    assert mm.get_model() is not fp32_model
+    assert fp32_model.W_U.dtype == torch.float32
+    assert mm.fingerprint("tiny") != fp32_fingerprint
+    assert cache.get("tiny", "T2", "") is None  # neither tier serves the fp32 result
+
+
+def test_autocast_fidelity_keeps_fp32_weights():
+    model = _tiny_model()
+    report = autocast_fidelity(model)
+    assert model.W_U.dtype == torch.float32
+    assert report.mode == "bf16-autocast"
+    assert report.rel_activation_delta < 0.1
+
+
+def test_precision_cache_key():
+    assert precision_cache_key("hi", None) == "hi"
+    assert precision_cache_key("hi", "bf16") == "hi::bf16"
@@ -0,0 +1,77 @@
+"""Tests for canonical scan-request keys and result derivation."""
+
+from neural_mri.core.request_key import broad_request, derive, request_key
+from neural_mri.schemas.scan import (
+    ActivationScanRequest,
+    CircuitScanRequest,
+    SAEScanRequest,
+    WeightScanRequest,
+)
+
+
+def test_key_ignores_model_id_defaults_and_layer_order():
+    base = ActivationScanRequest(prompt="hi")
+    assert request_key(base) == request_key(ActivationScanRequest(prompt="hi", model_id="gpt2"))
+    assert request_key(base) == request_key(ActivationScanRequest(prompt="hi", aggregation="l2"))
+    assert request_key(base) == request_key(ActivationScanRequest(prompt="hi", layers=[]))
+    assert request_key(ActivationScanRequest(prompt="hi", layers=["b", "a", "a"])) == request_key(
+        ActivationScanRequest(prompt="hi", layers=["a", "b"])
+    )
+
+
+def test_key_covers_every_result_parameter():
+    keys = {
+        request_key(ActivationScanRequest(prompt="hi")),
+        request_key(ActivationScanRequest(prompt="hi ")),
+        request_key(ActivationScanRequest(prompt="hi", aggregation="mean")),
+        request_key(ActivationScanRequest(prompt="hi", precision="bf16")),
+        request_key(ActivationScanRequest(prompt="hi", layers=["embed"])),
+    }
+    assert len(keys) == 5
+    circuits = CircuitScanRequest(prompt="hi")
+    assert request_key(circuits) != request_key(CircuitScanRequest(prompt="hi", target_token_idx=1))
+    assert request_key(circuits) != request_key(
+        CircuitScanRequest(prompt="hi", method="attribution")
+    )
+    assert request_key(circuits) == request_key(
+        CircuitScanRequest(prompt="hi", target_token_idx=-3)
+    )
+    sae = SAEScanRequest(prompt="hi", layer_idx=2)
+    assert request_key(sae) != request_key(SAEScanRequest(prompt="hi", layer_idx=2, top_k=5))
+    assert request_key(sae) == request_key(sae, precision=None)
+    assert request_key(sae) != request_key(sae, precision="bf16")
+
+
+def test_weights_subset_derived_from_all_layers():
+    req = WeightScanRequest(layers=["blocks.1"])
+    assert broad_request("weights", req) == WeightScanRequest()
+    full = {
+        "model_id": "gpt2",
+        "layers": [
+            {"layer_id": "blocks.0.attn", "component": "W_Q"},
+            {"layer_id": "blocks.1.attn", "component": "W_Q"},
+            {"layer_id": "blocks.1.mlp", "component": "W_in"},
+        ],
+        "metadata": {"num_tensors_scanned": 3},
+    }
+    narrow = derive("weights", req, full)
+    assert [e["layer_id"] for e in narrow["layers"]] == ["blocks.1.attn", "blocks.1.mlp"]
+    assert narrow["metadata"]["num_tensors_scanned"] == 2
+    assert len(full["layers"]) == 3  # the cached result is left untouched
+
+
+def test_activation_subset_matches_dotted_prefixes():
+    req = ActivationScanRequest(prompt="hi", layers=["blocks.1", "embed"], aggregation="mean")
+    broad = broad_request("activation", req)
+    assert broad.layers is None
+    assert broad.aggregation == "mean"
+    ids = ["embed", "blocks.1.attn", "blocks.1.mlp", "blocks.10.attn", "unembed"]
+    full = {"layers": [{"layer_id": i} for i in ids]}
+    narrow = derive("activation", req, full)
+    assert [e["layer_id"] for e in narrow["layers"]] == ["embed", "blocks.1.attn", "blocks.1.mlp"]
+
+
+def test_non_derivable_modes_pass_through():
+    req = CircuitScanRequest(prompt="hi")
+    assert broad_request("circuits", req) is req
+    assert derive("circuits", req, {"a": 1}) == {"a": 1}
@@ -12,7 +12,7 @@ def _mock_from_pretrained():
     mock_sae = MagicMock()
     mock_sae.cfg = MagicMock()
     mock_sae.cfg.d_sae = 24576
-    with patch("neural_mri.core.sae_manager.SAE") as MockSAE:
+    with patch("sae_lens.SAE") as MockSAE:
         MockSAE.from_pretrained.return_value = mock_sae
         yield MockSAE, mock_sae
 
@@ -1,6 +1,6 @@
 """Tests for the SAE registry."""
 
-from neural_mri.core.sae_registry import get_sae_info, list_sae_support
+from neural_mri.core.sae_registry import default_sae_layer, get_sae_info, list_sae_support
 
 
 def test_get_sae_info_gpt2():
@@ -36,3 +36,8 @@ def test_list_sae_support_gpt2_true():
 
 def test_list_sae_support_gpt2_medium_false():
     assert list_sae_support()["gpt2-medium"] is False
+
+
+def test_default_sae_layer():
+    assert default_sae_layer("gpt2") == 6
+    assert default_sae_layer("unknown-model") is None
@@ -1,5 +1,9 @@
 """Tests for ScanCache — LRU cache keyed by (model_id, mode, prompt)."""
 
+import gzip
+
+import orjson
+
 from neural_mri.core.scan_cache import ScanCache
 
 
@@ -78,3 +82,138 @@ def test_put_overwrites_same_key():
     c.put("gpt2", "T1", "a", {"v": 1})
     c.put("gpt2", "T1", "a", {"v": 2})
     assert c.get("gpt2", "T1", "a") == {"v": 2}
+
+
+def _result(n_bytes: int, compute_ms: float | None = None) -> dict:
+    result = {"blob": "x" * n_bytes}
+    if compute_ms is not None:
+        result["metadata"] = {"compute_time_ms": compute_ms}
+    return result
+
+
+def test_byte_budget_evicts_until_under_budget():
+    c = ScanCache(budget_bytes=10_000, mode_quota=1.0, admit_fraction=1.0)
+    for i in range(5):
+        c.put("gpt2", "fMRI", str(i), _result(3_000))
+    assert c.bytes_used <= 10_000
+    assert len(c) == 3
+    assert c.get("gpt2", "fMRI", "4") is not None
+
+
+def test_oversized_result_is_not_admitted():
+    c = ScanCache(budget_bytes=10_000, admit_fraction=0.25)
+    c.put("gpt2", "DTI", "big", _result(5_000))
+    assert c.get("gpt2", "DTI", "big") is None
+    assert c.stats()["rejected"] == 1
+
+
+def test_mode_quota_evicts_within_mode():
+    c = ScanCache(budget_bytes=10_000, mode_quota=0.5, admit_fraction=0.5)
+    c.put("gpt2", "structural", "", _result(2_000))
+    c.put("gpt2", "fMRI", "a", _result(3_000))
+    c.put("gpt2", "fMRI", "b", _result(3_000))  # fMRI over 5_000: evicts "a"
+    assert c.get("gpt2", "fMRI", "a") is None
+    assert c.get("gpt2", "fMRI", "b") is not None
+    assert c.get("gpt2", "structural", "") is not None
+
+
+def test_expensive_results_outlive_cheap_ones():
+    c = ScanCache(budget_bytes=10_000, mode_quota=1.0, admit_fraction=1.0)
+    c.put("gpt2", "circuits", "p", _result(3_000, compute_ms=900.0))
+    c.put("gpt2", "structural", "", _result(3_000, compute_ms=1.0))
+    c.put("gpt2", "anomaly", "p", _result(3_000, compute_ms=50.0))
+    # Over budget: the cheap T1 result goes even though DTI is older
+    c.put("gpt2", "activation", "p", _result(3_000, compute_ms=40.0))
+    assert c.get("gpt2", "structural", "") is None
+    assert c.get("gpt2", "circuits", "p") is not None
+
+
+def test_invalidate_and_clear_release_bytes():
+    c = ScanCache()
+    c.put("gpt2", "T1", "a", _result(100))
+    c.invalidate_model("gpt2")
+    assert c.bytes_used == 0
+    c.put("gpt2", "T1", "a", _result(100))
+    c.clear()
+    assert c.bytes_used == 0
+
+
+def test_get_body_serves_stored_json():
+    c = ScanCache()
+    c.put("gpt2", "circuits", "p", {"layers": [1.5, 2.0], "model_id": "gpt2"})
+    hit = c.get_body("gpt2", "circuits", "p")
+    assert orjson.loads(hit.content) == {"layers": [1.5, 2.0], "model_id": "gpt2"}
+    assert not hit.gzipped
+    assert hit.etag.startswith('W/"')
+    assert c.get_body("gpt2", "circuits", "other") is None
+
+
+def test_etag_tracks_content():
+    c = ScanCache()
+    c.put("gpt2", "circuits", "p", {"v": 1})
+    first = c.get_body("gpt2", "circuits", "p").etag
+    c.put("gpt2", "circuits", "p", {"v": 1})
+    assert c.get_body("gpt2", "circuits", "p").etag == first
+    c.put("gpt2", "circuits", "p", {"v": 2})
+    assert c.get_body("gpt2", "circuits", "p").etag != first
+    c.put("gpt2", "circuits", "q", {"v": 1})
+    assert c.get_body("gpt2", "circuits", "q").etag != first
+
+
+def test_gzip_variant_is_made_once_and_charged():
+    c = ScanCache()
+    result = _result(20_000)
+    c.put("gpt2", "anomaly", "p", result)
+    before = c.bytes_used
+    hit = c.get_body("gpt2", "anomaly", "p", gzipped=True)
+    assert hit.gzipped
+    assert orjson.loads(gzip.decompress(hit.content)) == result
+    assert c.bytes_used == before + len(hit.content)
+    assert c.get_body("gpt2", "anomaly", "p", gzipped=True).content is hit.content
+    assert c.bytes_used == before + len(hit.content)
+    # Tiny bodies are not worth compressing
+    c.put("gpt2", "structural", "", {"v": 1})
+    assert not c.get_body("gpt2", "structural", "", gzipped=True).gzipped
+
+
+def test_repeated_hits_keep_priority_heap_bounded():
+    c = ScanCache(max_entries=3)
+    for p in "abc":
+        c.put("gpt2", "T1", p, {"v": p})
+    for _ in range(500):
+        c.get("gpt2", "T1", "a")
+    assert len(c._heaps["T1"]) <= 2 * len(c) + 64
+    c.put("gpt2", "T1", "d", {"v": "d"})  # evicts "b", the least recently used tie
+    assert c.get("gpt2", "T1", "b") is None
+    assert c.get("gpt2", "T1", "a") == {"v": "a"}
+
+
+def test_decoded_copy_is_reused_and_charged():
+    c = ScanCache()
+    c.put("gpt2", "T1", "a", {"v": [1.0] * 10})
+    size = c.bytes_used
+    first = c.get("gpt2", "T1", "a")
+    assert c.get("gpt2", "T1", "a") is first
+    assert c.bytes_used > size
+
+
+def test_gzip_copy_not_kept_when_entry_would_exceed_admission():
+    body = {"v": list(range(400))}
+    c = ScanCache(budget_bytes=4 * len(orjson.dumps(body)) + 8)  # admits the body alone
+    c.put("gpt2", "T1", "a", body)
+    size = c.bytes_used
+    cached = c.get_body("gpt2", "T1", "a", gzipped=True)
+    assert cached.gzipped and gzip.decompress(cached.content) == orjson.dumps(body)
+    assert c.bytes_used == size
+
+
+def test_served_copies_do_not_demote_the_entry():
+    c = ScanCache(max_entries=2)
+    body = {"v": list(range(400))}
+    c.put("gpt2", "T1", "a", body)
+    c.put("gpt2", "T1", "b", body)
+    c.get_body("gpt2", "T1", "a", gzipped=True)
+    c.get("gpt2", "T1", "a")
+    c.put("gpt2", "T1", "c", body)  # "b" is now least recently used
+    assert c.get("gpt2", "T1", "b") is None
+    assert c.get("gpt2", "T1", "a") == body
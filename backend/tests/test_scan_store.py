@@ -0,0 +1,89 @@
+"""Tests for the on-disk scan result tier."""
+
+from neural_mri.core.scan_cache import ScanCache
+from neural_mri.core.scan_store import ScanDiskStore
+
+
+def _cache(store, fingerprints):
+    return ScanCache(disk=store, fingerprint=fingerprints.get)
+
+
+def test_store_round_trip(tmp_path):
+    store = ScanDiskStore(tmp_path)
+    store.put("gpt2", "fp1", "activation", "hello", {"v": [1.5, 2.5]}).result()
+    assert store.get("gpt2", "fp1", "activation", "hello") == {"v": [1.5, 2.5]}
+    assert store.get("gpt2", "fp2", "activation", "hello") is None
+    assert store.get("gpt2", "fp1", "anomaly", "hello") is None
+
+
+def test_memory_miss_falls_back_to_disk_across_instances(tmp_path):
+    fingerprints = {"gpt2": "fp1"}
+    first = _cache(ScanDiskStore(tmp_path), fingerprints)
+    first.put("gpt2", "circuits", "p", {"v": 1})
+    first._disk.flush()
+
+    # A restarted process (or another worker) sees the same result
+    second = _cache(ScanDiskStore(tmp_path), fingerprints)
+    assert second.get("gpt2", "circuits", "p") == {"v": 1}
+    # ... and promotes it into memory
+    assert len(second) == 1
+
+
+def test_invalidate_model_keeps_disk_tier(tmp_path):
+    cache = _cache(ScanDiskStore(tmp_path), {"gpt2": "fp1"})
+    cache.put("gpt2", "anomaly", "p", {"v": 1})
+    cache._disk.flush()
+    cache.invalidate_model("gpt2")
+    assert cache.get("gpt2", "anomaly", "p") == {"v": 1}
+
+
+def test_changed_weights_miss(tmp_path):
+    fingerprints = {"gpt2": "fp1"}
+    cache = _cache(ScanDiskStore(tmp_path), fingerprints)
+    cache.put("gpt2", "anomaly", "p", {"v": 1})
+    cache._disk.flush()
+    cache.invalidate_model("gpt2")
+    fingerprints["gpt2"] = "fp2"
+    assert cache.get("gpt2", "anomaly", "p") is None
+
+
+def test_budget_prunes_least_recently_used(tmp_path):
+    store = ScanDiskStore(tmp_path, budget_bytes=1)
+    store.put("gpt2", "fp", "activation", "a", {"v": "a" * 100})
+    store.put("gpt2", "fp", "activation", "b", {"v": "b" * 100}).result()
+    assert store.stats()["entries"] <= 1
+
+
+def test_clear_empties_disk(tmp_path):
+    cache = _cache(ScanDiskStore(tmp_path), {"gpt2": "fp1"})
+    cache.put("gpt2", "anomaly", "p", {"v": 1})
+    cache.clear()
+    assert cache.get("gpt2", "anomaly", "p") is None
+
+
+async def test_async_lookup_reads_disk_off_the_event_loop(tmp_path):
+    import threading
+
+    fingerprints = {"gpt2": "fp1"}
+    first = _cache(ScanDiskStore(tmp_path), fingerprints)
+    first.put("gpt2", "circuits", "p", {"v": 1})
+    first._disk.flush()
+
+    store = ScanDiskStore(tmp_path)
+    read_in = []
+    real_get = store.get
+    store.get = lambda *args: read_in.append(threading.current_thread()) or real_get(*args)
+    second = _cache(store, fingerprints)
+    assert await second.aget("gpt2", "circuits", "p") == {"v": 1}
+    assert read_in and read_in[0] is not threading.main_thread()
+    # Promoted into memory: the next lookup does not touch the disk
+    assert (await second.aget_body("gpt2", "circuits", "p")).content == b'{"v":1}'
+    assert len(read_in) == 1
+
+
+def test_running_total_tracks_replaced_rows(tmp_path):
+    store = ScanDiskStore(tmp_path)
+    store.put("gpt2", "fp1", "anomaly", "p", {"v": 1}).result()
+    store.put("gpt2", "fp1", "anomaly", "p", {"v": [1] * 100}).result()
+    store.put("gpt2", "fp1", "anomaly", "q", {"v": 2}).result()
+    assert store._total == store.stats()["bytes"]
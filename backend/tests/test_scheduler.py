@@ -0,0 +1,54 @@
+"""Tests for the priority InferenceScheduler."""
+
+import contextvars
+import threading
+
+import pytest
+
+from neural_mri.core.scheduler import InferenceScheduler
+
+
+def test_runs_jobs_by_priority_then_fifo():
+    scheduler = InferenceScheduler()
+    gate = threading.Event()
+    order: list[str] = []
+    blocker = scheduler.submit(gate.wait, 5)
+    futures = [
+        scheduler.submit(order.append, "bg", priority="background"),
+        scheduler.submit(order.append, "batch", priority="batch"),
+        scheduler.submit(order.append, "i1", priority="interactive"),
+        scheduler.submit(order.append, "stream", priority="streaming"),
+        scheduler.submit(order.append, "i2", priority="interactive"),
+    ]
+    gate.set()
+    blocker.result(timeout=5)
+    for future in futures:
+        future.result(timeout=5)
+    assert order == ["i1", "i2", "stream", "batch", "bg"]
+
+
+def test_propagates_context_and_exceptions():
+    var = contextvars.ContextVar("var", default="unset")
+    scheduler = InferenceScheduler()
+    var.set("bound")
+    assert scheduler.submit(var.get).result(timeout=5) == "bound"
+
+    def boom():
+        raise ValueError("nope")
+
+    with pytest.raises(ValueError, match="nope"):
+        scheduler.submit(boom).result(timeout=5)
+
+
+def test_unknown_priority_rejected():
+    with pytest.raises(ValueError):
+        InferenceScheduler().submit(print, priority="urgent")
+
+
+async def test_run_awaits_result_and_records_stats():
+    scheduler = InferenceScheduler()
+    assert await scheduler.run(sum, [1, 2, 3], priority="batch") == 6
+    stats = scheduler.stats()
+    assert stats["queue_depth"] == 0
+    assert stats["classes"]["batch"]["completed"] == 1
+    assert stats["classes"]["interactive"]["completed"] == 0
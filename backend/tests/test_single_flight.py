@@ -0,0 +1,90 @@
+"""Tests for SingleFlight deduplication of in-flight computations."""
+
+import asyncio
+
+import pytest
+
+from neural_mri.core.single_flight import SingleFlight
+
+
+def test_identical_concurrent_calls_share_one_computation():
+    flights = SingleFlight()
+    calls = 0
+
+    async def compute():
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return {"calls": calls}
+
+    async def main():
+        runs = [flights.run("gpt2", "activation", "hi", compute) for _ in range(5)]
+        return await asyncio.gather(*runs)
+
+    results = asyncio.run(main())
+    assert calls == 1
+    assert all(r is results[0] for r in results)
+    assert flights.stats() == {"started": 1, "coalesced": 4, "in_flight": 0}
+
+
+def test_different_keys_and_later_calls_compute_again():
+    flights = SingleFlight()
+    calls: list[str] = []
+
+    def make(tag):
+        async def compute():
+            calls.append(tag)
+            await asyncio.sleep(0)
+            return tag
+
+        return compute
+
+    async def main():
+        await asyncio.gather(
+            flights.run("gpt2", "activation", "a", make("a")),
+            flights.run("gpt2", "anomaly", "a", make("b")),
+        )
+        # Finished flights are not a cache
+        await flights.run("gpt2", "activation", "a", make("c"))
+
+    asyncio.run(main())
+    assert calls == ["a", "b", "c"]
+
+
+def test_error_is_shared_and_cleared():
+    flights = SingleFlight()
+
+    async def boom():
+        await asyncio.sleep(0.01)
+        raise RuntimeError("forward failed")
+
+    async def main():
+        return await asyncio.gather(
+            flights.run("gpt2", "sae", "x", boom),
+            flights.run("gpt2", "sae", "x", boom),
+            return_exceptions=True,
+        )
+
+    errors = asyncio.run(main())
+    assert all(isinstance(e, RuntimeError) for e in errors)
+    assert flights.stats()["in_flight"] == 0
+
+
+def test_cancelled_waiter_does_not_cancel_shared_computation():
+    flights = SingleFlight()
+
+    async def slow():
+        await asyncio.sleep(0.05)
+        return 42
+
+    async def main():
+        first = asyncio.ensure_future(flights.run("gpt2", "activation", "p", slow))
+        await asyncio.sleep(0)
+        second = asyncio.ensure_future(flights.run("gpt2", "activation", "p", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(main()) == 42
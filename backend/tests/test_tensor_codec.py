@@ -0,0 +1,71 @@
+"""Tests for the binary tensor response codec."""
+
+import numpy as np
+import pytest
+
+from neural_mri.utils.tensor_codec import TensorField, decode, encode
+
+
+def _circuits():
+    rng = np.random.default_rng(0)
+    return {
+        "model_id": "gpt2",
+        "attention_heads": [
+            {"layer_idx": i, "head_idx": 0, "pattern": rng.random((3, 3)).tolist()}
+            for i in range(2)
+        ],
+        "metadata": {"seq_len": 3},
+    }
+
+
+def test_round_trip_f16():
+    data = {"heatmap_values": [[0.5, 0.25], [1.0, 0.0]], "tokens": ["a", "b"]}
+    buf = encode(data, [TensorField("heatmap_values")])
+    meta, arrays = decode(buf)
+    assert meta["tokens"] == ["a", "b"]
+    assert meta["heatmap_values"] is None
+    np.testing.assert_array_equal(arrays["heatmap_values"], [[0.5, 0.25], [1.0, 0.0]])
+
+
+def test_list_path_stacks_and_quantizes():
+    data = _circuits()
+    buf = encode(data, [TensorField("attention_heads[].pattern", "u8")])
+    meta, arrays = decode(buf)
+    expected = np.array([h["pattern"] for h in data["attention_heads"]])
+    assert arrays["attention_heads[].pattern"].shape == (2, 3, 3)
+    np.testing.assert_allclose(arrays["attention_heads[].pattern"], expected, atol=1 / 255)
+    assert [h["layer_idx"] for h in meta["attention_heads"]] == [0, 1]
+    # The source dict (e.g. a cache entry) is left untouched
+    assert data["attention_heads"][0]["pattern"] is not None
+
+
+def test_prestacked_tensor_overrides_lists():
+    data = _circuits()
+    stacked = np.zeros((2, 3, 3), dtype=np.float32)
+    path = "attention_heads[].pattern"
+    buf = encode(data, [TensorField(path)], {path: stacked})
+    _, arrays = decode(buf)
+    np.testing.assert_array_equal(arrays["attention_heads[].pattern"], stacked)
+
+
+def test_missing_nested_field_is_skipped():
+    data = {"circuits": None, "anomaly": {"layers": [{"kl_scores": [0.1, 0.2]}]}}
+    fields = [
+        TensorField("circuits.attention_heads[].pattern"),
+        TensorField("anomaly.layers[].kl_scores"),
+    ]
+    meta, arrays = decode(encode(data, fields))
+    assert list(arrays) == ["anomaly.layers[].kl_scores"]
+    assert meta["circuits"] is None
+
+
+def test_buffers_are_aligned():
+    data = {"a": [1.0, 2.0, 3.0], "b": [[4.0]]}
+    buf = encode(data, [TensorField("a"), TensorField("b")])
+    _, arrays = decode(buf)
+    assert arrays["b"][0, 0] == 4.0
+
+
+def test_rejects_foreign_payload():
+    with pytest.raises(ValueError):
+        decode(b"JUNK" + bytes(12))
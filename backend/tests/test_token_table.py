@@ -0,0 +1,39 @@
+"""Tests for the per-model memoized token string table."""
+
+from unittest.mock import MagicMock
+
+from neural_mri.core.token_table import TokenTable, token_table
+
+
+class _Model:
+    def __init__(self):
+        self.tokenizer = MagicMock()
+        self.tokenizer.decode = MagicMock(side_effect=lambda ids: f"tok_{ids[0]}")
+
+
+def test_decodes_each_id_once():
+    model = _Model()
+    table = token_table(model)
+    assert table.decode([3, 1, 3]) == ["tok_3", "tok_1", "tok_3"]
+    assert table.decode([1, 7]) == ["tok_1", "tok_7"]
+    assert model.tokenizer.decode.call_count == 3
+    assert len(table) == 3
+
+
+def test_table_is_per_model():
+    a, b = _Model(), _Model()
+    assert token_table(a) is token_table(a)
+    assert token_table(a) is not token_table(b)
+
+
+def test_table_evicts_least_recently_used():
+    model = _Model()
+    table = TokenTable(model.tokenizer, max_size=2)
+    table.decode([1, 2])
+    table.decode([1])  # 2 is now least recent
+    assert table.decode([3, 3]) == ["tok_3", "tok_3"]
+    assert len(table) == 2
+    table.decode([1])
+    assert model.tokenizer.decode.call_count == 3  # 1 survived; 2 was evicted
+    table.decode([2])
+    assert model.tokenizer.decode.call_count == 4
@@ -0,0 +1,64 @@
+"""Tests for the per-model tokenization service."""
+
+import torch
+
+from neural_mri.core.tokenization import TokenizationService, tokenization
+
+
+class _Tokenizer:
+    bos_token = "<bos>"
+
+
+class _Model:
+    """Character-level tokenizer: one token per character, id = ord(c)."""
+
+    def __init__(self):
+        self.tokenizer = _Tokenizer()
+        self.encode_calls = 0
+
+    def to_tokens(self, text, prepend_bos=True):
+        self.encode_calls += 1
+        ids = ([0] if prepend_bos else []) + [ord(c) for c in text]
+        return torch.tensor([ids])
+
+    def to_str_tokens(self, tokens):
+        assert isinstance(tokens, torch.Tensor), "must decode ids, not re-tokenize"
+        return ["<bos>" if i == 0 else chr(i) for i in tokens.tolist()]
+
+
+def test_encode_tokenizes_once_and_caches():
+    model = _Model()
+    service = TokenizationService(model)
+    calls = model.encode_calls
+    first = service.encode("hi!")
+    assert first.tokens.tolist() == [[0, ord("h"), ord("i"), ord("!")]]
+    assert first.str_tokens == ["<bos>", "h", "i", "!"]
+    assert first.offsets == [(0, 0), (0, 1), (1, 2), (2, 3)]
+    assert service.encode("hi!") is first
+    assert model.encode_calls == calls + 1
+
+
+def test_lru_evicts_oldest_prompt():
+    service = TokenizationService(_Model(), max_prompts=2)
+    a = service.encode("a")
+    service.encode("b")
+    service.encode("a")
+    service.encode("c")
+    assert len(service) == 2
+    assert service.encode("a") is a
+
+
+def test_token_id_table_precomputes_pronouns():
+    model = _Model()
+    service = TokenizationService(model)
+    calls = model.encode_calls
+    assert service.token_id(" he") == ord(" ")
+    assert service.token_id("") is None
+    assert service.token_id("") is None
+    assert model.encode_calls == calls + 1
+
+
+def test_service_is_per_model():
+    a, b = _Model(), _Model()
+    assert tokenization(a) is tokenization(a)
+    assert tokenization(a) is not tokenization(b)
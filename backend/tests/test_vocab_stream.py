@@ -0,0 +1,36 @@
+"""Tests for the vocab-chunked logit lens statistics."""
+
+import pytest
+import torch
+
+from neural_mri.core.vocab_stream import logit_lens_stats
+
+
+@pytest.mark.parametrize("chunk_size", [7, 16, 1000])
+def test_matches_dense_computation(chunk_size):
+    torch.manual_seed(0)
+    hidden = torch.randn(3, 4, 8)
+    W_U = torch.randn(8, 50)
+    b_U = torch.randn(50)
+    final = torch.randn(4, 50) * 3
+
+    stats = logit_lens_stats(hidden, W_U, b_U, final, k=5, chunk_size=chunk_size)
+
+    lens = torch.log_softmax(hidden @ W_U + b_U, dim=-1)
+    ref = torch.log_softmax(final, dim=-1)
+    kl = (ref.exp() * (ref - lens)).sum(dim=-1)
+    entropy = -(lens.exp() * lens).sum(dim=-1)
+    top_vals, top_idx = torch.topk(lens, 5, dim=-1)
+
+    assert torch.allclose(stats.kl, kl, atol=1e-4)
+    assert torch.allclose(stats.entropy, entropy, atol=1e-4)
+    assert torch.equal(stats.topk_indices, top_idx)
+    assert torch.allclose(stats.topk_log_probs, top_vals, atol=1e-4)
+
+
+def test_without_bias():
+    hidden = torch.randn(2, 3, 8)
+    W_U = torch.randn(8, 20)
+    stats = logit_lens_stats(hidden, W_U, None, torch.randn(3, 20), k=3, chunk_size=6)
+    assert stats.kl.shape == (2, 3)
+    assert stats.topk_indices.shape == (2, 3, 3)
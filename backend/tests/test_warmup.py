@@ -0,0 +1,50 @@
+"""Tests for post-load warm-up and the compiled forward fallback."""
+
+import torch
+
+from neural_mri.core import warmup
+from neural_mri.core.warmup import forward, is_compiled, schedule_warm_up, warm_up
+
+
+def test_warm_up_runs_every_hook_plan_per_length(mock_model):
+    timings = warm_up(mock_model, seq_lens=(4, 1000))
+    # 5 single-mode plans + the fused plan, per length
+    assert mock_model.run_with_cache.call_count == 12
+    # Lengths are capped at n_ctx
+    assert list(timings) == ["4", str(mock_model.cfg.n_ctx)]
+    assert mock_model.call_count == 2
+
+
+def test_failed_compiled_forward_falls_back_to_eager(mock_model, monkeypatch):
+    def broken(model, tokens):
+        raise RuntimeError("no compiler")
+
+    monkeypatch.setattr(torch, "compile", lambda fn, **kw: broken)
+    monkeypatch.setattr(warmup, "_compiled_fn", None)
+    warmup.compile_forward(mock_model)
+    assert is_compiled(mock_model)
+
+    logits = forward(mock_model, torch.zeros(1, 4, dtype=torch.long))
+    assert logits is mock_model.return_value
+    assert not is_compiled(mock_model)
+
+
+def test_schedule_warm_up_queues_one_job_per_step_once(mock_model):
+    class _Scheduler:
+        def __init__(self):
+            self.jobs = []
+
+        def submit(self, fn, *args, priority="interactive"):
+            self.jobs.append((fn, priority))
+
+    scheduler = _Scheduler()
+    # hook-free forward + 5 single-mode plans + the fused plan, per length
+    assert schedule_warm_up(scheduler, mock_model, seq_lens=(4, 8)) == 14
+    assert all(priority == "background" for _, priority in scheduler.jobs)
+    # Re-activating the same resident model does not warm it again
+    assert schedule_warm_up(scheduler, mock_model, seq_lens=(4, 8)) == 0
+
+    for fn, _ in scheduler.jobs:
+        fn()
+    assert mock_model.run_with_cache.call_count == 12
+    assert mock_model.call_count == 2
@@ -0,0 +1,39 @@
+"""Tests for chunked weight statistics and the persisted WeightStatsStore."""
+
+import torch
+
+from neural_mri.core.weight_stats import WeightStatsStore, weight_fingerprint
+from neural_mri.utils.tensor_summary import tensor_stats
+
+
+def test_chunked_stats_match_full_tensor():
+    t = torch.randn(37, 11) * 2 + 0.5
+    stats = tensor_stats(t, chunk_elems=50)
+    assert abs(stats["mean"] - t.mean().item()) < 1e-5
+    assert abs(stats["std"] - t.std().item()) < 1e-4
+    assert stats["min_val"] == t.min().item()
+    assert stats["max_val"] == t.max().item()
+    assert abs(stats["l2_norm"] - t.norm().item()) < 1e-3
+    assert stats["histogram"] == torch.histc(t, bins=20).tolist()
+    threshold = abs(t.mean().item()) + 3 * t.std().item()
+    assert stats["num_outliers"] == int((t.abs() > threshold).sum().item())
+
+
+def test_store_persists_and_reloads(mock_model, tmp_path):
+    store = WeightStatsStore(tmp_path)
+    entries = store.get("gpt2", mock_model)
+    assert {e["component"] for e in entries} >= {"W_Q", "W_E", "W_U"}
+    assert all(e["layer_id"] for e in entries if e["component"] != "W_E")
+    files = list(tmp_path.glob("gpt2-*.json"))
+    assert len(files) == 1
+    assert files[0].stem == f"gpt2-{weight_fingerprint(mock_model)}"
+
+    # A fresh store (e.g. after restart) serves from disk without recomputing
+    reloaded = WeightStatsStore(tmp_path).get("gpt2", mock_model)
+    assert reloaded == entries
+
+
+def test_store_memoizes_per_model(mock_model):
+    store = WeightStatsStore()
+    first = store.get("gpt2", mock_model)
+    assert store.get("gpt2", mock_model) is first
@@ -1,5 +1,5 @@
-import type { ModelInfo } from '../types/model';
-import type { ActivationData, AnomalyData, CircuitData, SAEData, SAEInfoResponse, StructuralData, WeightData } from '../types/scan';
+import type { LoadJob, ModelInfo, ModelPrecision } from '../types/model';
+import type { ActivationData, AnomalyData, CircuitData, FusedScanData, FusedScanMode, SAEData, SAEInfoResponse, StructuralData, WeightData } from '../types/scan';
 import type { PerturbResult, PatchResult } from '../types/perturb';
 import type { CausalTraceResult } from '../types/causalTrace';
 import type { DiagnosticReport, ReportRequest } from '../types/report';
@@ -40,14 +40,36 @@ export interface ModelListEntry {
   source?: 'registry' | 'dynamic';
 }
 
+const LOAD_POLL_MS = 500;
+
+/** Poll a model load job until it finishes; resolves with the loaded model's info. */
+export async function waitForLoadJob(
+  job: LoadJob,
+  onProgress?: (job: LoadJob) => void,
+): Promise<ModelInfo> {
+  let current = job;
+  while (current.status === 'queued' || current.status === 'running') {
+    onProgress?.(current);
+    await new Promise((resolve) => setTimeout(resolve, LOAD_POLL_MS));
+    current = await api.model.job(current.job_id);
+  }
+  onProgress?.(current);
+  if (current.status === 'done' && current.result) return current.result;
+  if (current.status === 'cancelled') throw new ApiError(499, `Loading ${current.model_id} cancelled`);
+  throw new ApiError(500, current.error || `Loading ${current.model_id} failed`);
+}
+
 export const api = {
   model: {
     list: () => request<ModelListEntry[]>('/model/list'),
-    load: (model_id: string, device = 'auto') =>
-      request<ModelInfo>('/model/load', {
+    load: (model_id: string, device = 'auto', precision: ModelPrecision = 'auto') =>
+      request<LoadJob>('/model/load', {
         method: 'POST',
-        body: JSON.stringify({ model_id, device }),
+        body: JSON.stringify({ model_id, device, precision }),
       }),
+    job: (jobId: string) => request<LoadJob>(`/model/jobs/${jobId}`),
+    cancelLoad: (jobId: string) =>
+      request<LoadJob>(`/model/jobs/${jobId}`, { method: 'DELETE' }),
     info: () => request<ModelInfo>('/model/info'),
     unload: () => request<{ status: string }>('/model/unload', { method: 'DELETE' }),
     search: (q: string, limit = 20, tlOnly = false) =>
@@ -78,6 +100,11 @@ export const api = {
         method: 'POST',
         body: JSON.stringify({ prompt }),
       }),
+    all: (prompt: string, modes: FusedScanMode[] = ['fMRI', 'DTI', 'FLAIR'], targetTokenIdx = -1) =>
+      request<FusedScanData>('/scan/all', {
+        method: 'POST',
+        body: JSON.stringify({ prompt, modes, target_token_idx: targetTokenIdx }),
+      }),
   },
   perturb: {
     zero: (component: string, prompt: string) =>
@@ -17,7 +17,7 @@ const inputStyle = {
 } as const;
 
 export function PromptInput() {
-  const { prompt, setPrompt, isScanning, runScan, mode } = useScanStore();
+  const { prompt, setPrompt, isScanning, runScan, runFullScan, mode } = useScanStore();
   const { isCompareMode, promptB, setPromptB, runCompare, isScanningB, toggleCompare } = useCompareStore();
   const t = useLocaleStore((s) => s.t);
   const [scanFailed, setScanFailed] = useState(false);
@@ -130,6 +130,26 @@ export function PromptInput() {
             {isViewer ? 'VIEW ONLY' : busy ? 'SCANNING...' : 'SCAN'}
           </button>
         )}
+        {!isCompareMode && isPromptMode && !isViewer && (
+          <button
+            onClick={runFullScan}
+            disabled={busy}
+            title="fMRI + DTI + FLAIR in one pass"
+            className="rounded tracking-wide"
+            style={{
+              background: 'none',
+              border: '1px solid var(--border)',
+              color: busy ? 'var(--text-secondary)' : 'var(--accent-active)',
+              padding: '6px 10px',
+              fontSize: 'var(--font-size-sm)',
+              fontFamily: 'var(--font-primary)',
+              cursor: busy ? 'default' : 'pointer',
+              letterSpacing: '1px',
+            }}
+          >
+            ALL
+          </button>
+        )}
       </div>
 
       {/* Row B (compare mode only) */}
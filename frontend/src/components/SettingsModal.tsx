@@ -4,6 +4,7 @@ import { useLocaleStore } from '../store/useLocaleStore';
 import type { TranslationKey } from '../i18n/translations';
 
 const DEVICES = ['auto', 'cpu', 'cuda', 'mps'] as const;
+const MB = 1024 * 1024;
 
 export function SettingsModal() {
   const {
@@ -277,7 +278,8 @@ export function SettingsModal() {
               }}
             >
               {cacheStatus
-                ? `${cacheStatus.entry_count} / ${cacheStatus.max_entries}`
+                ? `${(cacheStatus.bytes_used / MB).toFixed(1)} / ` +
+                  `${(cacheStatus.budget_bytes / MB).toFixed(0)} MB · ${cacheStatus.entry_count}`
                 : '— / —'}{' '}
               {t('settings.cacheEntries' as TranslationKey)}
             </span>
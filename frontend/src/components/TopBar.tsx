@@ -12,7 +12,7 @@ import { exportGif, exportWebM } from '../utils/videoExport';
 import { ModelPicker } from './ModelPicker';
 
 export function TopBar() {
-  const { modelInfo, isLoading, error } = useModelStore();
+  const { modelInfo, isLoading, loadJob, cancelLoad, error } = useModelStore();
   const scanStore = useScanStore();
   const addLog = scanStore.addLog;
   const { locale, toggleLocale, openGuide, t } = useLocaleStore();
@@ -168,10 +168,29 @@ export function TopBar() {
             className="loading-dots"
             style={{ fontSize: 'var(--font-size-xs)', color: 'var(--accent-active)' }}
           >
-            Loading
+            {loadJob?.phase === 'download' ? 'Downloading' : 'Loading'}
+            {loadJob?.phase === 'download' && loadJob.bytes_total > 0 && (
+              <> {Math.round((100 * loadJob.bytes_done) / loadJob.bytes_total)}%</>
+            )}
             <span className="dot dot1">.</span>
             <span className="dot dot2">.</span>
             <span className="dot dot3">.</span>
+            {loadJob && (
+              <button
+                onClick={cancelLoad}
+                title="Cancel loading"
+                style={{
+                  marginLeft: 4,
+                  background: 'none',
+                  border: 'none',
+                  color: 'var(--text-secondary)',
+                  cursor: 'pointer',
+                  fontSize: 'var(--font-size-xs)',
+                }}
+              >
+                ×
+              </button>
+            )}
           </span>
         )}
         {showError && error && (
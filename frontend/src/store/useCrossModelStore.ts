@@ -2,7 +2,7 @@ import { create } from 'zustand';
 import type { ActivationData, AnomalyData, CircuitData } from '../types/scan';
 import type { CompareData } from '../types/compare';
 import type { ScanMode } from '../types/model';
-import { api } from '../api/client';
+import { api, waitForLoadJob } from '../api/client';
 import { useScanStore } from './useScanStore';
 import { computeLayerDiffs } from '../utils/compareDiff';
 
@@ -93,7 +93,7 @@ export const useCrossModelStore = create<CrossModelState>((set, get) => ({
       // Phase 2: Switch to model B
       set({ phase: 'switching' });
       scanState.addLog(`Cross-model: switching to ${modelIdB}...`);
-      await api.model.load(modelIdB);
+      await waitForLoadJob(await api.model.load(modelIdB));
 
       // Phase 3: Scan model B
       set({ phase: 'scanning_b' });
@@ -1,6 +1,6 @@
 import { create } from 'zustand';
-import type { ModelInfo } from '../types/model';
-import { api } from '../api/client';
+import type { LoadJob, ModelInfo } from '../types/model';
+import { api, waitForLoadJob } from '../api/client';
 import type { ModelListEntry } from '../api/client';
 import { useSAEStore } from './useSAEStore';
 import { useSettingsStore } from './useSettingsStore';
@@ -9,16 +9,19 @@ import { useModelSearchStore } from './useModelSearchStore';
 interface ModelState {
   modelInfo: ModelInfo | null;
   isLoading: boolean;
+  loadJob: LoadJob | null;
   error: string | null;
   availableModels: ModelListEntry[];
   loadModel: (modelId: string) => Promise<void>;
+  cancelLoad: () => Promise<void>;
   fetchModelInfo: () => Promise<void>;
   fetchModels: () => Promise<void>;
 }
 
-export const useModelStore = create<ModelState>((set) => ({
+export const useModelStore = create<ModelState>((set, get) => ({
   modelInfo: null,
   isLoading: false,
+  loadJob: null,
   error: null,
   availableModels: [],
 
@@ -26,8 +29,10 @@ export const useModelStore = create<ModelState>((set) => ({
     set({ isLoading: true, error: null });
     try {
       const device = useSettingsStore.getState().devicePreference;
-      const info = await api.model.load(modelId, device);
-      set({ modelInfo: info, isLoading: false });
+      // The server loads in the background; the current model keeps serving meanwhile
+      const job = await api.model.load(modelId, device);
+      const info = await waitForLoadJob(job, (loadJob) => set({ loadJob }));
+      set({ modelInfo: info, isLoading: false, loadJob: null });
       // Register as recent model
       useModelSearchStore.getState().addRecentModel(modelId);
       // Refresh model list to update is_loaded flags
@@ -41,7 +46,17 @@ export const useModelStore = create<ModelState>((set) => ({
       useSAEStore.getState().reset();
       useSAEStore.getState().fetchInfo();
     } catch (e) {
-      set({ error: (e as Error).message, isLoading: false });
+      set({ error: (e as Error).message, isLoading: false, loadJob: null });
+    }
+  },
+
+  cancelLoad: async () => {
+    const job = get().loadJob;
+    if (!job) return;
+    try {
+      await api.model.cancelLoad(job.job_id);
+    } catch {
+      // Job already finished
     }
   },
 
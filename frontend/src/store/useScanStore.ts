@@ -29,6 +29,7 @@ interface ScanState {
   setLayoutMode: (mode: LayoutMode) => void;
   setPrompt: (prompt: string) => void;
   runScan: () => Promise<void>;
+  runFullScan: () => Promise<void>;
   selectLayer: (layerId: string | null) => void;
   setSelectedTokenIdx: (idx: number) => void;
   stepToken: (delta: number) => void;
@@ -127,6 +128,35 @@ export const useScanStore = create<ScanState>((set, get) => ({
     }
   },
 
+  runFullScan: async () => {
+    const { prompt, addLog, structuralData } = get();
+    set({ isScanning: true });
+    addLog('Scanning fMRI + DTI + FLAIR...');
+
+    try {
+      if (!structuralData) {
+        const sData = await api.scan.structural();
+        set({ structuralData: sData });
+        addLog(`T1 auto-loaded for layout`);
+      }
+      // One fused request: the three modalities share a single forward pass
+      const data = await api.scan.all(prompt);
+      set({
+        activationData: data.activation,
+        circuitData: data.circuits,
+        anomalyData: data.anomaly,
+        tokenCount: data.activation?.tokens.length ?? 0,
+        selectedTokenIdx: 0,
+      });
+      const cached = (data.metadata.cached_modes as string[] | undefined) ?? [];
+      addLog(`Full scan complete: ${data.modes.join(' + ')}${cached.length ? ` (cached: ${cached.join(', ')})` : ''}`);
+    } catch (e) {
+      addLog(`Scan failed: ${(e as Error).message}`);
+    } finally {
+      set({ isScanning: false });
+    }
+  },
+
   selectLayer: (layerId) => set({ selectedLayerId: layerId }),
 
   setSelectedTokenIdx: (idx) => {
@@ -83,10 +83,15 @@ export const useSettingsStore = create<SettingsState>((set) => ({
       await api.settings.clearCache();
       const prev = useSettingsStore.getState().cacheStatus;
       set({
-        cacheStatus: {
-          entry_count: 0,
-          max_entries: prev?.max_entries ?? 5,
-        },
+        cacheStatus: prev
+          ? {
+              ...prev,
+              entry_count: 0,
+              bytes_used: 0,
+              mode_bytes: {},
+              disk: prev.disk ? { ...prev.disk, entries: 0, bytes: 0 } : null,
+            }
+          : null,
       });
     } catch (e) {
       set({ error: (e as Error).message });
@@ -8,6 +8,16 @@ export interface LayerConfig {
   d_mlp: number;
 }
 
+export type ModelPrecision = 'auto' | 'fp32' | 'bf16';
+
+export interface FidelityReport {
+  mode: 'bf16' | 'bf16-autocast';
+  probe_prompt: string;
+  max_abs_activation_delta: number;
+  rel_activation_delta: number;
+  top1_agreement: number;
+}
+
 export interface ModelInfo {
   model_id: string;
   model_name: string;
@@ -22,6 +32,7 @@ export interface ModelInfo {
   device: string;
   layers: LayerConfig[];
   dtype: string;
+  fidelity?: FidelityReport[];
 }
 
 export type ScanMode = 'T1' | 'T2' | 'fMRI' | 'DTI' | 'FLAIR';
@@ -33,3 +44,18 @@ export const SCAN_MODES: Record<ScanMode, { label: string; desc: string; color:
   DTI: { label: 'DTI', desc: 'Data Tractography Imaging', color: '#44ddaa' },
   FLAIR: { label: 'FLAIR', desc: 'Feature-Level Anomaly Identification', color: '#ff4466' },
 };
+
+export type LoadJobStatus = 'queued' | 'running' | 'done' | 'failed' | 'cancelled';
+
+export interface LoadJob {
+  job_id: string;
+  model_id: string;
+  device: string;
+  status: LoadJobStatus;
+  phase: 'queued' | 'download' | 'convert' | 'ready';
+  bytes_done: number;
+  bytes_total: number;
+  error: string | null;
+  result: ModelInfo | null;
+  elapsed_ms: number;
+}
@@ -86,6 +86,9 @@ export interface CircuitData {
   connections: PathwayConnection[];
   components: ComponentImportance[];
   attention_heads: AttentionHead[];
+  method?: 'exact' | 'attribution';
+  // exact: L2 change of the target logits; attribution: top-1 log-prob estimate
+  importance_metric?: 'logit_l2' | 'top1_logprob';
   metadata: Record<string, unknown>;
 }
 
@@ -143,6 +146,20 @@ export interface SAEData {
   metadata: Record<string, unknown>;
 }
 
+export type FusedScanMode = 'fMRI' | 'DTI' | 'FLAIR' | 'SAE';
+
+export interface FusedScanData {
+  model_id: string;
+  scan_mode: 'fused';
+  prompt: string;
+  modes: FusedScanMode[];
+  activation: ActivationData | null;
+  circuits: CircuitData | null;
+  anomaly: AnomalyData | null;
+  sae: SAEData | null;
+  metadata: Record<string, unknown>;
+}
+
 export interface SAEInfoResponse {
   available: boolean;
   model_id: string | null;
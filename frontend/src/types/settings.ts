@@ -6,7 +6,21 @@ export interface TokenStatus {
 
 export interface CacheStatus {
   entry_count: number;
-  max_entries: number;
+  bytes_used: number;
+  budget_bytes: number;
+  mode_bytes: Record<string, number>;
+  hits: number;
+  misses: number;
+  rejected: number;
+  evictions: number;
+  disk: {
+    entries: number;
+    bytes: number;
+    budget_bytes: number;
+    hits: number;
+    misses: number;
+    writes: number;
+  } | null;
 }
 
 export interface HubSearchResult {